@@ -1,7 +1,18 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import altair as alt
-from utils.data_loader import load_score_data
+from utils.charts import danger_distribution_chart, score_trend_chart
+from utils.data_loader import active_bundle
+from utils.downsample import MAX_LINES, MAX_POINTS, comparison_frame
+from utils.forecast import get_forecast_model, top_movers
+from utils.profile import DRIFT_WINDOW, column_summary, drift_table, load_profile
+from utils.ranking import load_ranking, rank_movers, ranking_parquet
+from utils.rollups import REGION_COLUMNS, load_rollup
+from utils.schema import COLUMN_LABELS
+from utils.scoring import render_weight_controls, rescore
+from utils.sensitivity import load_sensitivity
+from utils.tracing import render_trace_panel, traced
+from utils.warmup import render_startup_panel, start_warmer
 
 # ---------------------- 페이지 설정 ----------------------
 st.set_page_config(
@@ -9,17 +20,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# ---------------------- 데이터 로딩 ----------------------
-@st.cache_data(show_spinner="데이터 로딩 중...")
-def get_data():
-    return load_score_data(strict=True)
-
-def preprocess_month_column(df):
-    if not pd.api.types.is_datetime64_any_dtype(df["MONTH"]):
-        df["MONTH"] = pd.to_datetime(df["MONTH"], errors="coerce")
-    df["월"] = df["MONTH"].dt.to_period("M").dt.to_timestamp()
-    return df
-
 # ---------------------- Hero ----------------------
 def render_hero():
     st.markdown("""
@@ -36,149 +36,325 @@ def render_hero():
     st.divider()
 
 # ---------------------- 데이터 요약 ----------------------
-def render_data_overview(df):
+@traced("app.render_data_overview")
+def render_data_overview(profile):
+    import altair as alt
+
     st.subheader("데이터 구성 요약")
     st.markdown("""
     - 이 데이터는 서울시 각 상권의 월별 경제적 지표를 기반으로 분석되었습니다.
     - 주요 지표들의 평균, 최솟값, 최댓값을 살펴보고, 데이터 품질 확인을 위해 결측치 정보를 함께 제공합니다.
     """)
 
-    key_columns = {
-        "FINAL_SCORE": "최종 점수",
-        "NORM_CLOSE": "폐업률 지수",
-        "NORM_PRICE": "가격 지수",
-        "NORM_MOBILITY": "유동인구 지수",
-        "NORM_ASSETS": "자산 지수",
-        "NORM_FOOD": "음식 매출 지수",
-        "NORM_DOMINANT": "지배 브랜드 비율 지수"
-    }
-
-    summary = df[list(key_columns.keys())].agg(["mean", "min", "max"]).T
-    summary = summary.rename(index=key_columns).round(3)
-    summary.columns = ["평균", "최솟값", "최댓값"]
-
+    summary, null_info = column_summary(profile)
     st.dataframe(summary, use_container_width=True)
 
     st.divider()
     st.markdown("#### 결측치 분석")
-    null_info = pd.DataFrame({
-        "결측치 수": df.isnull().sum(),
-        "결측치 비율(%)": (df.isnull().sum() / len(df) * 100).round(1)
-    }).sort_values("결측치 비율(%)", ascending=False)
-
     st.dataframe(null_info, use_container_width=True)
 
+    st.divider()
+    st.markdown("#### 월별 분포 변화 (드리프트)")
+    st.markdown(f"""
+    - 각 지표의 월별 분포를 직전 {DRIFT_WINDOW}개월 분포와 비교한 KS 거리(누적분포의 최대 차이, 0~1)입니다.
+    - 표본 수를 고려한 임계값을 넘는 월은 지표 분포가 급격히 달라진 달로, 원천 데이터 변경이나 실제 상권 변화를 점검해야 합니다.
+    """)
+    drift = drift_table(profile)
+    heatmap = alt.Chart(drift.dropna(subset=["KS"])).mark_rect().encode(
+        x=alt.X("yearmonth(MONTH):O", title="월"),
+        y=alt.Y("COLUMN:N", title="지표"),
+        color=alt.Color("KS:Q", scale=alt.Scale(scheme="orangered", domain=[0, 0.5], clamp=True)),
+        tooltip=["COLUMN", alt.Tooltip("MONTH:T", format="%Y-%m"), "KS", "임계값", "평균", "평균 변화"]
+    )
+    st.altair_chart(heatmap.properties(height=max(200, 22 * drift["COLUMN"].nunique())), use_container_width=True)
+
+    flagged = drift[drift["급변"]].drop(columns="급변").sort_values("KS", ascending=False)
+    if flagged.empty:
+        st.caption("분포가 급변한 월이 없습니다.")
+    else:
+        st.dataframe(
+            flagged.assign(MONTH=flagged["MONTH"].dt.strftime("%Y-%m")).rename(columns={"COLUMN": "지표", "MONTH": "월"}),
+            use_container_width=True, hide_index=True
+        )
+
 # ---------------------- 월별 평균 점수 ----------------------
-def render_score_trend(df):
+@traced("app.render_score_trend")
+def render_score_trend(monthly, spec=None):
     st.subheader("월별 평균 위험 점수")
     st.markdown("""
     - 시간 흐름에 따라 서울시 전반의 젠트리피케이션 위험 점수가 어떻게 변화하는지를 보여줍니다.
     - 점수가 높을수록 젠트리피케이션 가능성이 높다고 해석할 수 있습니다.
     """)
 
-    df = preprocess_month_column(df)
-    monthly_score = (
-        df.groupby("월")["FINAL_SCORE"]
-        .mean()
-        .reset_index()
-        .sort_values("월")
-    )
-
-    chart = alt.Chart(monthly_score).mark_line(point=True).encode(
-        x=alt.X("월:T", title="월"),
-        y=alt.Y("FINAL_SCORE:Q", title="평균 위험 점수"),
-        tooltip=["월", "FINAL_SCORE"]
-    ).properties(height=400)
-
-    st.altair_chart(chart, use_container_width=True)
+    if spec is not None:
+        st.vega_lite_chart(spec, use_container_width=True)
+    else:
+        st.altair_chart(score_trend_chart(monthly), use_container_width=True)
 
 # ---------------------- 위험 등급 분포 ----------------------
-def render_danger_distribution(df):
+@traced("app.render_danger_distribution")
+def render_danger_distribution(month_danger, spec=None):
     st.subheader("월별 위험 등급 분포")
     st.markdown("""
     - 각 월별로 위험 등급(낮음/보통/높음)에 속하는 지역의 분포를 시각화합니다.
     - 위험 등급 분포를 통해 특정 시기에 고위험 지역이 증가하는 추세를 파악할 수 있습니다.
     """)
 
-    df = preprocess_month_column(df)
-    danger_dist = (
-        df.groupby(["월", "DANGER_LEVEL"])
-        .size()
-        .reset_index(name="건수")
-        .sort_values("월")
-    )
-
-    chart = alt.Chart(danger_dist).mark_bar().encode(
-        x=alt.X("월:T", title="월"),
-        y=alt.Y("건수:Q"),
-        color="DANGER_LEVEL:N",
-        tooltip=["월", "DANGER_LEVEL", "건수"]
-    ).properties(height=400)
-
-    st.altair_chart(chart, use_container_width=True)
+    if spec is not None:
+        st.vega_lite_chart(spec, use_container_width=True)
+    else:
+        st.altair_chart(danger_distribution_chart(month_danger), use_container_width=True)
 
 # ---------------------- 지역별 탐색 ----------------------
-def render_region_explorer(df):
+@traced("app.render_region_explorer")
+def render_region_explorer(region_month):
     st.subheader("지역별 위험도 탐색")
     st.markdown("""
     - 특정 지역을 선택하여 해당 지역의 월별 위험 점수 및 주요 지표들의 변화를 분석할 수 있습니다.
     - 지역 맞춤형 대응이 필요한 경우 유용하게 활용할 수 있습니다.
     """)
 
-    region = st.selectbox("지역 선택", sorted(df["REGION_NAME"].dropna().unique()))
-    region_df = df[df["REGION_NAME"] == region].copy()
-    region_df = preprocess_month_column(region_df)
-
-    columns_to_plot = [
-        "NORM_PRICE", "NORM_MOBILITY", "NORM_ASSETS",
-        "NORM_FOOD", "NORM_CLOSE", "FINAL_SCORE"
-    ]
-    column_labels = {
-        "NORM_PRICE": "가격 지수", "NORM_MOBILITY": "유동인구 지수",
-        "NORM_ASSETS": "자산 지수", "NORM_FOOD": "음식 매출 지수",
-        "NORM_CLOSE": "폐업률", "FINAL_SCORE": "최종 점수"
-    }
-
-    region_df["월"] = region_df["MONTH"].dt.strftime("%Y-%m")
+    region = st.selectbox("지역 선택", sorted(region_month["REGION_NAME"].unique()))
+    region_df = region_month[region_month["REGION_NAME"] == region]
 
-    monthly_avg = (
-        region_df.groupby("월")[columns_to_plot]
-        .mean()
-        .rename(columns=column_labels)
-        .sort_index()
-    )
-    st.line_chart(monthly_avg, use_container_width=True)
+    column_labels = {c: COLUMN_LABELS[c] for c in REGION_COLUMNS}
 
     table_df = (
-        region_df[["월"] + columns_to_plot + ["DANGER_LEVEL"]]
+        region_df.assign(월=region_df["MONTH"].dt.strftime("%Y-%m"))
+        [["월"] + REGION_COLUMNS + ["DANGER_LEVEL"]]
         .rename(columns={**column_labels, "DANGER_LEVEL": "위험 등급"})
-        .groupby("월", as_index=False)
-        .agg({
-            **{label: "mean" for label in column_labels.values()},
-            "위험 등급": lambda x: x.mode().iloc[0] if not x.mode().empty else None
-        })
         .sort_values("월")
+        .reset_index(drop=True)
+    )
+
+    st.line_chart(
+        table_df.set_index("월")[list(column_labels.values())],
+        use_container_width=True
     )
 
     st.markdown("#### 월별 지역 위험도 요약 테이블")
     st.dataframe(table_df, use_container_width=True)
 
+# ---------------------- 지역 비교 ----------------------
+@traced("app.render_region_comparison")
+def render_region_comparison(region_month):
+    import altair as alt
+
+    st.subheader("지역 간 지표 비교")
+    st.markdown(f"""
+    - 여러 지역의 지표 추이를 한 화면에서 비교합니다.
+    - 긴 시계열은 서버에서 모양을 보존하는 방식(LTTB)으로 줄여 차트당 최대 {MAX_POINTS:,}개 점만 전송합니다.
+    - {MAX_LINES}개보다 많은 지역을 고르면 지역별 선 대신 평균과 10~90% 범위로 묶어 보여줍니다.
+    """)
+
+    names = sorted(region_month["REGION_NAME"].unique())
+    col1, col2, col3 = st.columns([3, 2, 1])
+    regions = col1.multiselect("비교할 지역", names, default=names[:3])
+    columns = col2.multiselect("지표", REGION_COLUMNS, default=["FINAL_SCORE"])
+    method = col3.radio("줄이는 방식", ["lttb", "minmax"], format_func={"lttb": "모양 보존", "minmax": "최소/최대"}.get)
+    if not regions or not columns:
+        st.info("지역과 지표를 하나 이상 선택하세요.")
+        return
+
+    df, mode, original = comparison_frame(region_month, regions, columns, method=method)
+    st.caption(f"원본 {original:,}개 점 → 전송 {len(df):,}개 점")
+
+    if mode == "lines":
+        chart = alt.Chart(df).mark_line().encode(
+            x=alt.X("MONTH:T", title="월"),
+            y=alt.Y("값:Q"),
+            color=alt.Color("REGION_NAME:N", title="지역"),
+            tooltip=["REGION_NAME", alt.Tooltip("MONTH:T", format="%Y-%m"), "값"]
+        )
+    else:
+        base = alt.Chart(df).encode(x=alt.X("MONTH:T", title="월"))
+        chart = (
+            base.mark_area(opacity=0.25).encode(y=alt.Y("하한:Q", title="값"), y2="상한:Q")
+            + base.mark_line().encode(y="값:Q", tooltip=[alt.Tooltip("MONTH:T", format="%Y-%m"), "값", "하한", "상한"])
+        )
+    chart = chart.properties(height=220).facet(facet=alt.Facet("지표:N", title=None), columns=2)
+    st.altair_chart(chart, use_container_width=True)
+
+# ---------------------- 순위·변동 ----------------------
+@traced("app.render_ranking")
+def render_ranking(top_n=10):
+    st.subheader("지역 위험 순위와 급변 지역")
+    st.markdown("""
+    - 매월 모든 지역을 최종 점수로 줄 세운 순위(1위 = 가장 위험)와 백분위를 보여줍니다.
+    - 전월/전년 동월 대비 점수가 가장 많이 오르거나 내린 지역을 확인하고, 전체 순위표를 내려받을 수 있습니다.
+    """)
+
+    ranking = load_ranking(strict=True)
+    months = sorted(ranking["MONTH"].unique(), reverse=True)
+    col1, col2, col3 = st.columns(3)
+    month = col1.selectbox("기준 월", months, format_func=lambda m: f"{pd.Timestamp(m):%Y-%m}", key="ranking_month")
+    basis = col2.radio("비교 기준", ["MOM", "YOY"], format_func={"MOM": "전월 대비", "YOY": "전년 동월 대비"}.get, horizontal=True)
+    options = [c for c in REGION_COLUMNS if c in ranking.columns]
+    column = col3.selectbox("지표", options, index=options.index("FINAL_SCORE"))
+
+    labels = {
+        "REGION_NAME": "지역", "RANK": "순위", f"RANK_{basis}": "순위 변화",
+        "DANGER_LEVEL": "위험 등급", column: column, f"{column}_{basis}": "변화",
+    }
+    risers, fallers = rank_movers(ranking, month, basis=basis, column=column, n=top_n)
+    left, right = st.columns(2)
+    left.markdown(f"#### 📈 상승 TOP{top_n}")
+    left.dataframe(risers.rename(columns=labels).round(3), use_container_width=True, hide_index=True)
+    right.markdown(f"#### 📉 하락 TOP{top_n}")
+    right.dataframe(fallers.rename(columns=labels).round(3), use_container_width=True, hide_index=True)
+
+    st.markdown("#### 전체 순위표")
+    current = ranking[ranking["MONTH"] == month].sort_values("RANK")
+    table = current[["RANK", "REGION_NAME", "PERCENTILE", "DANGER_LEVEL", "FINAL_SCORE", "FINAL_SCORE_MOM", "FINAL_SCORE_YOY", "RANK_MOM", "RANK_YOY"]]
+    st.dataframe(
+        table.rename(columns={"RANK": "순위", "REGION_NAME": "지역", "PERCENTILE": "백분위", "DANGER_LEVEL": "위험 등급",
+                              "FINAL_SCORE": "최종 점수", "FINAL_SCORE_MOM": "전월 대비", "FINAL_SCORE_YOY": "전년 대비",
+                              "RANK_MOM": "순위 변화(전월)", "RANK_YOY": "순위 변화(전년)"}).round(3),
+        use_container_width=True, hide_index=True
+    )
+
+    col1, col2 = st.columns(2)
+    col1.download_button(
+        f"⬇️ {pd.Timestamp(month):%Y-%m} 순위표 (CSV)", current.to_csv(index=False).encode("utf-8-sig"),
+        file_name=f"ranking_{pd.Timestamp(month):%Y%m}.csv", mime="text/csv"
+    )
+    col2.download_button(
+        "⬇️ 전체 기간 순위표 (Parquet)", ranking_parquet(strict=True),
+        file_name="ranking_all.parquet", mime="application/octet-stream"
+    )
+
+# ---------------------- 가중치 민감도 ----------------------
+@traced("app.render_sensitivity")
+def render_sensitivity():
+    import altair as alt
+
+    st.subheader("가중치 민감도 분석")
+    st.markdown("""
+    - 공표된 가중치 주변에서 수천 개의 가중치 조합을 무작위로 뽑아(디리클레 분포) 모든 지역-월의 점수를 다시 계산합니다.
+    - 가중치가 조금 달라져도 고위험 지역 순위가 유지되는지, 각 지역이 '높음' 등급일 확률은 얼마인지 확인할 수 있습니다.
+    """)
+
+    col1, col2 = st.columns(2)
+    n_samples = col1.select_slider("샘플 수", [500, 1000, 2000, 5000], value=2000)
+    concentration = col2.select_slider(
+        "가중치 변동 폭", [50.0, 100.0, 200.0, 500.0], value=200.0,
+        format_func=lambda c: {50.0: "크게", 100.0: "보통", 200.0: "작게", 500.0: "매우 작게"}[c]
+    )
+
+    if not st.toggle("분석 실행", key="run_sensitivity"):
+        return
+
+    summary, prob_high, month = load_sensitivity(strict=True, n_samples=n_samples, concentration=concentration)
+
+    st.markdown(f"#### {month:%Y-%m} 기준 지역별 순위 안정성")
+    chart = alt.Chart(summary).mark_rule(strokeWidth=6, opacity=0.5).encode(
+        y=alt.Y("지역:N", sort=alt.EncodingSortField("기준 순위")),
+        x=alt.X("순위 5%:Q", title="순위 (5%~95% 구간)", scale=alt.Scale(reverse=True)),
+        x2="순위 95%:Q",
+        tooltip=list(summary.columns)
+    ) + alt.Chart(summary).mark_point(filled=True, color="black").encode(
+        y=alt.Y("지역:N", sort=alt.EncodingSortField("기준 순위")),
+        x="기준 순위:Q"
+    )
+    st.altair_chart(chart.properties(height=max(300, 18 * len(summary))), use_container_width=True)
+    st.dataframe(summary, use_container_width=True)
+
+    st.markdown("#### 지역별 '높음' 등급 확률 (전체 기간)")
+    heatmap = alt.Chart(prob_high).mark_rect().encode(
+        x=alt.X("yearmonth(MONTH):O", title="월"),
+        y=alt.Y("REGION_NAME:N", title="지역"),
+        color=alt.Color("P_HIGH:Q", title="높음 확률", scale=alt.Scale(scheme="reds")),
+        tooltip=["REGION_NAME", alt.Tooltip("MONTH:T", format="%Y-%m"), "P_HIGH"]
+    )
+    st.altair_chart(heatmap.properties(height=max(300, 18 * prob_high["REGION_NAME"].nunique())), use_container_width=True)
+
+# ---------------------- 위험 급등 예측 ----------------------
+@traced("app.render_forecast")
+def render_forecast(horizon=3, top_n=5):
+    import altair as alt
+
+    st.subheader(f"{horizon}개월 후 위험 급등 예상 지역 TOP{top_n}")
+    st.markdown("""
+    - 모든 지역의 월별 위험 점수에 지수평활(Holt) 모형을 한 번에 적합해 향후 점수를 예측합니다.
+    - 최근 점수 대비 상승 폭이 큰 지역 순으로 보여주며, 음영은 95% 예측 구간입니다.
+    """)
+
+    model, series = get_forecast_model(strict=True)
+    movers = top_movers(model, series, horizon=horizon, n=top_n)
+    st.dataframe(movers, use_container_width=True)
+
+    mean, lower, upper = model.forecast(horizon)
+    rows = [model.regions.index(region) for region in movers["지역"]]
+    history_len = min(24, len(model.months))
+    history = pd.DataFrame({
+        "지역": np.repeat(movers["지역"].to_numpy(), history_len),
+        "월": np.tile(model.months[-history_len:], len(rows)),
+        "점수": series[rows, -history_len:].ravel(),
+    })
+    future = pd.DataFrame({
+        "지역": np.repeat(movers["지역"].to_numpy(), horizon),
+        "월": np.tile(model.forecast_months(horizon), len(rows)),
+        "점수": mean[rows].ravel(),
+        "하한": lower[rows].ravel(),
+        "상한": upper[rows].ravel(),
+    })
+
+    color = alt.Color("지역:N", sort=list(movers["지역"]))
+    chart = (
+        alt.Chart(history).mark_line().encode(x=alt.X("월:T", title="월"), y=alt.Y("점수:Q", title="위험 점수"), color=color)
+        + alt.Chart(future).mark_area(opacity=0.15).encode(x="월:T", y="하한:Q", y2="상한:Q", color=color)
+        + alt.Chart(future).mark_line(strokeDash=[4, 4], point=True).encode(
+            x="월:T", y="점수:Q", color=color, tooltip=["지역", alt.Tooltip("월:T", format="%Y-%m"), "점수", "하한", "상한"]
+        )
+    ).properties(height=400)
+    st.altair_chart(chart, use_container_width=True)
+
 # ---------------------- 실행 ----------------------
 def main():
+    start_warmer()
     render_hero()
+    render_trace_panel()
+    render_startup_panel()
+    custom = render_weight_controls()
 
     try:
-        df = get_data()
+        profile = load_profile(strict=True)
+        monthly = load_rollup("month", strict=True)
+        month_danger = load_rollup("month_danger", strict=True)
+        region_month = load_rollup("region_month", strict=True)
     except Exception as e:
         st.error(f"❌ 데이터 로딩 실패: {e}")
         st.stop()
 
-    tabs = st.tabs(["데이터 요약", "월별 트렌드", "위험등급 분포", "지역별 탐색"])
+    # 사전 계산 번들의 차트 명세는 기본 가중치일 때만 사용
+    bundle = active_bundle(strict=True)
+    specs = {}
+    if bundle is not None:
+        st.caption(f"📦 사전 계산 데이터 사용 중 · {bundle.created_at} 생성 ({bundle.version})")
+        if not custom:
+            specs = {name: bundle.chart(name) for name in ("score_trend", "danger_distribution")}
+
+    if custom:
+        # 사용자 가중치로 FINAL_SCORE / DANGER_LEVEL 관련 집계만 로컬에서 교체
+        _, _, rolled, elapsed = rescore(True, *custom)
+        monthly = rolled["month"]
+        month_danger = rolled["month_danger"]
+        region_month = (
+            region_month.drop(columns=["FINAL_SCORE", "DANGER_LEVEL"])
+            .merge(rolled["region_month"], on=["REGION_NAME", "MONTH"], how="left")
+        )
+        st.info(f"⚖️ 사용자 지정 가중치로 다시 계산한 결과입니다. (재계산 {elapsed:.1f} ms)")
+
+    tabs = st.tabs(["데이터 요약", "월별 트렌드", "위험등급 분포", "지역별 탐색", "지역 비교", "순위·변동", "가중치 민감도", "위험 급등 예측"])
 
-    with tabs[0]: render_data_overview(df)
-    with tabs[1]: render_score_trend(df)
-    with tabs[2]: render_danger_distribution(df)
-    with tabs[3]: render_region_explorer(df)
+    with tabs[0]: render_data_overview(profile)
+    with tabs[1]: render_score_trend(monthly, specs.get("score_trend"))
+    with tabs[2]: render_danger_distribution(month_danger, specs.get("danger_distribution"))
+    with tabs[3]: render_region_explorer(region_month)
+    with tabs[4]: render_region_comparison(region_month)
+    with tabs[5]: render_ranking()
+    with tabs[6]: render_sensitivity()
+    with tabs[7]: render_forecast()
 
     # 푸터
     st.divider()
@@ -0,0 +1,147 @@
+"""
+대시보드 데이터 경로 벤치마크 (Streamlit 없이 실행)
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes gu,dong --years 1,5,20 --repeat 5
+
+각 페이지의 데이터 준비 단계를 합성 데이터로 측정해 소요 시간(중앙값)과 최대 메모리를 기록하고,
+결과를 benchmarks/results/<시각>_<커밋>.json에 저장한 뒤 직전 결과와 비교해 느려진 단계를 표시함
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.synthetic import generate
+from utils.backend import LocalBackend
+from utils.map_frames import MapFrames, month_deck
+from utils.partition_index import PartitionIndex
+from utils.prompt import build_report_prompt
+from utils.rollups import REGION_COLUMNS, ROLLUP_SQL
+from utils.schema import build_region_dimension, to_canonical
+from utils.scoring import DEFAULT_WEIGHTS, ScoringEngine
+
+RESULTS_DIR = Path(__file__).parent / "results"
+# 직전 결과보다 이 비율 이상 느려지면 회귀로 표시
+REGRESSION_RATIO = 1.2
+
+
+def measure(fn, repeat):
+    """(중앙값 ms, 최대 메모리 MB, 반환값) - 시간은 tracemalloc 없이 따로 측정"""
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), peak / 1024 / 1024, result
+
+
+def bench_dataset(size, years, repeat):
+    raw, coords = generate(size, years)
+    regions = build_region_dimension(raw["REGION_NAME"], coords)
+    results = {}
+
+    def run(name, fn):
+        ms, mb, value = measure(fn, repeat)
+        results[name] = {"ms": round(ms, 3), "peak_mb": round(mb, 3)}
+        return value
+
+    frame = run("load.canonical", lambda: to_canonical(raw, regions))
+    index = run("load.partition_index", lambda: PartitionIndex(frame))
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        raw.to_parquet(Path(data_dir) / "GENTRIFICATION_STRICT.parquet", index=False)
+        backend = LocalBackend(data_dir)
+        rollups = {
+            name: run(f"dashboard.rollup.{name}", lambda sql=sql: backend.query(sql.format(table="GENTRIFICATION_STRICT")))
+            for name, sql in ROLLUP_SQL.items()
+        }
+        backend.close()
+
+    # 지역 탐색 화면은 region_month 집계를 씀
+    region_month = rollups["region_month"]
+    region = index.regions[len(index.regions) // 2]
+    run("dashboard.render_region_explorer", lambda: (
+        region_month[region_month["REGION_NAME"] == region][["MONTH"] + REGION_COLUMNS + ["DANGER_LEVEL"]]
+        .assign(월=lambda d: d["MONTH"].dt.strftime("%Y-%m"))
+        .sort_values("월")
+    ))
+
+    engine = run("scoring.engine", lambda: ScoringEngine(index))
+    run("scoring.rescore", lambda: engine.rollups(*engine.score(DEFAULT_WEIGHTS)))
+
+    frames = run("map.build_frames", lambda: MapFrames(index))
+    # st.pydeck_chart와 같이 Deck을 만들어 JSON으로 직렬화하는 데까지
+    run("map.render_map", lambda: month_deck(frames, frames.months[-1]).to_json())
+    run("map.playback_payload", lambda: frames.payload())
+
+    year = int(index.years[-1])
+    run("report.build_prompt", lambda: build_report_prompt(region, year, index.region_year(region, year)))
+
+    return {"rows": len(raw), "regions": len(regions), "months": len(index.months), "steps": results}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current, previous):
+    """직전 결과 대비 REGRESSION_RATIO 이상 느려진 (데이터셋, 단계, 이전 ms, 현재 ms) 목록"""
+    regressions = []
+    for dataset, result in current["datasets"].items():
+        before = previous.get("datasets", {}).get(dataset, {}).get("steps", {})
+        for step, value in result["steps"].items():
+            if step in before and value["ms"] > max(before[step]["ms"], 1.0) * REGRESSION_RATIO:
+                regressions.append((dataset, step, before[step]["ms"], value["ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 데이터 경로 벤치마크")
+    parser.add_argument("--sizes", default="gu,dong", help="gu, dong, building 또는 지역 수 (쉼표 구분)")
+    parser.add_argument("--years", default="1,5", help="연도 수 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+
+    revision = git_revision()
+    report = {"revision": revision, "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "datasets": {}}
+    for size in args.sizes.split(","):
+        for years in map(int, args.years.split(",")):
+            name = f"{size}-{years}y"
+            result = bench_dataset(int(size) if size.isdigit() else size, years, args.repeat)
+            report["datasets"][name] = result
+            print(f"\n[{name}] {result['rows']:,}행 · {result['regions']}개 지역 · {result['months']}개월")
+            for step, value in result["steps"].items():
+                print(f"  {step:<36} {value['ms']:>10.2f} ms  {value['peak_mb']:>8.2f} MB")
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    previous = sorted(args.output.glob("*.json"))
+    path = args.output / f"{time.strftime('%Y%m%d-%H%M%S')}_{revision}.json"
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n결과 저장: {path}")
+
+    if previous:
+        last = json.loads(previous[-1].read_text(encoding="utf-8"))
+        regressions = compare(report, last)
+        print(f"직전 결과({last['revision']}) 대비 회귀 {len(regressions)}건")
+        for dataset, step, before, after in regressions:
+            print(f"  ⚠️ [{dataset}] {step}: {before:.2f} ms → {after:.2f} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,50 @@
+"""
+GENTRIFICATION_STRICT 형태의 합성 데이터 생성기
+
+    from benchmarks.synthetic import generate
+    raw, coords = generate("dong", years=5)
+"""
+import numpy as np
+import pandas as pd
+from utils.schema import COORDINATES_PATH, DANGER_LEVELS, DANGER_THRESHOLDS, INDICATORS
+
+# 지역 단위별 지역 수 (구 → 행정동 → 건물)
+SIZES = {"gu": 25, "dong": 426, "building": 20000}
+
+
+def generate(size="gu", years=3, start="2021-01-01", seed=0):
+    """
+    (원천 DataFrame, 좌표 DataFrame) 반환
+    - 구 단위는 실제 25개 구 이름/좌표, 그 이상은 구 좌표 주변에 흩뿌린 가상 지역
+    - NORM_*는 지역별 기준값 + 추세 + 잡음, FINAL_SCORE/DANGER_LEVEL은 공표 가중치로 계산
+    """
+    rng = np.random.default_rng(seed)
+    n_regions = SIZES.get(size, size) if isinstance(size, str) else int(size)
+    gu = pd.read_csv(COORDINATES_PATH)
+
+    if n_regions <= len(gu):
+        coords = gu.head(n_regions).copy()
+    else:
+        parent = rng.integers(0, len(gu), n_regions)
+        coords = pd.DataFrame({
+            "REGION_NAME": [f"{gu.REGION_NAME[p]}-{i:05d}" for i, p in enumerate(parent)],
+            "LAT": gu.LAT.to_numpy()[parent] + rng.normal(0, 0.01, n_regions),
+            "LON": gu.LON.to_numpy()[parent] + rng.normal(0, 0.01, n_regions),
+        })
+
+    months = pd.date_range(start, periods=12 * years, freq="MS")
+    n_ind = len(INDICATORS)
+    base = rng.uniform(0.2, 0.8, (n_regions, 1, n_ind))
+    trend = rng.normal(0, 0.004, (n_regions, 1, n_ind)) * np.arange(len(months))[None, :, None]
+    noise = rng.normal(0, 0.05, (n_regions, len(months), n_ind))
+    norm = np.clip(base + trend + noise, 0, 1).reshape(-1, n_ind).astype(np.float32)
+
+    weights = np.array([w for _, _, w in INDICATORS], dtype=np.float32)
+    score = norm @ (weights / weights.sum())
+
+    raw = pd.DataFrame(norm, columns=[col for col, _, _ in INDICATORS])
+    raw.insert(0, "MONTH", np.tile(months.date, n_regions))
+    raw.insert(0, "REGION_NAME", np.repeat(coords.REGION_NAME.to_numpy(), len(months)))
+    raw["FINAL_SCORE"] = score
+    raw["DANGER_LEVEL"] = np.array(DANGER_LEVELS)[np.digitize(score, DANGER_THRESHOLDS, right=True)]
+    return raw, coords.reset_index(drop=True)
@@ -1,30 +1,13 @@
 import streamlit as st
-import pandas as pd
-import pydeck as pdk
-from utils.data_loader import load_score_data
+import streamlit.components.v1 as components
+from utils.map_frames import get_map_frames, month_deck, playback_html
+from utils.scoring import render_weight_controls
+from utils.tracing import render_trace_panel, traced
+from utils.warmup import start_warmer
 
 # ---------------------- 설정 ----------------------
 st.set_page_config(page_title="젠트리피케이션 지도", layout="wide")
 
-@st.cache_data(show_spinner="데이터 로딩 중...")
-def get_data():
-    return load_score_data(strict=True)
-
-@st.cache_data
-def load_coordinates(csv_path="data/seoul_gu_coordinates.csv"):
-    return pd.read_csv(csv_path)
-
-def preprocess(df):
-    df["MONTH"] = pd.to_datetime(df["MONTH"], errors="coerce")
-    df["월"] = df["MONTH"].dt.to_period("M").dt.to_timestamp()
-    return df
-
-def add_lat_lon(df, coord_df):
-    merged = df.merge(coord_df, on="REGION_NAME", how="left")
-    if merged["LAT"].isnull().sum() > 0:
-        st.warning("⚠️ 좌표 누락 지역이 존재합니다.")
-    return merged
-
 def render_header():
     st.markdown("""
         <div style='padding: 2rem; background: linear-gradient(90deg, #10B981, #4F46E5); border-radius: 1rem; color: white; text-align: center;'>
@@ -43,59 +26,36 @@ def render_header():
     """)
     st.divider()
 
-def render_map(df):
-    months = df["월"].dt.strftime("%Y-%m").unique().tolist()
-    selected_month = st.selectbox("📅 분석할 월 선택", sorted(months)[::-1])
-    map_df = df[df["월"].dt.strftime("%Y-%m") == selected_month].copy()
+@traced("map.render_map")
+def render_map(frames):
+    if frames.missing_coordinates:
+        st.warning("⚠️ 좌표 누락 지역이 존재합니다.")
 
-    required_cols = {"LAT", "LON", "FINAL_SCORE", "REGION_NAME"}
-    if not required_cols.issubset(map_df.columns):
-        st.error(f"❌ 지도 시각화를 위해 {required_cols} 컬럼이 필요합니다.")
+    mode = st.radio("보기 방식", ["월 선택", "시간 흐름 재생"], horizontal=True)
+    if mode == "시간 흐름 재생":
+        st.caption("▶ 버튼 또는 슬라이더로 전체 기간의 위험도 변화를 브라우저에서 바로 재생합니다.")
+        components.html(playback_html(frames), height=580)
         return
 
-    layer = pdk.Layer(
-        "ScatterplotLayer",
-        data=map_df,
-        get_position='[LON, LAT]',
-        get_radius="500 + 2000 * FINAL_SCORE",
-        get_fill_color="""
-            [255 * FINAL_SCORE, 255 * (1 - FINAL_SCORE), 0, 160]
-        """,
-        pickable=True,
-        auto_highlight=True,
-    )
-
-    tooltip = {
-        "html": "<b>{REGION_NAME}</b><br/>위험도: {FINAL_SCORE}",
-        "style": {"backgroundColor": "black", "color": "white"}
-    }
-
-    view_state = pdk.ViewState(
-        latitude=37.5165,
-        longitude=126.9780,
-        zoom=11,
-        pitch=0
-    )
-
-    st.pydeck_chart(pdk.Deck(
-        map_style="mapbox://styles/mapbox/light-v9",
-        initial_view_state=view_state,
-        layers=[layer],
-        tooltip=tooltip
-    ))
+    selected_month = st.selectbox("📅 분석할 월 선택", frames.months[::-1])
+    st.pydeck_chart(month_deck(frames, selected_month))
 
 # ---------------------- 실행 ----------------------
 def main():
+    start_warmer()
     render_header()
+    render_trace_panel()
+    custom = render_weight_controls()
     try:
-        df = preprocess(get_data())
-        coord_df = load_coordinates()
-        df = add_lat_lon(df, coord_df)
+        with st.spinner("데이터 로딩 중..."):
+            frames = get_map_frames(strict=True, weights=custom[0] if custom else None)
     except Exception as e:
         st.error(f"❌ 데이터 로딩 실패: {e}")
         return
 
-    render_map(df)
+    if custom:
+        st.info("⚖️ 사용자 지정 가중치로 다시 계산한 위험 점수를 표시합니다.")
+    render_map(frames)
 
     st.divider()
     st.markdown("""
@@ -1,6 +1,15 @@
 import streamlit as st
-import pandas as pd
-from utils.snowflake import get_snowpark_session
+import hashlib
+from utils.data_loader import dataset_version
+from utils.jobs import DONE, FAILED, get_job_queue
+from utils.llm import get_llm
+from utils.partition_index import get_partition_index
+from utils.pdf_export import bundle_path, export_pdf_bundle, find_font
+from utils.prompt import PROMPT_TOKEN_BUDGET, PROMPT_VERSION, REPORT_MODEL, build_report_prompt, estimate_tokens
+from utils.ranking import load_ranking
+from utils.report_cache import get_report_cache, report_key
+from utils.tracing import render_trace_panel, span
+from utils.warmup import start_warmer
 from datetime import datetime
 
 st.set_page_config(page_title="젠트리피케이션 리포트", layout="wide")
@@ -20,48 +29,52 @@ def render_header():
 
     - LLM이 월별 데이터를 읽고, **위험도 추이**, **이유 분석**, **정책 제언**까지 제공합니다.
     - 보고서는 복사하거나 TXT로 다운로드할 수 있어요.
+    - 여러 지역·연도의 리포트를 차트와 요약표가 포함된 PDF 묶음(ZIP)으로 한 번에 내려받을 수도 있어요.
     """)
     st.divider()
 
 # ---------------------- 리포트 생성 ----------------------
-def generate_report(df, region, year):
-    filtered = df[(df["REGION_NAME"] == region) & (df["YEAR"] == year)]
+def run_report_job(job, region, year, rows, ranking, key, cache, llm):
+    """백그라운드 워커에서 실행 - 캐시에 없을 때만 LLM 호출"""
+    with span("report.generate_report", region=region, year=year) as s:
+        summary = cache.get(key)
+        s.set(cache_hit=summary is not None)
+        if summary is None:
+            job.update(0.2, "프롬프트 생성 중")
+            with span("report.build_prompt"):
+                prompt = build_report_prompt(region, year, rows, ranking)
+            job.update(0.4, "LLM 분석 중")
+            with span("report.llm_complete", prompt_chars=len(prompt), prompt_tokens=estimate_tokens(prompt)):
+                summary = llm.complete(REPORT_MODEL, prompt)
+            cache.put(key, summary, region=region, year=year, model=REPORT_MODEL)
+    return {"region": region, "year": year, "summary": summary}
+
+def request_report(index, region, year):
+    filtered = index.region_year(region, year)
     if filtered.empty:
         st.warning("선택한 조건에 맞는 데이터가 없습니다.")
         return
 
-    with st.spinner("⏳ 분석 중입니다..."):
-        prompt = f"""
-다음은 {year}년 동안 {region}의 월별 젠트리피케이션 위험도 데이터입니다.
-각 항목은 [월 - 지역명: 점수 (등급)] 형식입니다.
+    # 같은 데이터에 대한 요청은 사용자와 관계없이 하나의 작업으로 합쳐짐
+    key = report_key(REPORT_MODEL, PROMPT_VERSION, filtered, dataset_version(strict=True), PROMPT_TOKEN_BUDGET)
+    get_job_queue().submit(
+        key, run_report_job, region, year, filtered, load_ranking(strict=True), key, get_report_cache(), get_llm(),
+        label=f"{region} {year}년"
+    )
 
-""" + "\n".join(
-            f"{row.MONTH_STR} - {row.REGION_NAME}: 위험도 {round(row.FINAL_SCORE, 2)} ({row.DANGER_LEVEL})"
-            for row in filtered.itertuples()
-        ) + f"""
+    keys = st.session_state.setdefault("report_jobs", [])
+    if key in keys:
+        keys.remove(key)
+    keys.insert(0, key)
 
-이 데이터를 바탕으로 다음 항목을 포함한 정책 분석 보고서를 작성해주세요 (16~18줄 이내):
-1. 연중 평균 및 최고 위험도 수준과 해당 월
-2. 점수 상승/하락 시기와 원인에 대한 추론
-3. 유동인구, 매출, 폐업률 등 상권 변화 요소와의 관련성
-4. 자영업자 및 저소득층에 미치는 사회적 영향
-5. 향후 정책 개입 또는 모니터링 방향 제언
+def render_report(job):
+    region, year, summary = job.result["region"], job.result["year"], job.result["summary"]
 
-문체는 도시 정책 보고서처럼 전문적이고 신뢰성 있게 작성해주세요.
-"""
-
-        try:
-            session = get_snowpark_session()
-            result_df = session.sql(f"""
-                SELECT SNOWFLAKE.CORTEX.COMPLETE('claude-3-5-sonnet', $$ {prompt} $$) AS SUMMARY
-            """).to_pandas()
+    st.success("✅ 리포트 생성 완료!")
+    st.markdown("#### 📋 LLM 분석 결과")
+    st.text_area("정책 보고서 요약", summary, height=300, key=f"report_{job.key}")
 
-            summary = result_df.iloc[0, 0]
-            st.success("✅ 리포트 생성 완료!")
-            st.markdown("#### 📋 LLM 분석 결과")
-            st.text_area("정책 보고서 요약", summary, height=300)
-
-            content = f"""
+    content = f"""
 [ Gentrification Report ]
 지역: {region}
 연도: {year}
@@ -70,42 +83,128 @@ def generate_report(df, region, year):
 {summary.strip()}
 """
 
+    st.download_button(
+        label="📄 리포트 다운로드 (TXT)",
+        data=content.encode("utf-8"),
+        file_name=f"{region}_{year}_젠트리피케이션_리포트.txt",
+        mime="text/plain",
+        key=f"download_{job.key}"
+    )
+
+def session_report_jobs():
+    queue = get_job_queue()
+    return [job for job in map(queue.get, st.session_state.get("report_jobs", [])) if job is not None]
+
+def render_report_jobs():
+    """이 세션에서 요청한 리포트 작업 상태 - 진행 중인 작업이 있으면 주기적으로 다시 그림"""
+    jobs = session_report_jobs()
+    for i, job in enumerate(jobs):
+        with st.expander(f"{job.label} · {job.status}", expanded=i == 0):
+            if job.status == DONE:
+                render_report(job)
+            elif job.status == FAILED:
+                st.error(f"❌ 리포트 생성 실패: {job.error}")
+            else:
+                st.progress(job.progress, text=f"⏳ {job.message or job.status}")
+                st.caption("다른 페이지로 이동해도 분석은 계속되며, 돌아오면 결과를 확인할 수 있습니다.")
+
+    if all(job.finished for job in jobs) and st.session_state.get("report_jobs_pending"):
+        # 마지막 작업이 끝나면 주기적 갱신을 멈추기 위해 전체 재실행
+        st.session_state.report_jobs_pending = False
+        st.rerun()
+
+# ---------------------- PDF 묶음 내보내기 ----------------------
+def run_bundle_job(job, name, index, targets, version, cache, llm):
+    path = bundle_path(name)
+    result = export_pdf_bundle(index, targets, version, cache, llm, path, progress=job.update)
+    return {**result, "path": path}
+
+def request_bundle(index, regions, years):
+    targets = [(region, year) for region in regions for year in years]
+    version = dataset_version(strict=True)
+    digest = hashlib.sha256(repr((version, PROMPT_VERSION, PROMPT_TOKEN_BUDGET, sorted(targets))).encode("utf-8")).hexdigest()[:16]
+    key = f"pdf_bundle:{digest}"
+    get_job_queue().submit(
+        key, run_bundle_job, digest, index, targets, version, get_report_cache(), get_llm(),
+        label=f"PDF 묶음 {len(regions)}개 지역 × {len(years)}개 연도"
+    )
+    st.session_state.pdf_bundle_job = key
+
+def render_bundle_job():
+    job = get_job_queue().get(st.session_state.get("pdf_bundle_job", ""))
+    if job is None:
+        return
+    if job.status == DONE:
+        result = job.result
+        st.success(f"✅ {job.label}: PDF {result['written']}/{result['total']}건 생성")
+        for region, year, error in result["failed"]:
+            st.warning(f"{region} {year}년 실패: {error}")
+        with open(result["path"], "rb") as f:
             st.download_button(
-                label="📄 리포트 다운로드 (TXT)",
-                data=content.encode("utf-8"),
-                file_name=f"{region}_{year}_젠트리피케이션_리포트.txt",
-                mime="text/plain"
+                "📦 PDF 묶음 다운로드 (ZIP)", f, file_name="젠트리피케이션_리포트_묶음.zip",
+                mime="application/zip", key=f"download_{job.key}"
             )
+    elif job.status == FAILED:
+        st.error(f"❌ PDF 묶음 생성 실패: {job.error}")
+    else:
+        st.progress(job.progress, text=f"⏳ {job.message or job.status}")
 
-        except Exception as e:
-            st.error(f"❌ 리포트 생성 실패: {e}")
+    if job.finished and st.session_state.get("pdf_bundle_pending"):
+        st.session_state.pdf_bundle_pending = False
+        st.rerun()
+
+def render_bundle_export(index, region_list, year_list):
+    st.divider()
+    st.markdown("### 📦 여러 지역 PDF 묶음 내보내기")
+    if find_font() is None:
+        st.info("PDF에 한글을 넣을 TTF 폰트가 없어 묶음 내보내기를 사용할 수 없습니다. (GENTRI_PDF_FONT 환경변수 또는 fonts-nanum 설치)")
+        return
+
+    regions = st.multiselect("지역", region_list, default=region_list, key="bundle_regions")
+    years = st.multiselect("연도", year_list, default=year_list[:1], key="bundle_years")
+    if st.button("PDF 묶음 만들기", disabled=not regions or not years):
+        request_bundle(index, regions, years)
+
+    job = get_job_queue().get(st.session_state.get("pdf_bundle_job", ""))
+    if job is not None:
+        st.session_state.pdf_bundle_pending = not job.finished
+        st.fragment(render_bundle_job, run_every=2 if not job.finished else None)()
 
 # ---------------------- 실행 ----------------------
 def main():
+    start_warmer()
     render_header()
+    render_trace_panel()
 
     if "shown_tip" not in st.session_state:
         st.info("⚠️ 리포트 생성을 반복 호출하면 Snowflake 비용이 발생할 수 있습니다.")
         st.session_state.shown_tip = True
 
     try:
-        session = get_snowpark_session()
-        df = session.table("RESULT_DB.RESULT.GENTRIFICATION_STRICT").to_pandas()
+        index = get_partition_index(strict=True)
     except Exception as e:
         st.error(f"❌ Snowflake 연결 실패: {e}")
         return
 
-    df["YEAR"] = pd.to_datetime(df["MONTH"]).dt.year
-    df["MONTH_STR"] = pd.to_datetime(df["MONTH"]).dt.strftime("%Y-%m")
-
-    region_list = sorted(df["REGION_NAME"].dropna().unique())
-    year_list = sorted(df["YEAR"].dropna().unique(), reverse=True)
+    region_list = index.regions_with_data()
+    year_list = [int(y) for y in index.years[::-1]]
 
     selected_region = st.selectbox("📍 지역 선택", region_list)
     selected_year = st.selectbox("📅 연도 선택", year_list)
 
     if st.button("LLM 분석 리포트 생성"):
-        generate_report(df, selected_region, selected_year)
+        request_report(index, selected_region, selected_year)
+
+    jobs = session_report_jobs()
+    if jobs:
+        pending = not all(job.finished for job in jobs)
+        st.session_state.report_jobs_pending = pending
+        st.fragment(render_report_jobs, run_every=2 if pending else None)()
+
+    render_bundle_export(index, region_list, year_list)
+
+    stats = get_report_cache().stats()
+    st.caption(f"리포트 캐시: 히트 {stats['hits']} · 미스 {stats['misses']} · 저장된 리포트 {stats['entries']}개 · 일괄 생성 {stats['pinned']}개")
 
     st.divider()
     st.markdown("""
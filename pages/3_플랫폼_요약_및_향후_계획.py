@@ -1,4 +1,5 @@
 import streamlit as st
+from utils.warmup import start_warmer
 
 st.set_page_config(page_title="플랫폼 요약 및 향후 계획", layout="wide")
 
@@ -72,7 +73,7 @@ def render_summary():
         - 각 지표별 가중합을 통한 `FINAL_SCORE` 산출 → 위험 등급 (`DANGER_LEVEL`) 분류
     - **파이프라인 운영 방식**:
         - Snowflake SQL로 재사용 가능한 분석 뷰 구축
-        - 월 단위 데이터 자동 적재 및 처리 계획 예정
+        - 월 단위 적재 파이프라인 (`python -m utils.ingest`): 새 월만 정규화해 월 파티션으로 저장, MinMax 범위가 바뀔 때만 과거 월 재정규화
     """)
 
     st.markdown("## 위험 점수 산정 기준")
@@ -113,6 +114,7 @@ def render_roadmap():
 
 # ---------------------- 실행 ----------------------
 def main():
+    start_warmer()
     render_header()
     render_summary()
     st.divider()
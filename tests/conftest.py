@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# 모듈이 import 시점에 읽는 저장 위치를 테스트 전용 임시 디렉터리로 (실제 .cache를 건드리지 않음)
+_BASE = Path(tempfile.mkdtemp(prefix="gentri-tests-"))
+for _name in ("SNAPSHOT", "BUNDLE", "PROFILE", "INGEST", "ARROW", "FORECAST", "REPORT_CACHE", "LOCAL"):
+    os.environ.setdefault(f"GENTRI_{_name}_DIR", str(_BASE / _name.lower()))
+os.environ.setdefault("GENTRI_BACKEND", "local")
+os.environ.setdefault("GENTRI_LLM", "stub")
+
+from utils.schema import DANGER_LEVELS, NORM_COLUMNS, RAW_COLUMNS  # noqa: E402
+
+REGIONS = ["강남구", "마포구", "성동구", "용산구"]
+
+
+def make_scores(months=6, regions=REGIONS, seed=0):
+    """원천 점수 테이블 형태(SOURCE_COLUMNS)의 합성 데이터 - 지역 × 월 한 행씩"""
+    rng = np.random.default_rng(seed)
+    index = pd.MultiIndex.from_product(
+        [regions, pd.date_range("2023-01-01", periods=months, freq="MS")], names=["REGION_NAME", "MONTH"]
+    )
+    frame = index.to_frame(index=False)
+    for column in NORM_COLUMNS:
+        frame[column] = rng.random(len(frame))
+    frame["FINAL_SCORE"] = frame[NORM_COLUMNS].mean(axis=1)
+    frame["DANGER_LEVEL"] = np.array(DANGER_LEVELS)[np.digitize(frame["FINAL_SCORE"], (0.33, 0.66))]
+    return frame
+
+
+def make_raw(month="2023-01-01", regions=REGIONS, seed=0):
+    """월 적재(utils.ingest) 입력 형태의 합성 원천 지표 한 달 치"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({"REGION_NAME": regions, "MONTH": pd.Timestamp(month)})
+    for column in RAW_COLUMNS:
+        frame[column] = 1000 + 100 * rng.random(len(frame))
+    return frame
+
+
+@pytest.fixture
+def scores():
+    return make_scores()
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from utils.forecast import ForecastModel, fit_or_update
+from utils.mapping_utils import load_coordinates
+from utils.partition_index import PartitionIndex
+from utils.schema import COORDINATES_PATH, build_region_dimension, to_canonical
+
+from conftest import make_scores
+
+
+def partition_index(raw):
+    regions = build_region_dimension(raw["REGION_NAME"], load_coordinates(COORDINATES_PATH))
+    return PartitionIndex(to_canonical(raw, regions))
+
+
+@pytest.fixture
+def history():
+    return make_scores(months=12)
+
+
+def test_new_months_are_appended_without_refit(tmp_path, history, monkeypatch):
+    path = tmp_path / "model.npz"
+    fit_or_update(partition_index(history[history["MONTH"] < "2023-10-01"]), path=path)
+
+    def refit(*args, **kwargs):
+        raise AssertionError("저장된 상태를 이어서 쓰지 않고 다시 적합함")
+
+    monkeypatch.setattr(ForecastModel, "fit", refit)
+    model, _ = fit_or_update(partition_index(history), path=path)
+    assert len(model.months) == 12
+    assert len(model.digests) == 12
+
+
+def test_changed_history_is_refit(tmp_path, history):
+    path = tmp_path / "model.npz"
+    fit_or_update(partition_index(history), path=path)
+
+    edited = history.copy()
+    edited.loc[edited["MONTH"] == "2023-02-01", "FINAL_SCORE"] += 0.3
+    updated, _ = fit_or_update(partition_index(edited), path=path)
+    fresh, _ = fit_or_update(partition_index(edited))
+    np.testing.assert_allclose(updated.level, fresh.level)
+    np.testing.assert_allclose(updated.trend, fresh.trend)
+
+
+def test_state_round_trip_keeps_digests(tmp_path, history):
+    path = tmp_path / "model.npz"
+    model, _ = fit_or_update(partition_index(history), path=path)
+    loaded = ForecastModel.load(path)
+    assert loaded.digests == model.digests
+    np.testing.assert_allclose(loaded.level, model.level)
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from utils import ingest
+from utils.schema import RAW_COLUMNS
+
+from conftest import make_raw
+
+TABLE = "GENTRIFICATION_STRICT"
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "INGEST_DIR", tmp_path)
+    return tmp_path
+
+
+def test_valid_month_is_stored():
+    result = ingest.ingest(TABLE, make_raw())
+    assert result["months"] == ["2023-01"]
+    assert ingest.load_manifest(TABLE)["revision"] == 1
+    assert len(ingest.read_partitions(TABLE)) == 4
+
+
+@pytest.mark.parametrize("column", ["REGION_NAME", "MONTH"])
+def test_missing_key_column_is_rejected(column):
+    with pytest.raises(ValueError, match=column):
+        ingest.ingest(TABLE, make_raw().drop(columns=column))
+    assert ingest.load_manifest(TABLE) is None
+
+
+def test_unparseable_month_is_rejected():
+    raw = make_raw().astype({"MONTH": object})
+    raw.loc[1, "MONTH"] = "not-a-month"
+    with pytest.raises(ValueError, match="MONTH"):
+        ingest.ingest(TABLE, raw)
+    assert ingest.load_manifest(TABLE) is None
+
+
+@pytest.mark.parametrize("columns", [RAW_COLUMNS[:1], RAW_COLUMNS])
+def test_missing_indicator_columns_are_rejected(columns):
+    with pytest.raises(ValueError, match=columns[0]):
+        ingest.ingest(TABLE, make_raw().drop(columns=columns))
+    assert ingest.load_manifest(TABLE) is None
+
+
+def test_rejected_month_leaves_existing_store_untouched():
+    ingest.ingest(TABLE, make_raw())
+    before = ingest.load_manifest(TABLE)
+    with pytest.raises(ValueError):
+        ingest.ingest(TABLE, make_raw("2023-02-01").drop(columns=RAW_COLUMNS[-1]))
+    assert ingest.load_manifest(TABLE) == before
+    assert set(pd.to_datetime(ingest.read_partitions(TABLE)["MONTH"]).dt.strftime("%Y-%m")) == {"2023-01"}
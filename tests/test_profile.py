@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import profile
+from utils.profile import column_summary, merge_partials, profile_partials, update_profile
+
+TABLE = "GENTRIFICATION_STRICT"
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile, "PROFILE_DIR", tmp_path)
+
+
+def test_update_matches_full_recompute(scores):
+    update_profile(TABLE, scores)
+    pd.testing.assert_frame_equal(
+        update_profile(TABLE, scores).drop(columns="SKETCH"),
+        profile_partials(scores).sort_values(["COLUMN", "MONTH"], ignore_index=True).drop(columns="SKETCH"),
+    )
+
+
+def test_same_count_value_change_is_recomputed(scores):
+    update_profile(TABLE, scores)
+    edited = scores.copy()
+    edited.loc[edited["MONTH"] == "2023-03-01", "FINAL_SCORE"] *= 0.5
+
+    updated = update_profile(TABLE, edited)
+    mean = column_summary(updated)[0].loc["최종 점수", "평균"]
+    assert mean == pytest.approx(round(edited["FINAL_SCORE"].mean(), 2), abs=0.01)
+
+    march = updated[(updated["COLUMN"] == "FINAL_SCORE") & (updated["MONTH"] == "2023-03-01")]
+    assert march["SUM"].iloc[0] == pytest.approx(edited.loc[edited["MONTH"] == "2023-03-01", "FINAL_SCORE"].sum())
+
+
+def test_unchanged_months_are_reused(scores, monkeypatch):
+    update_profile(TABLE, scores)
+    extended = pd.concat([scores, scores.assign(MONTH=scores["MONTH"] + pd.DateOffset(months=6))], ignore_index=True)
+
+    seen = []
+    original = profile.profile_partials
+
+    def record(raw):
+        seen.append(set(raw["MONTH"].dt.strftime("%Y-%m")))
+        return original(raw)
+
+    monkeypatch.setattr(profile, "profile_partials", record)
+    update_profile(TABLE, extended)
+    assert seen == [{f"2023-{m:02d}" for m in range(7, 13)}]
+
+
+def test_month_digests_ignore_row_order(scores):
+    shuffled = scores.sample(frac=1, random_state=0).reset_index(drop=True)
+    assert profile.month_digests(scores) == profile.month_digests(shuffled)
+    edited = scores.copy()
+    edited.loc[0, "NORM_PRICE"] = np.nan
+    assert profile.month_digests(edited) != profile.month_digests(scores)
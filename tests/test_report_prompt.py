@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from utils.prompt import (
+    INSTRUCTION_INDICATORS, INSTRUCTIONS, PROMPT_VERSION, REPORT_MODEL, build_report_prompt, estimate_tokens,
+)
+from utils.report_cache import report_key
+from utils.schema import INDICATORS
+
+from conftest import make_scores
+
+LABELS = {column: label for column, label, _ in INDICATORS}
+
+
+@pytest.fixture
+def rows():
+    frame = make_scores(months=12)
+    return frame[frame["REGION_NAME"] == "마포구"].reset_index(drop=True)
+
+
+def key(rows, version="v1", budget=650, prompt_version=PROMPT_VERSION, model=REPORT_MODEL):
+    return report_key(model, prompt_version, rows, version, budget)
+
+
+# ---------------------- report_key ----------------------
+def test_report_key_is_stable(rows):
+    assert key(rows) == key(rows.copy())
+
+
+@pytest.mark.parametrize("change", [
+    {"version": "v2"},
+    {"budget": 400},
+    {"prompt_version": "next"},
+    {"model": "other-model"},
+])
+def test_report_key_changes_with_inputs(rows, change):
+    assert key(rows, **change) != key(rows)
+
+
+def test_report_key_changes_with_row_values(rows):
+    edited = rows.copy()
+    edited.loc[3, "NORM_CLOSE"] += 0.01
+    assert key(edited) != key(rows)
+
+
+# ---------------------- 프롬프트 예산 ----------------------
+@pytest.mark.parametrize("budget", [400, 500, 650])
+def test_optional_lines_stay_within_budget(rows, budget):
+    prompt = build_report_prompt("마포구", 2023, rows, budget=budget)
+    assert estimate_tokens(prompt) <= budget
+    assert estimate_tokens(build_report_prompt("마포구", 2023, rows, budget=2000)) > estimate_tokens(prompt)
+
+
+def test_required_lines_exceed_a_tiny_budget(rows):
+    # 예산은 느슨한 상한: 필수 항목은 예산보다 커도 모두 포함
+    prompt = build_report_prompt("마포구", 2023, rows, budget=10)
+    assert estimate_tokens(prompt) > 10
+    assert "[연간 위험도]" in prompt
+    assert INSTRUCTIONS.strip() in prompt
+    for column in INSTRUCTION_INDICATORS:
+        assert f"- {LABELS[column]}(" in prompt
+    assert "[월별 점수]" not in prompt
+
+
+def test_all_nan_scores_skip_the_score_section(rows):
+    prompt = build_report_prompt("마포구", 2023, rows.assign(FINAL_SCORE=np.nan))
+    assert "[연간 위험도]" not in prompt
+    assert "[지표별 변화]" in prompt
@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+
+from utils import snapshot
+from utils.backend import LocalBackend
+from utils.schema import SOURCE_COLUMNS
+
+TABLE = "GENTRIFICATION_STRICT"
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch, scores):
+    """원천 테이블(로컬 DuckDB)과 빈 스냅샷 디렉터리 - 스냅샷은 매번 워터마크를 확인하도록 MAX_AGE=0"""
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", tmp_path / "snapshots")
+    monkeypatch.setattr(snapshot, "SNAPSHOT_MAX_AGE", 0)
+    data_dir = tmp_path / "source"
+    data_dir.mkdir()
+
+    def write(frame):
+        frame.to_parquet(data_dir / f"{TABLE}.parquet", index=False)
+        return LocalBackend(data_dir)
+
+    write(scores)
+    return write
+
+
+@pytest.fixture
+def sync(monkeypatch):
+    """sync_snapshot 실행 후 (DataFrame, 동기화 방식)"""
+    modes = []
+    original = snapshot._sync
+
+    def record(*args):
+        df, mode = original(*args)
+        modes.append(mode)
+        return df, mode
+
+    monkeypatch.setattr(snapshot, "_sync", record)
+
+    def run(backend):
+        df = snapshot.sync_snapshot(TABLE, backend, columns=SOURCE_COLUMNS)
+        return df, modes[-1]
+
+    return run
+
+
+def sorted_frame(df):
+    return df.sort_values(["REGION_NAME", "MONTH"]).reset_index(drop=True)[SOURCE_COLUMNS]
+
+
+def test_first_sync_is_full(source, sync, scores):
+    df, mode = sync(source(scores))
+    assert mode == "full"
+    pd.testing.assert_frame_equal(sorted_frame(df), sorted_frame(scores), check_dtype=False)
+
+
+def test_unchanged_source_is_not_refetched(source, sync, scores):
+    sync(source(scores))
+    _, mode = sync(source(scores))
+    assert mode == "unchanged"
+
+
+def test_new_month_is_fetched_as_delta(source, sync, scores):
+    sync(source(scores[scores["MONTH"] < "2023-06-01"]))
+    df, mode = sync(source(scores))
+    assert mode == "delta"
+    pd.testing.assert_frame_equal(sorted_frame(df), sorted_frame(scores), check_dtype=False)
+
+
+def test_same_count_value_change_is_detected(source, sync, scores):
+    sync(source(scores))
+    edited = scores.copy()
+    edited.loc[edited["MONTH"] == "2023-02-01", "FINAL_SCORE"] += 0.5
+    df, mode = sync(source(edited))
+    assert mode == "delta"
+    assert snapshot.load_snapshot_meta(TABLE)["row_count"] == len(scores)
+    pd.testing.assert_frame_equal(sorted_frame(df), sorted_frame(edited), check_dtype=False)
+
+
+def test_most_months_changed_reloads_everything(source, sync, scores):
+    sync(source(scores))
+    rescaled = scores.assign(FINAL_SCORE=scores["FINAL_SCORE"] / 2)
+    df, mode = sync(source(rescaled))
+    assert mode == "full"
+    pd.testing.assert_frame_equal(sorted_frame(df), sorted_frame(rescaled), check_dtype=False)
+
+
+def test_version_changes_with_content(source, sync, scores):
+    sync(source(scores))
+    before = snapshot.snapshot_version(TABLE, snapshot.load_snapshot_meta(TABLE))
+    edited = scores.copy()
+    edited.loc[0, "NORM_PRICE"] += 0.1
+    sync(source(edited))
+    after = snapshot.snapshot_version(TABLE, snapshot.load_snapshot_meta(TABLE))
+    assert before != after
@@ -0,0 +1,228 @@
+"""
+월별 위험 점수 급등 감지 및 알림
+
+    python -m utils.anomaly --sink stdout
+    python -m utils.anomaly --sink file:.cache/alerts.jsonl
+    python -m utils.anomaly --sink webhook:https://hooks.slack.com/services/...
+    python -m utils.ingest raw_2024-01.csv --alert webhook:https://hooks.slack.com/services/...
+
+지역별 EWMA 평균/분산과 CUSUM 상태를 저장해 두고, 다음 실행 때는
+마지막으로 처리한 월 이후의 행만 O(1)씩 갱신함 (과거 이력 재스캔 없음)
+월 적재(utils.ingest --alert)를 쓰면 새 월 파티션이 기록될 때마다 그 월만 감지
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import requests
+
+ANOMALY_STATE_DIR = Path(os.environ.get("GENTRI_ANOMALY_DIR", ".cache/anomaly"))
+
+
+def state_path(table_name, column="FINAL_SCORE"):
+    """테이블·컬럼별 감지 상태 파일"""
+    return ANOMALY_STATE_DIR / f"{table_name}_{column}.json"
+
+
+# ---------------------- 감지기 ----------------------
+class AnomalyDetector:
+    """
+    지역별 스트리밍 이상 감지
+    - EWMA: 직전까지의 지수가중 평균/분산 대비 z-점수가 z_threshold 이상이면 알림
+    - CUSUM: 표준화 편차의 누적합이 cusum_h를 넘으면 알림 (완만하지만 지속적인 상승)
+    처음 warmup개 관측치는 상태만 쌓고, 예상값과의 차이가 min_change 미만이면 알림을 내지 않음
+    """
+
+    def __init__(self, alpha=0.3, z_threshold=3.0, cusum_k=0.5, cusum_h=4.0, warmup=6, min_change=0.05, state=None):
+        self.alpha = alpha
+        self.min_change = min_change
+        self.z_threshold = z_threshold
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.warmup = warmup
+        self.state = state or {}
+
+    def update(self, region, month, value):
+        """새 지역-월 값 하나 반영 - 발생한 알림 이벤트 목록 반환"""
+        s = self.state.get(region)
+        if s is None:
+            self.state[region] = {"n": 1, "mean": value, "var": 0.0, "cusum": 0.0, "last_month": month}
+            return []
+
+        events = []
+        std = math.sqrt(s["var"])
+        z = (value - s["mean"]) / std if std > 1e-9 else 0.0
+        s["cusum"] = max(0.0, s["cusum"] + z - self.cusum_k)
+
+        if s["n"] >= self.warmup and value - s["mean"] >= self.min_change:
+            base = {"region": region, "month": month, "value": round(value, 4),
+                    "expected": round(s["mean"], 4), "z": round(z, 2)}
+            if z >= self.z_threshold:
+                events.append({**base, "kind": "ewma_spike"})
+            elif s["cusum"] >= self.cusum_h:
+                events.append({**base, "kind": "cusum_shift", "cusum": round(s["cusum"], 2)})
+        if s["cusum"] >= self.cusum_h:
+            s["cusum"] = 0.0
+
+        diff = value - s["mean"]
+        incr = self.alpha * diff
+        s["mean"] += incr
+        s["var"] = (1 - self.alpha) * (s["var"] + diff * incr)
+        s["n"] += 1
+        s["last_month"] = month
+        return events
+
+    def process(self, frame, column="FINAL_SCORE"):
+        """지역별 마지막 처리 월 이후의 행만 월 순서대로 반영"""
+        rows = frame[["REGION_NAME", "MONTH", column]].dropna()
+        months = rows["MONTH"].dt.strftime("%Y-%m")
+        regions = rows["REGION_NAME"].astype(str)
+        # 지역별 마지막 처리 월 (지역 수만큼만 만들고 행에는 해시 조인으로 붙임)
+        last = regions.map({region: s["last_month"] for region, s in self.state.items()}).fillna("")
+        new = rows[(months > last).to_numpy()].assign(_month=months).sort_values("MONTH", kind="stable")
+
+        events = []
+        for region, month, value in zip(new["REGION_NAME"].astype(str), new["_month"], new[column]):
+            events.extend(self.update(region, month, float(value)))
+        return events
+
+    # ---------------------- 상태 저장 ----------------------
+    def params(self):
+        return {"alpha": self.alpha, "z_threshold": self.z_threshold, "cusum_k": self.cusum_k,
+                "cusum_h": self.cusum_h, "warmup": self.warmup, "min_change": self.min_change}
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"params": self.params(), "state": self.state}, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, **params):
+        """저장된 상태 불러오기 - 파라미터가 바뀌었으면 처음부터 다시 시작"""
+        detector = cls(**params)
+        try:
+            saved = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return detector
+        if saved.get("params") == detector.params():
+            detector.state = saved["state"]
+        return detector
+
+
+# ---------------------- 알림 전송 ----------------------
+class StdoutSink:
+    def emit(self, events):
+        for event in events:
+            print(json.dumps(event, ensure_ascii=False))
+
+
+class FileSink:
+    """JSONL 파일에 이어 쓰기"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def emit(self, events):
+        if not events:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+class WebhookSink:
+    """Slack 호환 웹훅 (text 필드) + 원본 이벤트(events 필드)를 한 번에 POST"""
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def emit(self, events):
+        if not events:
+            return
+        lines = [
+            f"⚠️ {e['month']} {e['region']} 위험도 {e['value']} (예상 {e['expected']}, z={e['z']}, {e['kind']})"
+            for e in events
+        ]
+        response = requests.post(self.url, json={"text": "\n".join(lines), "events": events}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class LocalWebhookServer:
+    """웹훅 테스트용 로컬 HTTP 서버 - 받은 요청 본문을 received에 저장"""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        received = self.received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                received.append(json.loads(body or b"{}"))
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = HTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self._server.server_port}/"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def make_sink(spec):
+    """stdout | file:<경로> | webhook:<URL>"""
+    kind, _, target = spec.partition(":")
+    if kind == "stdout":
+        return StdoutSink()
+    if kind == "file":
+        return FileSink(target)
+    if kind == "webhook":
+        return WebhookSink(target)
+    raise ValueError(f"알 수 없는 알림 대상: {spec}")
+
+
+def run_detection(frame, sink, path, column="FINAL_SCORE", **params):
+    """상태 불러오기 → 새 행 처리 → 알림 전송 → 상태 저장 (전송에 실패하면 상태를 저장하지 않음)"""
+    detector = AnomalyDetector.load(path, **params)
+    events = detector.process(frame, column)
+    sink.emit(events)
+    detector.save(path)
+    return events
+
+
+def main(argv=None):
+    from utils.partition_index import get_partition_index
+    from utils.schema import score_table
+
+    parser = argparse.ArgumentParser(description="월별 위험 점수 급등 감지")
+    parser.add_argument("--sink", default="stdout", help="stdout | file:<경로> | webhook:<URL>")
+    parser.add_argument("--column", default="FINAL_SCORE")
+    parser.add_argument("--z", type=float, default=3.0, help="EWMA z-점수 임계값")
+    parser.add_argument("--alpha", type=float, default=0.3, help="EWMA 평활 계수")
+    args = parser.parse_args(argv)
+
+    frame = get_partition_index(strict=True).frame
+    path = state_path(score_table(strict=True), args.column)
+    events = run_detection(frame, make_sink(args.sink), path, args.column, alpha=args.alpha, z_threshold=args.z)
+    print(f"알림 {len(events)}건", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,223 @@
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import streamlit as st
+from utils.ingest import INGEST_DIR, partition_files
+from utils.tracing import span
+
+# 로컬 백엔드가 읽을 Parquet 디렉터리 (기본값: 스냅샷 디렉터리 → 마지막 스냅샷으로 오프라인 동작)
+LOCAL_DATA_DIR = Path(os.environ.get("GENTRI_LOCAL_DIR", os.environ.get("GENTRI_SNAPSHOT_DIR", ".cache/snapshots")))
+POOL_SIZE = int(os.environ.get("GENTRI_POOL_SIZE", 4))
+# 유휴 시간이 이보다 길었던 연결은 재사용 전에 SELECT 1 로 확인
+KEEPALIVE_SECONDS = int(os.environ.get("GENTRI_POOL_KEEPALIVE", 300))
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 고정 크기 연결 풀
+    - 최대 max_size 개까지만 동시에 대여, 초과 요청은 반납될 때까지 대기
+    - 오래 쉬었던 연결은 ping 후 재사용, 실패하면 새로 로그인
+    """
+
+    def __init__(self, factory, ping, max_size=POOL_SIZE, keepalive=KEEPALIVE_SECONDS):
+        self._factory = factory
+        self._ping = ping
+        self._keepalive = keepalive
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def _checkout(self):
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._factory()
+            if time.monotonic() - last_used < self._keepalive:
+                return conn
+            try:
+                self._ping(conn)
+                return conn
+            except Exception:
+                self._discard(conn)
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def acquire(self, timeout=30):
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("사용 가능한 연결이 없습니다.")
+        conn = None
+        try:
+            with span("pool.checkout"):
+                conn = self._checkout()
+            yield conn
+        except Exception:
+            # 오류가 난 연결은 상태를 알 수 없으므로 버림
+            if conn is not None:
+                self._discard(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._idle.put((conn, time.monotonic()))
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+
+class SnowflakeBackend:
+    """Snowflake 백엔드 - connector 연결과 Snowpark 세션을 풀로 재사용"""
+
+    name = "snowflake"
+
+    def __init__(self):
+        from utils.snowflake import get_snowflake_connection, get_snowpark_session
+
+        self._connections = ConnectionPool(
+            get_snowflake_connection,
+            ping=lambda conn: conn.cursor().execute("SELECT 1").fetchall(),
+        )
+        self._sessions = ConnectionPool(
+            get_snowpark_session,
+            ping=lambda session: session.sql("SELECT 1").collect(),
+            max_size=max(1, POOL_SIZE // 2),
+        )
+
+    def query(self, sql, params=None):
+        with self._connections.acquire() as conn:
+            cur = conn.cursor()
+            try:
+                with span("snowflake.execute"):
+                    cur.execute(sql, params)
+                with span("snowflake.fetch_pandas_all") as s:
+                    df = cur.fetch_pandas_all()
+                    s.set_frame(df)
+                return df
+            finally:
+                cur.close()
+
+    @staticmethod
+    def hash_agg(columns):
+        """행 순서와 무관한 집계 해시 SQL 식 (스냅샷 월별 변경 감지용)"""
+        return f"HASH_AGG({columns})"
+
+    @contextmanager
+    def session(self):
+        """Snowpark DataFrame API가 필요할 때 사용"""
+        with self._sessions.acquire() as session:
+            yield session
+
+    def complete(self, model, prompt):
+        with span("cortex.complete", model=model, prompt_chars=len(prompt)):
+            result = self.query("SELECT SNOWFLAKE.CORTEX.COMPLETE(%s, %s) AS SUMMARY", (model, prompt))
+        return result.iloc[0, 0]
+
+    def close(self):
+        self._connections.close()
+        self._sessions.close()
+
+
+class LocalBackend:
+    """
+    DuckDB + Parquet 로컬 백엔드 - Snowflake 없이 앱/테스트/벤치마크 실행용
+    data_dir 안의 <테이블명>.parquet 파일을 같은 이름의 뷰로 등록하며,
+    RESULT_DB.RESULT.<테이블명> 형태의 정규화된 이름도 그대로 사용할 수 있음
+    """
+
+    name = "local"
+
+    def __init__(self, data_dir=LOCAL_DATA_DIR):
+        import duckdb
+
+        self._data_dir = Path(data_dir)
+        self._db = duckdb.connect()
+        self._db.execute("ATTACH ':memory:' AS RESULT_DB")
+        self._db.execute("CREATE SCHEMA RESULT_DB.RESULT")
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """
+        data_dir의 Parquet 파일과 월 적재 저장소(utils.ingest)의 테이블을 다시 읽어 뷰 등록
+        같은 이름이면 저장소 쪽이 우선 (저장소 manifest에 기록된 현재 리비전 파티션 파일만 읽음)
+        """
+        sources = {path.stem.upper(): [path] for path in sorted(self._data_dir.glob("*.parquet"))}
+        for manifest in sorted(INGEST_DIR.glob("*/manifest.json")):
+            files = partition_files(manifest.parent.name)
+            if files:
+                sources[manifest.parent.name.upper()] = files
+        with self._lock:
+            for table, paths in sources.items():
+                # 월 파티션 디렉터리 이름(month=YYYY-MM)을 컬럼으로 해석하지 않음 (MONTH 컬럼과 충돌)
+                source = ", ".join("'" + str(path).replace("'", "''") + "'" for path in paths)
+                for name in (table, f"RESULT_DB.RESULT.{table}"):
+                    self._db.execute(
+                        f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM read_parquet([{source}], union_by_name = true, hive_partitioning = false)"
+                    )
+
+    def query(self, sql, params=None):
+        # Snowflake connector의 %s 바인딩을 DuckDB의 ? 바인딩으로 변환
+        sql = re.sub(r"%s", "?", sql)
+        with self._lock:
+            cur = self._db.cursor()
+        try:
+            with span("local.query") as s:
+                df = cur.execute(sql, params or []).df()
+                s.set_frame(df)
+            return df
+        finally:
+            cur.close()
+
+    @staticmethod
+    def hash_agg(columns):
+        """Snowflake HASH_AGG 대용 - 행 해시의 XOR (행 순서와 무관)"""
+        return f"BIT_XOR(HASH({columns}))"
+
+    @contextmanager
+    def session(self):
+        yield self
+
+    def complete(self, model, prompt):
+        """Cortex 대신 프롬프트 해시 기반의 결정적인 더미 응답 반환"""
+        from utils.llm import StubLLM
+        return StubLLM().complete(model, prompt)
+
+    def close(self):
+        self._db.close()
+
+
+def _backend_name():
+    name = os.environ.get("GENTRI_BACKEND")
+    if name:
+        return name.lower()
+    try:
+        return "snowflake" if "snowflake" in st.secrets else "local"
+    except Exception:
+        return "local"
+
+
+@st.cache_resource(show_spinner=False)
+def get_backend(name=None):
+    """프로세스 전체에서 공유하는 데이터 백엔드 (GENTRI_BACKEND=snowflake|local)"""
+    name = name or _backend_name()
+    if name == "snowflake":
+        return SnowflakeBackend()
+    if name == "local":
+        return LocalBackend()
+    raise ValueError(f"알 수 없는 백엔드: {name}")
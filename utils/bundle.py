@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+# 사전 계산 번들 저장 위치 (python -m utils.precompute 가 생성)
+BUNDLE_DIR = Path(os.environ.get("GENTRI_BUNDLE_DIR", ".cache/bundles"))
+# 0이면 번들을 무시하고 항상 원본에서 계산
+USE_BUNDLE = os.environ.get("GENTRI_USE_BUNDLE", "1") != "0"
+# 테이블별로 보관할 최근 번들 수
+BUNDLE_KEEP = int(os.environ.get("GENTRI_BUNDLE_KEEP", 3))
+
+BUNDLE_FORMAT = 1
+MANIFEST = "manifest.json"
+
+
+class Bundle:
+    """
+    번들 디렉터리 하나 (BUNDLE_DIR/<테이블>/<생성 시각>/)
+    - manifest.json: 형식 버전, 데이터 버전, 생성 시각, 파일 목록/행 수
+    - <이름>.parquet: 표 형태 결과 / <이름>.vl.json: Vega-Lite 차트 명세
+    manifest.json은 마지막에 쓰므로, manifest가 있으면 완성된 번들임
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / MANIFEST).read_text(encoding="utf-8"))
+
+    @property
+    def version(self):
+        return self.manifest["dataset_version"]
+
+    @property
+    def created_at(self):
+        return self.manifest["created_at"]
+
+    def has(self, name):
+        return name in self.manifest["files"]
+
+    def table(self, name):
+        return _read_table(str(self.path), self.manifest["files"][name])
+
+    def file(self, name):
+        """캐시를 거치지 않고 직접 읽을 때 쓰는 파일 경로"""
+        return self.path / self.manifest["files"][name]
+
+    def chart(self, name):
+        if not self.has(name):
+            return None
+        return json.loads((self.path / self.manifest["files"][name]).read_text(encoding="utf-8"))
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _read_table(path, filename):
+    return pd.read_parquet(Path(path) / filename)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _open_bundle(path):
+    return Bundle(path)
+
+
+def latest_bundle(table_name, version=None):
+    """
+    가장 최근에 완성된 번들 (없거나 형식이 다르면 None)
+    version을 주면 그 데이터 버전으로 만든 번들 중 가장 최근 것만
+    """
+    if not USE_BUNDLE:
+        return None
+    manifests = sorted((BUNDLE_DIR / table_name).glob(f"*/{MANIFEST}"))
+    for manifest in reversed(manifests):
+        try:
+            bundle = _open_bundle(str(manifest.parent))
+        except Exception:
+            continue
+        if bundle.manifest.get("format") == BUNDLE_FORMAT and version in (None, bundle.version):
+            return bundle
+    return None
+
+
+class BundleWriter:
+    """임시 디렉터리에 파일을 쓰고 commit()에서 manifest 작성 후 이름을 바꿔 한 번에 공개"""
+
+    def __init__(self, table_name, dataset_version):
+        self.table_name = table_name
+        self.dataset_version = dataset_version
+        self.started = time.time()
+        self.name = time.strftime("%Y%m%dT%H%M%S", time.gmtime(self.started))
+        self.root = BUNDLE_DIR / table_name
+        self.tmp = self.root / f".tmp-{self.name}-{os.getpid()}"
+        self.tmp.mkdir(parents=True, exist_ok=True)
+        self.files = {}
+        self.rows = {}
+
+    def add_table(self, name, df):
+        filename = f"{name}.parquet"
+        df.to_parquet(self.tmp / filename)
+        self.files[name] = filename
+        self.rows[name] = len(df)
+
+    def add_chart(self, name, spec):
+        filename = f"{name}.vl.json"
+        (self.tmp / filename).write_text(json.dumps(spec, ensure_ascii=False, default=str), encoding="utf-8")
+        self.files[name] = filename
+
+    def commit(self):
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "table": self.table_name,
+            "dataset_version": self.dataset_version,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+            "build_seconds": round(time.time() - self.started, 2),
+            "files": self.files,
+            "rows": self.rows,
+        }
+        (self.tmp / MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        final = self.root / self.name
+        if final.exists():
+            shutil.rmtree(final)
+        self.tmp.rename(final)
+        prune_bundles(self.table_name)
+        return final
+
+    def abort(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+def prune_bundles(table_name, keep=BUNDLE_KEEP):
+    """최근 keep개만 남기고 오래된 번들 삭제"""
+    bundles = sorted(p.parent for p in (BUNDLE_DIR / table_name).glob(f"*/{MANIFEST}"))
+    for path in bundles[:-keep] if keep > 0 else []:
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,28 @@
+# 대시보드와 사전 계산 번들(utils.precompute)이 함께 쓰는 차트 정의
+# 번들에는 chart.to_dict() 결과(Vega-Lite JSON)가 저장되고 st.vega_lite_chart로 그대로 그림
+# altair는 import가 무거워(수백 ms) 차트를 실제로 만들 때만 import - 번들 명세를 쓰면 import하지 않음
+
+
+def score_trend_chart(monthly):
+    import altair as alt
+
+    monthly_score = monthly.rename(columns={"MONTH": "월"})
+
+    return alt.Chart(monthly_score).mark_line(point=True).encode(
+        x=alt.X("월:T", title="월"),
+        y=alt.Y("FINAL_SCORE:Q", title="평균 위험 점수"),
+        tooltip=["월", "FINAL_SCORE"]
+    ).properties(height=400)
+
+
+def danger_distribution_chart(month_danger):
+    import altair as alt
+
+    danger_dist = month_danger.rename(columns={"MONTH": "월", "CNT": "건수"})
+
+    return alt.Chart(danger_dist).mark_bar().encode(
+        x=alt.X("월:T", title="월"),
+        y=alt.Y("건수:Q"),
+        color="DANGER_LEVEL:N",
+        tooltip=["월", "DANGER_LEVEL", "건수"]
+    ).properties(height=400)
@@ -1,24 +1,154 @@
+import os
+
 import pandas as pd
 import streamlit as st
-from utils.snowflake import get_snowflake_connection
-
-@st.cache_data(show_spinner="데이터를 불러오는 중입니다...")
-def load_score_data(strict: bool = True):
-    conn = get_snowflake_connection()
-    table_name = "GENTRIFICATION_STRICT" if strict else "GENTRIFICATION_SCORE"
-    
-    query = f"SELECT * FROM {table_name}"
-    cur = conn.cursor()
-    cur.execute(query)
-    df = cur.fetch_pandas_all()
-
-    cur.close()
-    conn.close()
-
-    # MONTH 처리
-    if "MONTH" in df.columns:
-        df["MONTH"] = pd.to_datetime(df["MONTH"], errors="coerce")
-        df["MONTH"] = df["MONTH"].dt.strftime("%Y-%m-%d")  # Arrow-safe
-        df["연도"] = pd.to_datetime(df["MONTH"], errors="coerce").dt.year
-
-    return df
\ No newline at end of file
+from utils.backend import get_backend
+from utils.bundle import latest_bundle
+from utils.ingest import load_manifest, read_partitions, store_version
+from utils.mapping_utils import load_coordinates
+from utils.schema import COORDINATES_PATH, SOURCE_COLUMNS, build_region_dimension, score_table, to_canonical
+from utils.shared_data import SharedDataset, prepare_shared, session_overlay
+from utils.snapshot import load_snapshot, load_snapshot_meta, snapshot_version, sync_snapshot
+from utils.tracing import span
+
+# 이 시간(초)마다 원천 테이블과 스냅샷을 다시 동기화 (새 월/값 변경 확인)
+SYNC_TTL = int(os.environ.get("GENTRI_SYNC_TTL", 15 * 60))
+
+@st.cache_data(show_spinner="데이터를 동기화하는 중입니다...", ttl=SYNC_TTL)
+def _synced_meta(strict, force_refresh):
+    """스냅샷을 동기화한 뒤 실제로 기록된 메타 - 데이터 버전은 항상 이 메타에서 만듦"""
+    table_name = score_table(strict)
+    sync_snapshot(table_name, get_backend(), force=force_refresh, columns=SOURCE_COLUMNS)
+    return load_snapshot_meta(table_name) or {}
+
+def _snapshot_version(strict, force_refresh=False):
+    return snapshot_version(score_table(strict), _synced_meta(strict, force_refresh))
+
+@st.cache_data(show_spinner="데이터를 불러오는 중입니다...", max_entries=2)
+def _synced_raw(strict, version):
+    # 동기화 직후의 스냅샷 파일을 버전별로 읽음 (다른 프로세스가 지운 경우에만 다시 동기화)
+    table_name = score_table(strict)
+    df, _ = load_snapshot(table_name)
+    if df is None:
+        df = sync_snapshot(table_name, get_backend(), columns=SOURCE_COLUMNS)
+    return df
+
+@st.cache_data(show_spinner="데이터를 불러오는 중입니다...", max_entries=4)
+def _ingested_raw(table_name, version, months=None):
+    return read_partitions(table_name, months, columns=SOURCE_COLUMNS)
+
+def load_raw_data(strict: bool = True, force_refresh: bool = False):
+    """
+    월 적재 저장소(utils.ingest)가 있으면 저장소의 월 파티션,
+    없으면 로컬 Parquet 스냅샷 + 신규 월만 증분 조회 (필요한 컬럼만)
+    """
+    table_name = score_table(strict)
+    manifest = load_manifest(table_name)
+    if manifest is not None:
+        return _ingested_raw(table_name, store_version(manifest))
+    return _synced_raw(strict, _snapshot_version(strict, force_refresh))
+
+def refresh_data():
+    """SYNC_TTL을 기다리지 않고 다음 호출에서 원천 테이블과 다시 동기화"""
+    _synced_meta.clear()
+
+def _source_version(table_name):
+    """디스크에 기록된 원천(월 적재 저장소 또는 스냅샷)의 데이터 버전 - 원천이 없으면 None (동기화하지 않음)"""
+    manifest = load_manifest(table_name)
+    if manifest is not None:
+        return store_version(manifest)
+    meta = load_snapshot_meta(table_name)
+    return None if meta is None else snapshot_version(table_name, meta)
+
+def active_bundle(strict: bool = True):
+    """
+    사용 중인 사전 계산 번들 (utils.precompute로 생성, 없으면 None)
+    적재/동기화로 원천 버전이 바뀌면 그 버전으로 만든 번들만 사용 (없으면 원천에서 계산)
+    로컬 원천 없이 번들만 배포한 경우에는 최신 번들 사용
+    """
+    table_name = score_table(strict)
+    return latest_bundle(table_name, _source_version(table_name))
+
+def dataset_version(strict: bool = True):
+    """
+    스냅샷의 워터마크/행 수/월별 내용 해시 기반 데이터 버전 문자열 - 파생 캐시의 키로 사용
+    (번들 사용 시 번들의 버전, 월 적재 저장소가 있으면 저장소 리비전 포함)
+    스냅샷은 먼저 동기화한 뒤 그때 기록된 메타로 버전을 만들므로 버전과 데이터가 어긋나지 않음
+    """
+    bundle = active_bundle(strict)
+    if bundle is not None:
+        return bundle.version
+    table_name = score_table(strict)
+    manifest = load_manifest(table_name)
+    if manifest is not None:
+        return store_version(manifest)
+    return _snapshot_version(strict)
+
+def _month_keys(months):
+    return None if months is None else tuple(sorted({pd.Timestamp(m).strftime("%Y-%m") for m in months}))
+
+def _select_months(df, keys):
+    return df if keys is None else df[df["MONTH"].isin(pd.to_datetime(list(keys)))]
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _region_dimension(strict, version):
+    # 월 적재 저장소는 일부 월만 읽어도 REGION_ID가 같도록 저장소 전체의 지역 목록 사용
+    manifest = load_manifest(score_table(strict))
+    names = manifest["regions"] if manifest is not None else load_raw_data(strict)["REGION_NAME"]
+    return build_region_dimension(names, load_coordinates(COORDINATES_PATH))
+
+def _canonicalize(strict, version, months=None):
+    table_name = score_table(strict)
+    if months is not None and load_manifest(table_name) is not None:
+        raw = _ingested_raw(table_name, version, months)
+    else:
+        raw = load_raw_data(strict)
+    regions = _region_dimension(strict, version)
+    with span("data.canonicalize", months=len(months) if months else None) as s:
+        df = to_canonical(raw, regions)
+        if months is not None:
+            df = _select_months(df, months).reset_index(drop=True)
+        s.set_frame(df)
+    return df
+
+@st.cache_data(show_spinner="데이터를 불러오는 중입니다...", max_entries=8)
+def _canonical_data(strict, version, months):
+    return _canonicalize(strict, version, months)
+
+@st.cache_resource(show_spinner="데이터를 불러오는 중입니다...", max_entries=2)
+def _shared_dataset(strict, version):
+    bundle = active_bundle(strict)
+    df = pd.read_parquet(bundle.file("scores")) if bundle is not None else _canonicalize(strict, version)
+    with span("data.share") as s:
+        shared = SharedDataset.build(prepare_shared(df), version)
+        s.set(rows=shared.table.num_rows, nbytes=shared.nbytes, mapped=shared.mapped)
+    return shared
+
+def get_shared_dataset(strict: bool = True):
+    """프로세스 전체가 공유하는 읽기 전용 Arrow 데이터셋 (데이터 버전당 하나, utils.shared_data 참고)"""
+    return _shared_dataset(strict, dataset_version(strict))
+
+def get_session_overlay(strict: bool = True):
+    """현재 세션 전용 파생 컬럼 저장소 (공유 프레임은 그대로 두고 여기에만 추가)"""
+    return session_overlay(score_table(strict), dataset_version(strict))
+
+def load_region_dimension(strict: bool = True):
+    """REGION_ID, REGION_NAME, LAT, LON 지역 차원 테이블"""
+    bundle = active_bundle(strict)
+    if bundle is not None:
+        return bundle.table("regions")
+    return _region_dimension(strict, dataset_version(strict))
+
+def load_score_data(strict: bool = True, months=None):
+    """
+    모든 페이지가 공유하는 정규화 프레임 (utils.schema.to_canonical 참고)
+    사전 계산 번들이 있으면 웨어하우스 접속 없이 번들의 프레임 사용
+    months(월 목록)를 주면 해당 월의 행만 - 월 적재 저장소가 있으면 그 월의 파티션만 읽음
+    전체 프레임은 프로세스 공유 Arrow 테이블을 복사 없이 감싼 읽기 전용 뷰 (세션/페이지마다 사본을 만들지 않음)
+    파생 컬럼은 get_session_overlay()에 둘 것
+    """
+    keys = _month_keys(months)
+    version = dataset_version(strict)
+    if keys is not None and active_bundle(strict) is None and load_manifest(score_table(strict)) is not None:
+        return _canonical_data(strict, version, keys)
+    return _select_months(_shared_dataset(strict, version).frame(), keys)
@@ -0,0 +1,109 @@
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# 한 차트에 보내는 최대 점 수 (Altair 기본 max_rows 5000 이하로 유지)
+MAX_POINTS = int(os.environ.get("GENTRI_CHART_MAX_POINTS", 4000))
+# 이 수보다 많은 지역을 고르면 개별 선 대신 서버에서 평균/분위수 밴드로 집계
+MAX_LINES = int(os.environ.get("GENTRI_CHART_MAX_LINES", 10))
+# 시리즈 하나당 최소 점 수 (이보다 적게 줄이면 추세가 사라짐)
+MIN_SERIES_POINTS = 24
+
+
+# ---------------------- 다운샘플링 ----------------------
+def lttb(x, y, n):
+    """
+    Largest-Triangle-Three-Buckets - 모양을 가장 잘 보존하는 n개 점의 인덱스
+    x는 오름차순, 양 끝점은 항상 포함
+    """
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+
+    # 가운데 점들을 n-2개 구간으로 나누고, 구간마다 (이전 선택점, 다음 구간 평균)과 만드는 삼각형이 가장 큰 점 선택
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    edges = np.append(edges, size)
+    picked = np.empty(n, dtype=np.int64)
+    picked[0], picked[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        avg_x = x[hi:edges[i + 2]].mean()
+        avg_y = y[hi:edges[i + 2]].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def minmax(x, y, n):
+    """구간별 최솟값/최댓값 인덱스 - 급등/급락 지점을 놓치지 않음 (최대 n개)"""
+    size = len(x)
+    if n >= size or n < 4:
+        return np.arange(size)
+
+    buckets = np.array_split(np.arange(size), max(n // 2 - 1, 1))
+    picked = {0, size - 1}
+    for bucket in buckets:
+        values = y[bucket]
+        picked.add(int(bucket[np.argmin(values)]))
+        picked.add(int(bucket[np.argmax(values)]))
+    return np.array(sorted(picked))
+
+
+METHODS = {"lttb": lttb, "minmax": minmax}
+
+
+def downsample(x, y, n, method="lttb"):
+    """결측을 뺀 뒤 n개 이하로 줄인 (x, y, 선택 인덱스)"""
+    valid = np.flatnonzero(~np.isnan(y))
+    idx = valid[METHODS[method](x[valid], y[valid], n)]
+    return x[idx], y[idx], idx
+
+
+# ---------------------- 비교 차트 데이터 ----------------------
+def comparison_frame(region_month, regions, columns, max_points=MAX_POINTS, method="lttb"):
+    """
+    N개 지역 × M개 지표 비교용 long 프레임과 표시 방식
+    - 지역 수 <= MAX_LINES: 지역별 선 (REGION_NAME, 지표, MONTH, 값)
+    - 그보다 많으면: 선택 지역의 월별 평균과 10~90% 밴드 (지표, MONTH, 값, 하한, 상한)
+    어느 쪽이든 전체 점 수는 max_points 이하 - 시리즈당 점 수를 나눠서 다운샘플링
+    반환: (df, mode, 원본 점 수)
+    """
+    selected = region_month[region_month["REGION_NAME"].isin(regions)]
+    months = np.sort(selected["MONTH"].unique())
+    x = months.astype("datetime64[ns]").astype(np.int64).astype(float)
+    row = pd.Index(sorted(selected["REGION_NAME"].unique())).get_indexer(selected["REGION_NAME"])
+    col = np.searchsorted(months, selected["MONTH"].to_numpy())
+
+    mode = "lines" if len(set(regions)) <= MAX_LINES else "band"
+    n_series = len(columns) * (len(set(regions)) if mode == "lines" else 1)
+    per_series = max(MIN_SERIES_POINTS, max_points // max(n_series, 1))
+
+    frames = []
+    original = 0
+    names = sorted(selected["REGION_NAME"].unique())
+    for column in columns:
+        matrix = np.full((len(names), len(months)), np.nan)
+        matrix[row, col] = selected[column].to_numpy(dtype=float)
+        original += int((~np.isnan(matrix)).sum())
+
+        if mode == "lines":
+            for name, series in zip(names, matrix):
+                _, values, idx = downsample(x, series, per_series, method)
+                frames.append(pd.DataFrame({"REGION_NAME": name, "지표": column, "MONTH": months[idx], "값": values}))
+        else:
+            with warnings.catch_warnings():
+                # 모든 지역이 결측인 월은 NaN으로 남김
+                warnings.simplefilter("ignore", RuntimeWarning)
+                mean = np.nanmean(matrix, axis=0)
+                lower, upper = np.nanpercentile(matrix, [10, 90], axis=0)
+            _, values, idx = downsample(x, mean, per_series, method)
+            frames.append(pd.DataFrame({
+                "지표": column, "MONTH": months[idx], "값": values, "하한": lower[idx], "상한": upper[idx]
+            }))
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return df, mode, original
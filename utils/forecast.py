@@ -0,0 +1,177 @@
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import dataset_version
+from utils.partition_index import get_partition_index
+
+FORECAST_DIR = Path(os.environ.get("GENTRI_FORECAST_DIR", ".cache/forecast"))
+
+# 지역별로 SSE가 가장 작은 조합을 고르는 평활 계수 후보
+ALPHAS = np.linspace(0.1, 0.9, 9)
+BETAS = np.array([0.01, 0.05, 0.1, 0.2, 0.3])
+Z_95 = 1.96
+
+
+def series_matrix(index, column="FINAL_SCORE"):
+    """정규화 프레임 → (지역 × 월) 행렬, 값이 없는 칸은 NaN"""
+    frame = index.frame
+    matrix = np.full((len(index.regions), len(index.months)), np.nan)
+    codes = frame["REGION_NAME"].cat.codes.to_numpy()
+    month_pos = np.searchsorted(index.months.values, frame["MONTH"].to_numpy())
+    matrix[codes, month_pos] = frame[column].to_numpy(dtype=float)
+    return matrix
+
+
+def month_digests(Y):
+    """월별(열별) 값 해시 - 저장된 상태가 같은 과거 데이터로 적합된 것인지 확인용"""
+    Y = np.ascontiguousarray(Y, dtype=float)
+    return [hashlib.sha1(Y[:, t].tobytes()).hexdigest()[:16] for t in range(Y.shape[1])]
+
+
+def _smooth(Y, alpha, beta, level, trend):
+    """
+    Holt 선형 지수평활 (오차 보정형)을 모든 시계열에 동시에 적용
+    l_t = l + b + α·e,  b_t = b + α·β·e,  e = y - (l + b)
+    결측 월은 예측값으로 상태만 진행. 반환값: (level, trend, 제곱오차 합, 오차 수)
+    """
+    sse = np.zeros(np.broadcast(alpha, level).shape)
+    count = np.zeros(level.shape)
+    for t in range(Y.shape[1]):
+        pred = level + trend
+        err = Y[:, t] - pred
+        observed = ~np.isnan(err)
+        err = np.where(observed, err, 0.0)
+        level = pred + alpha * err
+        trend = trend + alpha * beta * err
+        sse = sse + err ** 2
+        count = count + observed
+    return level, trend, sse, count
+
+
+class ForecastModel:
+    """지역별로 적합된 Holt 모형 상태 - 새 월이 추가되면 update()로 이어서 갱신"""
+
+    def __init__(self, column, regions, months, alpha, beta, level, trend, sse, count, digests=()):
+        self.column = column
+        self.regions = list(regions)
+        self.months = pd.DatetimeIndex(months)
+        self.digests = list(digests)
+        self.alpha, self.beta = alpha, beta
+        self.level, self.trend = level, trend
+        self.sse, self.count = sse, count
+
+    @classmethod
+    def fit(cls, Y, regions, months, column="FINAL_SCORE"):
+        """(계수 후보 × 지역)을 한 번에 평활해 지역별 최적 계수 선택 - 지역별 Python 루프 없음"""
+        first = np.argmax(~np.isnan(Y), axis=1)
+        init = np.nan_to_num(Y[np.arange(len(Y)), first])
+        alpha = np.repeat(ALPHAS, len(BETAS))[:, None]
+        beta = np.tile(BETAS, len(ALPHAS))[:, None]
+        level = np.broadcast_to(init, (len(alpha), len(Y))).copy()
+        trend = np.zeros_like(level)
+
+        level, trend, sse, count = _smooth(Y, alpha, beta, level, trend)
+        best = sse.argmin(axis=0)
+        cols = np.arange(len(Y))
+        return cls(column, regions, months, alpha[best, 0], beta[best, 0],
+                   level[best, cols], trend[best, cols], sse[best, cols], count[best, cols], month_digests(Y))
+
+    def update(self, Y_new, new_months):
+        """새 월 데이터(지역 × 새 월)만으로 상태 갱신 - 과거 데이터 재적합 없음"""
+        self.level, self.trend, sse, count = _smooth(Y_new, self.alpha, self.beta, self.level, self.trend)
+        self.sse = self.sse + sse
+        self.count = self.count + count
+        self.months = self.months.append(pd.DatetimeIndex(new_months))
+        self.digests = self.digests + month_digests(Y_new)
+        return self
+
+    def forecast(self, horizon=3):
+        """h단계 예측과 95% 구간 - (평균, 하한, 상한) 각각 (지역 × horizon)"""
+        h = np.arange(1, horizon + 1)
+        mean = self.level[:, None] + h * self.trend[:, None]
+        sigma2 = self.sse / np.maximum(self.count - 2, 1)
+        a, b = self.alpha[:, None], self.beta[:, None]
+        var = sigma2[:, None] * (1 + (h - 1) * (a ** 2 + a ** 2 * b * h + (a * b) ** 2 * h * (2 * h - 1) / 6))
+        half = Z_95 * np.sqrt(var)
+        return mean, mean - half, mean + half
+
+    def forecast_months(self, horizon=3):
+        return pd.date_range(self.months[-1], periods=horizon + 1, freq="MS")[1:]
+
+    # ---------------------- 저장 ----------------------
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path, column=self.column, regions=np.array(self.regions), months=self.months.values,
+            alpha=self.alpha, beta=self.beta, level=self.level, trend=self.trend, sse=self.sse, count=self.count,
+            digests=np.array(self.digests, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        digests = data["digests"].tolist() if "digests" in data.files else []
+        return cls(str(data["column"]), data["regions"].tolist(), data["months"], data["alpha"], data["beta"],
+                   data["level"], data["trend"], data["sse"], data["count"], digests)
+
+
+def fit_or_update(index, column="FINAL_SCORE", path=None):
+    """
+    저장된 모형이 있고 지역이 같으며 기존 월과 그 값(월별 해시)이 현재 데이터의 앞부분과 같으면 새 월만 반영,
+    과거 월의 값이 하나라도 바뀌었거나 해시가 없는 옛 상태면 전체 재적합 후 저장
+    """
+    Y = series_matrix(index, column)
+    model = None
+    if path is not None and path.exists():
+        try:
+            model = ForecastModel.load(path)
+        except Exception:
+            model = None
+    n_old = len(model.months) if model is not None else 0
+    reusable = (
+        model is not None
+        and model.column == column
+        and model.regions == list(index.regions)
+        and n_old <= len(index.months)
+        and index.months[:n_old].equals(model.months)
+        and model.digests == month_digests(Y[:, :n_old])
+    )
+    if reusable:
+        if n_old < len(index.months):
+            model.update(Y[:, n_old:], index.months[n_old:])
+    else:
+        model = ForecastModel.fit(Y, index.regions, index.months, column)
+    if path is not None:
+        model.save(path)
+    return model, Y
+
+
+def top_movers(model, Y, horizon=3, n=5):
+    """h개월 뒤 예측값이 최근 관측값보다 가장 크게 오를 것으로 보이는 지역 TOP N"""
+    mean, lower, upper = model.forecast(horizon)
+    has_data = ~np.isnan(Y).all(axis=1)
+    last = Y[np.arange(len(Y)), Y.shape[1] - 1 - np.argmax(~np.isnan(Y[:, ::-1]), axis=1)]
+    table = pd.DataFrame({
+        "지역": model.regions,
+        "최근 점수": last,
+        f"{horizon}개월 후 예측": mean[:, -1],
+        "예측 하한": lower[:, -1],
+        "예측 상한": upper[:, -1],
+    })[has_data]
+    table["예상 변화"] = table[f"{horizon}개월 후 예측"] - table["최근 점수"]
+    return table.sort_values("예상 변화", ascending=False).head(n).round(3).reset_index(drop=True)
+
+
+@st.cache_resource(show_spinner="예측 모형 적합 중...", max_entries=4)
+def _cached_model(strict, version, column):
+    path = FORECAST_DIR / f"{version.split(':')[0]}_{column}.npz"
+    return fit_or_update(get_partition_index(strict), column, path)
+
+
+def get_forecast_model(strict: bool = True, column="FINAL_SCORE"):
+    """데이터 버전별로 캐시된 (모형, 지역 × 월 행렬)"""
+    return _cached_model(strict, dataset_version(strict), column)
@@ -0,0 +1,315 @@
+"""
+월 단위 원천 지표 적재 + 정규화 파이프라인
+
+    python -m utils.ingest raw_2024-01.csv
+    python -m utils.ingest raw_2024-01.parquet raw_2024-02.parquet --table GENTRIFICATION_SCORE
+    python -m utils.ingest --status
+
+- 새 월의 원천 지표(RAW_*, utils.schema.RAW_INDICATORS)를 로그/선형 변환해 월 부분 통계(min/max/합계)를 계산하고
+  저장된 월 통계와 합쳐 누적 통계를 갱신 → 과거 월을 다시 읽지 않음
+- MinMax 범위가 그대로면 새 월 파티션만 정규화해 기록, 범위가 바뀐 경우에만 기존 파티션을 RAW_* 컬럼에서 다시 정규화
+- INGEST_DIR/<테이블>/month=YYYY-MM/part-r<리비전>.parquet 월 파티션 + manifest.json
+  manifest를 마지막에 교체하므로 적재 도중 실패해도 이전 리비전 그대로 읽힘
+저장소가 있으면 utils.data_loader가 스냅샷 대신 이 파티션을 읽음 (load_score_data(months=...)는 해당 월 파티션만)
+--alert를 주면 적재한 월의 FINAL_SCORE로 급등 감지(utils.anomaly)를 이어서 실행
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from utils.schema import DANGER_LEVELS, DANGER_THRESHOLDS, INDICATORS, RAW_COLUMNS, RAW_INDICATORS, SOURCE_COLUMNS
+from utils.tracing import span
+
+# 월 파티션 저장소 위치
+INGEST_DIR = Path(os.environ.get("GENTRI_INGEST_DIR", ".cache/ingest"))
+MANIFEST_NAME = "manifest.json"
+
+WEIGHTS = {col: weight for col, _, weight in INDICATORS}
+
+
+def _table_dir(table_name):
+    return INGEST_DIR / table_name
+
+
+def _month_key(value):
+    return pd.Timestamp(value).strftime("%Y-%m")
+
+
+def load_manifest(table_name):
+    """저장소 manifest (없으면 None)"""
+    try:
+        return json.loads((_table_dir(table_name) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def has_store(table_name):
+    return load_manifest(table_name) is not None
+
+
+def store_version(manifest):
+    """데이터 버전 문자열 - 재정규화로 값만 바뀌어도 리비전이 달라짐"""
+    return f"{manifest['table']}:{manifest['watermark']}:{manifest['row_count']}:r{manifest['revision']}"
+
+
+# ---------------------- 변환 / 통계 ----------------------
+def transform(raw):
+    """원천 지표를 정규화 직전 척도로 변환 {원천 컬럼: float64 배열} (로그 지표는 음수를 0으로 자른 뒤 log1p)"""
+    values = {}
+    for _, column, log in RAW_INDICATORS:
+        if column not in raw.columns:
+            continue
+        v = pd.to_numeric(raw[column], errors="coerce").to_numpy(dtype=np.float64)
+        values[column] = np.log1p(np.clip(v, 0, None)) if log else v
+    return values
+
+
+def month_stats(values):
+    """변환된 지표의 월 부분 통계 {컬럼: [min, max, count, sum, sumsq]}"""
+    stats = {}
+    for column, v in values.items():
+        v = v[~np.isnan(v)]
+        if len(v):
+            stats[column] = [float(v.min()), float(v.max()), int(len(v)), float(v.sum()), float(np.square(v).sum())]
+        else:
+            stats[column] = [None, None, 0, 0.0, 0.0]
+    return stats
+
+
+def running_stats(partitions):
+    """월 부분 통계를 합친 누적 통계 {컬럼: {MIN, MAX, COUNT, MEAN, STD}} - 월 수 × 지표 수만큼의 연산"""
+    merged = {}
+    for part in partitions.values():
+        for column, (lo, hi, count, total, sumsq) in part["stats"].items():
+            m = merged.setdefault(column, {"MIN": None, "MAX": None, "COUNT": 0, "SUM": 0.0, "SUMSQ": 0.0})
+            if not count:
+                continue
+            m["MIN"] = lo if m["MIN"] is None else min(m["MIN"], lo)
+            m["MAX"] = hi if m["MAX"] is None else max(m["MAX"], hi)
+            m["COUNT"] += count
+            m["SUM"] += total
+            m["SUMSQ"] += sumsq
+    for m in merged.values():
+        count = max(m["COUNT"], 1)
+        mean = m.pop("SUM") / count
+        m["MEAN"] = mean
+        m["STD"] = float(np.sqrt(max(m.pop("SUMSQ") / count - mean ** 2, 0.0)))
+    return merged
+
+
+def normalize(raw, values, bounds):
+    """
+    원천 월 데이터를 파티션 프레임으로 변환 (SOURCE_COLUMNS + RAW_*)
+    - NORM_* = (변환값 - min) / (max - min), 범위가 한 점이면 0
+    - FINAL_SCORE = 공표 가중치 가중합 (있는 지표만, 결측은 0 - utils.scoring.ScoringEngine과 동일)
+    """
+    month = pd.to_datetime(raw["MONTH"]).dt.to_period("M").dt.to_timestamp()
+    out = {"REGION_NAME": raw["REGION_NAME"].astype(str).to_numpy(), "MONTH": month.to_numpy()}
+    score = np.zeros(len(raw))
+    total_weight = 0.0
+    for norm_column, raw_column, _ in RAW_INDICATORS:
+        if raw_column not in values:
+            continue
+        lo, hi = bounds.get(raw_column, (None, None))
+        v = values[raw_column]
+        if lo is None:
+            norm = np.full(len(v), np.nan)
+        else:
+            norm = (v - lo) / (hi - lo) if hi > lo else np.where(np.isnan(v), np.nan, 0.0)
+        out[norm_column] = norm.astype(np.float32)
+        score += np.nan_to_num(norm) * WEIGHTS[norm_column]
+        total_weight += WEIGHTS[norm_column]
+    score = score / total_weight if total_weight else np.full(len(raw), np.nan)
+    out["FINAL_SCORE"] = score.astype(np.float32)
+    out["DANGER_LEVEL"] = np.array(DANGER_LEVELS)[np.digitize(score, DANGER_THRESHOLDS, right=True)]
+    for column in RAW_COLUMNS:
+        if column in raw.columns:
+            out[column] = pd.to_numeric(raw[column], errors="coerce").to_numpy(dtype=np.float64)
+    frame = pd.DataFrame(out)
+    return frame[[c for c in SOURCE_COLUMNS + RAW_COLUMNS if c in frame.columns]]
+
+
+# ---------------------- 적재 ----------------------
+def _write_partition(table_name, key, frame, revision):
+    """월 파티션을 새 리비전 파일로 기록 - 기존 파일은 manifest 교체 후 삭제"""
+    relative = f"month={key}/part-r{revision}.parquet"
+    path = _table_dir(table_name) / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), path)
+    return relative
+
+
+def _write_manifest(table_name, manifest):
+    path = _table_dir(table_name) / MANIFEST_NAME
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def ingest(table_name, raw, sink=None):
+    """
+    원천 데이터(한 달 또는 여러 달)를 저장소에 적재 - 이미 있는 월이면 그 월 파티션을 교체
+    sink(utils.anomaly 알림 대상)를 주면 적재한 월 파티션에 급등 감지 실행
+    반환값: {"months": 적재한 월, "rows", "rescaled": 다시 정규화한 기존 월 수, "changed": 범위가 바뀐 지표,
+            "alerts": 알림 수, "alert_error": 감지/전송 오류 (적재는 이미 끝났으므로 예외 대신 기록)}
+    """
+    missing = {"REGION_NAME", "MONTH"} - set(raw.columns)
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(sorted(missing))}")
+    months = pd.to_datetime(raw["MONTH"], errors="coerce")
+    if months.isna().any():
+        raise ValueError(f"MONTH를 해석할 수 없는 행이 {int(months.isna().sum())}개 있습니다.")
+    # 대시보드 집계(utils.rollups)가 모든 NORM_* 컬럼을 사용하므로 원천 지표가 하나라도 빠진 파일은 거부
+    missing = [c for c in RAW_COLUMNS if c not in raw.columns]
+    if missing:
+        raise ValueError(f"원천 지표 컬럼이 없습니다: {', '.join(missing)}")
+
+    previous = load_manifest(table_name) or {
+        "table": table_name, "revision": 0, "regions": [], "bounds": {}, "partitions": {},
+    }
+    revision = previous["revision"] + 1
+    partitions = {key: dict(part) for key, part in previous["partitions"].items()}
+    keys = months.dt.strftime("%Y-%m").to_numpy()
+
+    with span("ingest.months", table=table_name, rows=len(raw)) as s:
+        fresh = {}
+        for key in sorted(set(keys)):
+            month_raw = raw[keys == key]
+            values = transform(month_raw)
+            fresh[key] = (month_raw, values)
+            partitions[key] = {"rows": int(len(month_raw)), "stats": month_stats(values)}
+
+        stats = running_stats(partitions)
+        bounds = {column: [m["MIN"], m["MAX"]] for column, m in stats.items()}
+        changed = sorted(c for c in bounds if bounds[c] != previous["bounds"].get(c))
+        if not previous["partitions"]:
+            changed = []
+        stale = [key for key in previous["partitions"] if key not in fresh] if changed else []
+        s.set(months=len(fresh), rescaled=len(stale))
+
+        for key, (month_raw, values) in fresh.items():
+            partitions[key]["file"] = _write_partition(table_name, key, normalize(month_raw, values, bounds), revision)
+        for key in stale:
+            # 범위가 바뀐 경우에만 - 저장된 RAW_* 컬럼에서 다시 정규화
+            stored = pq.read_table(_table_dir(table_name) / previous["partitions"][key]["file"]).to_pandas()
+            partitions[key]["file"] = _write_partition(table_name, key, normalize(stored, transform(stored), bounds), revision)
+
+    manifest = {
+        "table": table_name,
+        "format": 1,
+        "revision": revision,
+        "watermark": f"{max(partitions)}-01",
+        "row_count": int(sum(p["rows"] for p in partitions.values())),
+        "regions": sorted(set(previous["regions"]) | set(raw["REGION_NAME"].dropna().astype(str))),
+        "bounds": bounds,
+        "stats": stats,
+        "partitions": dict(sorted(partitions.items())),
+        "updated_at": time.time(),
+    }
+    _write_manifest(table_name, manifest)
+
+    for key, part in previous["partitions"].items():
+        if partitions[key]["file"] != part["file"]:
+            (_table_dir(table_name) / part["file"]).unlink(missing_ok=True)
+    result = {"months": sorted(fresh), "rows": int(len(raw)), "rescaled": len(stale), "changed": changed}
+    if sink is not None:
+        result.update(_detect(table_name, sorted(fresh), manifest, sink))
+    return result
+
+
+def _detect(table_name, months, manifest, sink):
+    """새로 기록한 월 파티션만 읽어 급등 감지 (전송 실패 시 감지 상태를 저장하지 않으므로 다음 적재 때 다시 감지)"""
+    from utils.anomaly import run_detection, state_path
+
+    try:
+        frame = read_partitions(table_name, months, columns=["REGION_NAME", "MONTH", "FINAL_SCORE"], manifest=manifest)
+        with span("ingest.anomaly", table=table_name, months=len(months)) as s:
+            events = run_detection(frame, sink, state_path(table_name))
+            s.set(alerts=len(events))
+    except Exception as e:
+        return {"alerts": 0, "alert_error": f"{type(e).__name__}: {e}"}
+    return {"alerts": len(events), "alert_error": None}
+
+
+# ---------------------- 읽기 ----------------------
+def partition_files(table_name, months=None, manifest=None):
+    """읽을 파티션 파일 경로 목록 (months: 월 목록, None이면 전체)"""
+    manifest = manifest or load_manifest(table_name)
+    if manifest is None:
+        return []
+    keys = manifest["partitions"].keys()
+    if months is not None:
+        keys = sorted(set(keys) & {_month_key(m) for m in months})
+    return [_table_dir(table_name) / manifest["partitions"][key]["file"] for key in keys]
+
+
+def read_partitions(table_name, months=None, columns=None, manifest=None):
+    """월 파티션을 읽어 하나의 DataFrame으로 (지정한 월/컬럼만 읽음)"""
+    paths = partition_files(table_name, months, manifest)
+    with span("ingest.read", table=table_name, partitions=len(paths)):
+        tables = []
+        for path in paths:
+            names = pq.read_schema(path).names
+            tables.append(pq.read_table(path, columns=[c for c in columns if c in names] if columns else None))
+        if not tables:
+            return pd.DataFrame(columns=columns or SOURCE_COLUMNS)
+        return pa.concat_tables(tables, promote_options="default").to_pandas()
+
+
+def _read_input(path):
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path, encoding="utf-8-sig")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="월 단위 원천 지표 적재 + 정규화")
+    parser.add_argument("files", nargs="*", help="원천 지표 CSV/Parquet (REGION_NAME, MONTH, RAW_*)")
+    parser.add_argument("--table", default="GENTRIFICATION_STRICT", help="대상 테이블 이름")
+    parser.add_argument("--status", action="store_true", help="저장소 상태와 누적 통계만 출력")
+    parser.add_argument("--alert", default=None, help="적재한 월의 급등 알림 대상 (stdout | file:<경로> | webhook:<URL>)")
+    args = parser.parse_args(argv)
+
+    if args.status or not args.files:
+        manifest = load_manifest(args.table)
+        if manifest is None:
+            print(f"{args.table}: 저장소 없음 ({_table_dir(args.table)})")
+            return 1
+        print(f"{args.table}: {len(manifest['partitions'])}개 월, {manifest['row_count']}행, 리비전 {manifest['revision']}")
+        for column, m in manifest["stats"].items():
+            if m["MIN"] is None:
+                continue
+            print(f"  {column}: min {m['MIN']:.4g}, max {m['MAX']:.4g}, 평균 {m['MEAN']:.4g}, 표준편차 {m['STD']:.4g}")
+        return 0
+
+    sink = None
+    if args.alert:
+        from utils.anomaly import make_sink
+        sink = make_sink(args.alert)
+
+    for path in args.files:
+        started = time.perf_counter()
+        try:
+            result = ingest(args.table, _read_input(path), sink)
+        except Exception as e:
+            print(f"실패: {path} - {e}")
+            return 1
+        note = f"범위 변경({', '.join(result['changed'])}) → 기존 {result['rescaled']}개 월 재정규화" if result["changed"] else "범위 변경 없음"
+        print(f"{path}: {', '.join(result['months'])} {result['rows']}행, {note} ({time.perf_counter() - started:.2f}s)")
+        if result.get("alert_error"):
+            print(f"  급등 감지 실패: {result['alert_error']}")
+            return 1
+        if sink is not None:
+            print(f"  급등 알림 {result['alerts']}건")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
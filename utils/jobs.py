@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+JOB_WORKERS = int(os.environ.get("GENTRI_JOB_WORKERS", 4))
+# 완료된 작업 결과를 보관하는 시간(초) - 다른 페이지로 이동했다 돌아와도 결과 확인 가능
+JOB_RETENTION = int(os.environ.get("GENTRI_JOB_RETENTION", 60 * 60))
+
+QUEUED, RUNNING, DONE, FAILED = "대기 중", "실행 중", "완료", "실패"
+
+
+class Job:
+    """작업 상태 - 워커 스레드가 갱신하고 세션은 읽기만 함"""
+
+    def __init__(self, key, label):
+        self.key = key
+        self.label = label
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    def update(self, progress, message=""):
+        self.progress = progress
+        self.message = message
+
+
+class JobQueue:
+    """
+    프로세스 전체에서 공유하는 백그라운드 작업 큐
+    - 같은 key의 작업이 대기/실행 중이거나 이미 완료되었으면 새로 실행하지 않고 기존 작업 반환
+    - 실패한 작업은 다시 제출하면 재실행
+    """
+
+    def __init__(self, workers=JOB_WORKERS, retention=JOB_RETENTION):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._retention = retention
+
+    def submit(self, key, fn, *args, label="", **kwargs):
+        """fn(job, *args, **kwargs)를 백그라운드에서 실행하고 Job 반환"""
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            if job is not None and job.status != FAILED:
+                return job
+            job = self._jobs[key] = Job(key, label)
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def stats(self):
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    @staticmethod
+    def _run(job, fn, args, kwargs):
+        job.status = RUNNING
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.progress = 1.0
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        now = time.time()
+        expired = [k for k, job in self._jobs.items()
+                   if job.finished and now - job.finished_at > self._retention]
+        for key in expired:
+            del self._jobs[key]
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_queue():
+    return JobQueue()
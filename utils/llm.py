@@ -0,0 +1,70 @@
+import hashlib
+import os
+import threading
+import time
+
+from tenacity import Retrying, stop_after_attempt, wait_exponential
+
+
+class BackendLLM:
+    """데이터 백엔드의 COMPLETE 호출 (Snowflake: Cortex, 로컬: 더미 응답)"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = f"{backend.name}-complete"
+
+    def complete(self, model, prompt):
+        return self.backend.complete(model, prompt)
+
+
+class StubLLM:
+    """Snowflake 없이 파이프라인을 테스트/벤치마크하기 위한 결정적인 더미 LLM"""
+
+    name = "stub"
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def complete(self, model, prompt):
+        if self.latency:
+            time.sleep(self.latency)
+        digest = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()[:12]
+        first_line = prompt.strip().splitlines()[0] if prompt.strip() else ""
+        return f"[로컬 더미 응답 · {model} · {digest}]\n{first_line}"
+
+
+class RateLimiter:
+    """분당 호출 수 제한 - 여러 워커 스레드가 공유"""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def complete_with_retry(llm, model, prompt, attempts=3, limiter=None):
+    """일시적 오류에 대비해 지수 백오프로 재시도"""
+    for attempt in Retrying(stop=stop_after_attempt(attempts), wait=wait_exponential(multiplier=1, max=30), reraise=True):
+        with attempt:
+            if limiter is not None:
+                limiter.wait()
+            return llm.complete(model, prompt)
+
+
+def get_llm(name=None):
+    """GENTRI_LLM=stub 이면 더미 LLM, 아니면 현재 데이터 백엔드의 COMPLETE 사용"""
+    name = (name or os.environ.get("GENTRI_LLM", "backend")).lower()
+    if name == "stub":
+        return StubLLM()
+    from utils.backend import get_backend
+    return BackendLLM(get_backend())
@@ -0,0 +1,220 @@
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.bundle import Bundle
+from utils.data_loader import active_bundle, dataset_version
+from utils.partition_index import get_partition_index
+
+
+def map_score_table(index, scores=None):
+    """
+    지역 × 월 점수 표 - REGION_NAME, LAT, LON + 월(YYYY-MM)별 점수 열
+    사전 계산 번들에 그대로 저장하고 MapFrames.from_table로 복원
+    scores를 주면 FINAL_SCORE 대신 사용 (index.frame 행 순서)
+    """
+    frame = index.frame
+    regions = index.regions
+    lat = np.full(len(regions), np.nan, dtype=np.float32)
+    lon = np.full(len(regions), np.nan, dtype=np.float32)
+    codes = frame["REGION_NAME"].cat.codes.to_numpy()
+    lat[codes] = frame["LAT"].to_numpy()
+    lon[codes] = frame["LON"].to_numpy()
+
+    months = [m.strftime("%Y-%m") for m in index.months]
+    matrix = np.full((len(regions), len(months)), np.nan, dtype=np.float32)
+    month_pos = np.searchsorted(index.months.values, frame["MONTH"].to_numpy())
+    matrix[codes, month_pos] = frame["FINAL_SCORE"].to_numpy() if scores is None else scores
+
+    table = pd.DataFrame(matrix, columns=months)
+    table.insert(0, "LON", lon)
+    table.insert(0, "LAT", lat)
+    table.insert(0, "REGION_NAME", list(regions))
+    return table
+
+
+class MapFrames:
+    """
+    월별 지도 레이어 데이터를 한 번에 미리 만들어 둔 묶음
+    - records[i]: i번째 월의 pydeck 레이어 데이터 (REGION_NAME/LON/LAT/FINAL_SCORE만 포함)
+    - scores: (월 × 지역) float32 행렬, 좌표는 지역별로 한 번만 저장 → 재생용 열 기반 페이로드
+    좌표가 없는 지역은 제외됨, scores를 주면 FINAL_SCORE 대신 사용 (index.frame 행 순서)
+    """
+
+    def __init__(self, index, scores=None):
+        self._load(map_score_table(index, scores))
+
+    @classmethod
+    def from_table(cls, table):
+        """map_score_table 결과(번들에 저장된 표)에서 바로 생성"""
+        frames = cls.__new__(cls)
+        frames._load(table)
+        return frames
+
+    def _load(self, table):
+        regions = table["REGION_NAME"].tolist()
+        lat = table["LAT"].to_numpy(dtype=np.float32)
+        lon = table["LON"].to_numpy(dtype=np.float32)
+        self.months = [c for c in table.columns if c not in ("REGION_NAME", "LAT", "LON")]
+        self.scores = table[self.months].to_numpy(dtype=np.float32).T
+
+        located = ~(np.isnan(lat) | np.isnan(lon))
+        self.missing_coordinates = [r for r, ok in zip(regions, located) if not ok]
+        self.regions = [r for r, ok in zip(regions, located) if ok]
+        self.lat = lat[located]
+        self.lon = lon[located]
+        self.scores = self.scores[:, located]
+
+        self.records = [self._records(i) for i in range(len(self.months))]
+
+    def _records(self, i):
+        scores = self.scores[i]
+        return [
+            {"REGION_NAME": region, "LON": round(float(lon), 5), "LAT": round(float(lat), 5),
+             "FINAL_SCORE": round(float(score), 4)}
+            for region, lon, lat, score in zip(self.regions, self.lon, self.lat, scores)
+            if not np.isnan(score)
+        ]
+
+    def month_records(self, month):
+        return self.records[self.months.index(month)]
+
+    def payload(self):
+        """재생용 열 기반 JSON - 좌표는 1회, 월별로는 점수 배열만 (결측은 null)"""
+        return json.dumps({
+            "months": self.months,
+            "regions": self.regions,
+            "lon": np.round(self.lon.astype(float), 5).tolist(),
+            "lat": np.round(self.lat.astype(float), 5).tolist(),
+            "scores": [[None if np.isnan(s) else round(float(s), 4) for s in row] for row in self.scores],
+        }, ensure_ascii=False, separators=(",", ":"))
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _build_map_frames(strict, version, weights):
+    index = get_partition_index(strict)
+    if weights is None:
+        return MapFrames(index)
+    from utils.scoring import get_scoring_engine
+    scores, _ = get_scoring_engine(strict).score(dict(weights))
+    return MapFrames(index, scores)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _bundle_map_frames(path):
+    return MapFrames.from_table(Bundle(path).table("map_scores"))
+
+def get_map_frames(strict: bool = True, weights=None):
+    """데이터 버전(및 사용자 가중치)별로 한 번만 만들어 공유하는 월별 지도 프레임 (기본 가중치는 번들 우선)"""
+    bundle = active_bundle(strict)
+    if weights is None and bundle is not None and bundle.has("map_scores"):
+        return _bundle_map_frames(str(bundle.path))
+    weights = tuple(sorted(weights.items())) if weights else None
+    return _build_map_frames(strict, dataset_version(strict), weights)
+
+
+def month_deck(frames, month):
+    """선택한 월의 위험도 지도 (pydeck Deck) - st.pydeck_chart로 그릴 때 to_json()으로 직렬화됨"""
+    import pydeck as pdk
+
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=frames.month_records(month),
+        get_position='[LON, LAT]',
+        get_radius="500 + 2000 * FINAL_SCORE",
+        get_fill_color="""
+            [255 * FINAL_SCORE, 255 * (1 - FINAL_SCORE), 0, 160]
+        """,
+        pickable=True,
+        auto_highlight=True,
+    )
+
+    tooltip = {
+        "html": "<b>{REGION_NAME}</b><br/>위험도: {FINAL_SCORE}",
+        "style": {"backgroundColor": "black", "color": "white"}
+    }
+
+    view_state = pdk.ViewState(
+        latitude=37.5165,
+        longitude=126.9780,
+        zoom=11,
+        pitch=0
+    )
+
+    return pdk.Deck(
+        map_style="mapbox://styles/mapbox/light-v9",
+        initial_view_state=view_state,
+        layers=[layer],
+        tooltip=tooltip
+    )
+
+
+# 브라우저에서 월별 점수 배열만 교체하며 재생 (프레임마다 Python 재실행 없음)
+PLAYBACK_HTML = """
+<div style="font-family: sans-serif;">
+  <div style="display: flex; gap: 0.75rem; align-items: center; margin-bottom: 0.5rem;">
+    <button id="play" style="padding: 0.3rem 1rem;">▶ 재생</button>
+    <input id="slider" type="range" min="0" value="0" style="flex: 1;">
+    <b id="label" style="min-width: 5rem; text-align: right;"></b>
+  </div>
+  <div id="map" style="position: relative; height: __HEIGHT__px; border-radius: 0.5rem; overflow: hidden;"></div>
+</div>
+<script src="https://unpkg.com/deck.gl@9.0.38/dist.min.js"></script>
+<script src="https://unpkg.com/maplibre-gl@4.7.1/dist/maplibre-gl.js"></script>
+<link href="https://unpkg.com/maplibre-gl@4.7.1/dist/maplibre-gl.css" rel="stylesheet">
+<script>
+const data = __PAYLOAD__;
+const points = data.regions.map((name, i) => ({name, position: [data.lon[i], data.lat[i]], i}));
+const slider = document.getElementById("slider");
+const label = document.getElementById("label");
+const button = document.getElementById("play");
+slider.max = data.months.length - 1;
+
+const deckgl = new deck.DeckGL({
+  container: "map",
+  mapStyle: "https://basemaps.cartocdn.com/gl/positron-gl-style/style.json",
+  initialViewState: {latitude: 37.5165, longitude: 126.9780, zoom: 10.5, pitch: 0},
+  controller: true,
+  getTooltip: ({object}) => object && {
+    html: `<b>${object.name}</b><br/>위험도: ${data.scores[+slider.value][object.i]}`,
+    style: {backgroundColor: "black", color: "white"}
+  }
+});
+
+function render(m) {
+  const scores = data.scores[m];
+  label.textContent = data.months[m];
+  deckgl.setProps({layers: [new deck.ScatterplotLayer({
+    id: "risk",
+    data: points.filter(p => scores[p.i] !== null),
+    getPosition: p => p.position,
+    getRadius: p => 500 + 2000 * scores[p.i],
+    getFillColor: p => [255 * scores[p.i], 255 * (1 - scores[p.i]), 0, 160],
+    updateTriggers: {getRadius: m, getFillColor: m},
+    transitions: {getRadius: 400, getFillColor: 400},
+    pickable: true,
+    autoHighlight: true
+  })]});
+}
+
+let timer = null;
+button.onclick = () => {
+  if (timer) { clearInterval(timer); timer = null; button.textContent = "▶ 재생"; return; }
+  button.textContent = "⏸ 정지";
+  timer = setInterval(() => {
+    slider.value = (+slider.value + 1) % data.months.length;
+    render(+slider.value);
+  }, __INTERVAL__);
+};
+slider.oninput = () => render(+slider.value);
+render(0);
+</script>
+"""
+
+
+def playback_html(frames, height=520, interval_ms=700):
+    return (PLAYBACK_HTML
+            .replace("__PAYLOAD__", frames.payload())
+            .replace("__HEIGHT__", str(height))
+            .replace("__INTERVAL__", str(interval_ms)))
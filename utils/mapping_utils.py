@@ -2,8 +2,8 @@ import pandas as pd
 import streamlit as st
 
 @st.cache_data
-def load_coordinates(csv_path="data/seoul_region_coordinates.csv"):
-    """행정동 지역명 기반 위도/경도 매핑 테이블 불러오기"""
+def load_coordinates(csv_path="data/seoul_gu_coordinates.csv"):
+    """지역명 기반 위도/경도 매핑 테이블 불러오기"""
     return pd.read_csv(csv_path)  # REGION_NAME, LAT, LON 포함되어 있어야 함
 
 def add_lat_lon(df, coord_df):
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import dataset_version, load_score_data
+
+
+class PartitionIndex:
+    """
+    (지역, 월) 순으로 정렬된 정규화 프레임과 오프셋 테이블
+    - 지역 / 지역+연도: 연속 구간이므로 복사 없는 iloc 슬라이스
+    - 월 / 연도: 미리 계산한 행 번호 목록으로 해당 행만 take (전체 스캔 없음)
+    REGION_NAME 또는 MONTH가 비어 있는 행은 인덱스에서 제외
+    """
+
+    def __init__(self, df):
+        valid = (df["REGION_NAME"].notna() & df["MONTH"].notna()).to_numpy()
+        if not valid.all():
+            df = df[valid]
+        region_codes = df["REGION_NAME"].cat.codes.to_numpy()
+        month_values = df["MONTH"].to_numpy()
+        order = np.lexsort((month_values, region_codes))
+
+        if (order == np.arange(len(order))).all():
+            # 이미 정렬된 공유 프레임(utils.shared_data)은 복사하지 않고 그대로 사용
+            self.frame = df.reset_index(drop=True) if not valid.all() else df
+        else:
+            self.frame = df.iloc[order].reset_index(drop=True)
+        self.regions = list(df["REGION_NAME"].cat.categories)
+        region_codes = region_codes[order]
+        self._region_ptr = np.searchsorted(region_codes, np.arange(len(self.regions) + 1))
+        self._month_values = month_values[order]
+
+        self.months = pd.DatetimeIndex(np.unique(self._month_values))
+        self._month_ptr, self._month_rows = self._csr(np.searchsorted(self.months.values, self._month_values), len(self.months))
+
+        years = self.frame["YEAR"].to_numpy(dtype=np.int32)
+        self.years = np.unique(years)
+        self._year_ptr, self._year_rows = self._csr(np.searchsorted(self.years, years), len(self.years))
+
+    @staticmethod
+    def _csr(keys, size):
+        rows = np.argsort(keys, kind="stable")
+        ptr = np.searchsorted(keys[rows], np.arange(size + 1))
+        return ptr, rows
+
+    def _region_bounds(self, region):
+        try:
+            code = self.regions.index(region)
+        except ValueError:
+            return 0, 0
+        return self._region_ptr[code], self._region_ptr[code + 1]
+
+    def region(self, region):
+        start, stop = self._region_bounds(region)
+        return self.frame.iloc[start:stop]
+
+    def region_year(self, region, year):
+        start, stop = self._region_bounds(region)
+        months = self._month_values[start:stop]
+        lo, hi = np.searchsorted(months, [np.datetime64(f"{int(year)}-01-01"), np.datetime64(f"{int(year) + 1}-01-01")])
+        return self.frame.iloc[start + lo:start + hi]
+
+    def month(self, month):
+        pos = self.months.searchsorted(pd.Timestamp(month))
+        if pos >= len(self.months) or self.months[pos] != pd.Timestamp(month):
+            return self.frame.iloc[0:0]
+        return self.frame.take(self._month_rows[self._month_ptr[pos]:self._month_ptr[pos + 1]])
+
+    def year(self, year):
+        pos = np.searchsorted(self.years, int(year))
+        if pos >= len(self.years) or self.years[pos] != int(year):
+            return self.frame.iloc[0:0]
+        return self.frame.take(self._year_rows[self._year_ptr[pos]:self._year_ptr[pos + 1]])
+
+    def regions_with_data(self):
+        return [r for r, n in zip(self.regions, np.diff(self._region_ptr)) if n > 0]
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _build_index(strict, version):
+    return PartitionIndex(load_score_data(strict))
+
+
+def get_partition_index(strict: bool = True):
+    """데이터 버전별로 한 번만 만들어 프로세스 전체에서 공유하는 파티션 인덱스"""
+    return _build_index(strict, dataset_version(strict))
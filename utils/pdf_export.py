@@ -0,0 +1,256 @@
+"""
+여러 지역×연도 PDF 리포트를 ZIP 하나로 내보내기
+
+    python -m utils.pdf_export --year 2023
+    python -m utils.pdf_export --regions 강남구,마포구 --years 2022,2023 --out reports.zip
+
+- 리포트 본문은 리포트 캐시를 먼저 쓰고, 없는 것만 LLM으로 생성 (utils.report_batch)
+- PDF 렌더링은 프로세스 풀에서 병렬 실행, 완성되는 순서대로 ZIP 파일에 바로 기록 (PDF 전체를 메모리에 모으지 않음)
+- 차트 이미지는 데이터 버전별 디렉터리에 캐시 → 같은 데이터로 다시 내보내면 차트는 다시 그리지 않음
+한글 출력에 TTF 폰트가 필요함 (GENTRI_PDF_FONT 또는 fonts-nanum 패키지)
+"""
+import argparse
+import hashlib
+import multiprocessing
+import numbers
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from utils.prompt import PROMPT_TOKEN_BUDGET, PROMPT_VERSION, REPORT_MODEL
+from utils.report_batch import generate_all_reports
+from utils.report_cache import report_key
+from utils.schema import COLUMN_LABELS
+
+# 차트 이미지 캐시 위치 (데이터 버전별 하위 디렉터리)
+CHART_DIR = Path(os.environ.get("GENTRI_PDF_CHART_DIR", ".cache/pdf_charts"))
+# 페이지에서 만든 ZIP 저장 위치
+OUTPUT_DIR = Path(os.environ.get("GENTRI_PDF_OUT_DIR", ".cache/pdf_bundles"))
+PDF_WORKERS = int(os.environ.get("GENTRI_PDF_WORKERS", min(4, os.cpu_count() or 1)))
+
+FONT_CANDIDATES = [
+    os.environ.get("GENTRI_PDF_FONT", ""),
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+]
+
+CHART_COLUMNS = {c: COLUMN_LABELS[c] for c in ["NORM_PRICE", "NORM_MOBILITY", "NORM_ASSETS", "NORM_FOOD", "NORM_CLOSE"]}
+TABLE_COLUMNS = {
+    "FINAL_SCORE": COLUMN_LABELS["FINAL_SCORE"], "DANGER_LEVEL": "위험 등급",
+    **{c: COLUMN_LABELS[c] for c in ["NORM_PRICE", "NORM_MOBILITY", "NORM_CLOSE"]},
+}
+
+
+def find_font():
+    """한글 TTF 폰트 경로 (없으면 None)"""
+    for path in FONT_CANDIDATES:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def chart_path(version, region, year):
+    digest = hashlib.sha1(f"{version}|{region}|{year}".encode("utf-8")).hexdigest()[:16]
+    return CHART_DIR / hashlib.sha1(version.encode("utf-8")).hexdigest()[:12] / f"{digest}.jpg"
+
+
+# ---------------------- 워커 프로세스에서 실행 ----------------------
+def _render_chart(rows, path, font):
+    """
+    월별 최종 점수(위)와 주요 지표(아래) 차트를 JPEG로 저장 - 임시 파일에 쓰고 교체
+    (fpdf 1.7.2는 알파 채널 PNG를 파이썬 정규식으로 분리해 느림, JPEG는 그대로 삽입)
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib import font_manager
+
+    font_manager.fontManager.addfont(font)
+    plt.rcParams["font.family"] = font_manager.FontProperties(fname=font).get_name()
+    plt.rcParams["axes.unicode_minus"] = False
+
+    months = rows["MONTH"].dt.strftime("%m")
+    fig, (top, bottom) = plt.subplots(2, 1, figsize=(7.5, 5), sharex=True, dpi=110)
+    top.plot(months, rows["FINAL_SCORE"], marker="o", color="#4F46E5")
+    top.set_ylabel("최종 점수")
+    top.set_ylim(0, 1)
+    top.grid(alpha=0.3)
+    for column, label in CHART_COLUMNS.items():
+        if column in rows.columns:
+            bottom.plot(months, rows[column], label=label)
+    bottom.set_ylabel("지표")
+    bottom.set_xlabel("월")
+    bottom.set_ylim(0, 1)
+    bottom.grid(alpha=0.3)
+    bottom.legend(fontsize=7, ncol=5, loc="upper center", bbox_to_anchor=(0.5, -0.25))
+    fig.tight_layout()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp.jpg")
+    fig.savefig(tmp, format="jpg", pil_kwargs={"quality": 88})
+    plt.close(fig)
+    os.replace(tmp, path)
+
+
+def render_pdf(region, year, summary, rows, image, font):
+    """리포트 PDF 하나를 만들어 (파일 이름, PDF 바이트) 반환"""
+    import fpdf
+
+    # 폰트 메트릭 캐시를 폰트 옆이 아닌 프로젝트 캐시에 저장 (시스템 폰트 디렉터리는 쓰기 불가일 수 있음)
+    fpdf.set_global("FPDF_CACHE_MODE", 2)
+    fpdf.set_global("FPDF_CACHE_DIR", str(CHART_DIR))
+    CHART_DIR.mkdir(parents=True, exist_ok=True)
+
+    image = Path(image)
+    if not image.exists():
+        _render_chart(rows, image, font)
+
+    pdf = fpdf.FPDF()
+    pdf.add_font("korean", "", font, uni=True)
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+
+    pdf.set_font("korean", size=18)
+    pdf.cell(0, 12, f"{region} {year}년 젠트리피케이션 리포트", ln=1)
+    pdf.set_font("korean", size=9)
+    pdf.set_text_color(110, 110, 110)
+    pdf.cell(0, 6, f"생성일 {datetime.today():%Y-%m-%d} · 모델 {REPORT_MODEL}", ln=1)
+    pdf.set_text_color(0, 0, 0)
+    pdf.ln(2)
+
+    pdf.image(str(image), w=180)
+    pdf.ln(2)
+
+    pdf.set_font("korean", size=13)
+    pdf.cell(0, 9, "LLM 분석 결과", ln=1)
+    pdf.set_font("korean", size=10)
+    pdf.multi_cell(0, 6, summary.strip())
+    pdf.ln(3)
+
+    pdf.set_font("korean", size=13)
+    pdf.cell(0, 9, "월별 요약", ln=1)
+    columns = [c for c in TABLE_COLUMNS if c in rows.columns]
+    widths = [20] + [170 / len(columns)] * len(columns)
+    pdf.set_font("korean", size=8)
+    for width, label in zip(widths, ["월"] + [TABLE_COLUMNS[c] for c in columns]):
+        pdf.cell(width, 6, label, border=1, align="C")
+    pdf.ln()
+    for _, row in rows.iterrows():
+        pdf.cell(widths[0], 6, f"{row['MONTH']:%Y-%m}", border=1, align="C")
+        for width, column in zip(widths[1:], columns):
+            value = row[column]
+            pdf.cell(width, 6, f"{value:.3f}" if isinstance(value, numbers.Real) else str(value), border=1, align="C")
+        pdf.ln()
+
+    return f"{region}_{year}_젠트리피케이션_리포트.pdf", pdf.output(dest="S").encode("latin-1")
+
+
+# ---------------------- 내보내기 ----------------------
+def bundle_path(name):
+    """Streamlit 작업이 ZIP을 기록할 경로 - 같은 요청(이름)은 같은 파일을 덮어씀"""
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    return OUTPUT_DIR / f"{name}.zip"
+
+
+def export_pdf_bundle(index, targets, version, cache, llm, out_path, workers=PDF_WORKERS, progress=None):
+    """
+    targets [(지역, 연도)]의 PDF를 out_path ZIP으로 저장
+    1) 캐시에 없는 리포트 본문을 LLM으로 생성  2) 프로세스 풀에서 PDF 렌더링 → 완성되는 대로 ZIP에 기록
+    반환값: {"written", "failed": [(지역, 연도, 오류)]}
+    """
+    font = find_font()
+    if font is None:
+        raise RuntimeError("PDF용 한글 TTF 폰트를 찾을 수 없습니다. GENTRI_PDF_FONT 환경변수로 경로를 지정하세요.")
+
+    selected = [(region, int(year), index.region_year(region, year)) for region, year in targets]
+    selected = [(region, year, rows) for region, year, rows in selected if not rows.empty]
+    total = len(selected)
+
+    def step(stage, done, count, share, offset):
+        if progress is not None:
+            progress(offset + share * done / max(count, 1), f"{stage} {done}/{count}")
+
+    generated = generate_all_reports(
+        index, llm, cache, version, targets=selected,
+        progress=lambda done, count: step("리포트 본문 생성", done, count, 0.3, 0.0),
+    )
+    result = {"written": 0, "failed": list(generated["failed"])}
+    skipped = {(region, year) for region, year, _ in generated["failed"]}
+
+    pending = [(region, year, rows) for region, year, rows in selected if (region, year) not in skipped]
+    count = len(pending)
+    pending = iter(pending)
+
+    def submit(pool, inflight):
+        for region, year, rows in pending:
+            summary = cache.get(report_key(REPORT_MODEL, PROMPT_VERSION, rows, version, PROMPT_TOKEN_BUDGET))
+            image = chart_path(version, region, year)
+            columns = ["MONTH"] + [c for c in dict.fromkeys([*CHART_COLUMNS, *TABLE_COLUMNS]) if c in rows.columns]
+            payload = rows[columns].astype({c: str for c in columns if c == "DANGER_LEVEL"})
+            inflight[pool.submit(render_pdf, region, year, summary, payload, str(image), font)] = (region, year)
+            return
+
+    # 스폰 방식: Streamlit 서버 프로세스(다수의 스레드)를 fork하지 않음
+    # 워커 수만큼만 작업을 띄우고, 끝난 PDF는 바로 ZIP에 쓰고 Future를 버림 (PDF 바이트가 메모리에 쌓이지 않음)
+    context = multiprocessing.get_context("spawn")
+    workers = max(1, workers)
+    with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as archive, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        inflight = {}
+        for _ in range(workers):
+            submit(pool, inflight)
+        done = 0
+        while inflight:
+            finished, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                region, year = inflight.pop(future)
+                try:
+                    name, data = future.result()
+                    archive.writestr(name, data)
+                    result["written"] += 1
+                except Exception as e:
+                    result["failed"].append((region, year, str(e)))
+                done += 1
+                step("PDF 렌더링", done, count, 0.7, 0.3)
+                submit(pool, inflight)
+    result["total"] = total
+    return result
+
+
+def main(argv=None):
+    from utils.data_loader import dataset_version
+    from utils.llm import get_llm
+    from utils.partition_index import get_partition_index
+    from utils.report_cache import get_report_cache
+
+    parser = argparse.ArgumentParser(description="지역×연도 PDF 리포트 묶음 내보내기")
+    parser.add_argument("--regions", default="", help="쉼표로 구분한 지역 (기본값: 전체)")
+    parser.add_argument("--years", default="", help="쉼표로 구분한 연도 (기본값: 최근 연도)")
+    parser.add_argument("--workers", type=int, default=PDF_WORKERS, help="PDF 렌더링 프로세스 수")
+    parser.add_argument("--llm", default=None, help="backend | stub (기본값: GENTRI_LLM 환경변수)")
+    parser.add_argument("--out", default=None, help="저장할 ZIP 경로")
+    args = parser.parse_args(argv)
+
+    index = get_partition_index(strict=True)
+    regions = args.regions.split(",") if args.regions else index.regions_with_data()
+    years = [int(y) for y in args.years.split(",")] if args.years else [int(index.years[-1])]
+    out = args.out or f"gentrification_reports_{'_'.join(map(str, years))}.zip"
+
+    started = time.perf_counter()
+    result = export_pdf_bundle(
+        index, [(r, y) for r in regions for y in years], dataset_version(strict=True),
+        get_report_cache(), get_llm(args.llm), out, workers=args.workers,
+        progress=lambda share, text: print(f"\r{text} ({share:.0%})", end="", flush=True),
+    )
+    print(f"\n{out}: {result['written']}/{result['total']}건 ({time.perf_counter() - started:.1f}s)")
+    for region, year, error in result["failed"]:
+        print(f"  실패: {region} {year} - {error}")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""
+대시보드 사전 계산 번들 생성 (cron 등에서 실행)
+
+    python -m utils.precompute
+    python -m utils.precompute --tables strict,score --force-refresh
+
+데이터를 한 번 가져와 모든 집계/지도 프레임/데이터 품질 프로파일을 계산해
+BUNDLE_DIR/<테이블>/<생성 시각>/ 에 Parquet + Vega-Lite JSON + manifest.json으로 저장함
+앱과 페이지는 가장 최근 번들이 있으면 웨어하우스 접속 없이 번들에서 바로 읽음
+"""
+import argparse
+import time
+
+from utils.backend import get_backend
+from utils.bundle import BundleWriter
+from utils.ingest import load_manifest, read_partitions, store_version
+from utils.charts import danger_distribution_chart, score_trend_chart
+from utils.mapping_utils import load_coordinates
+from utils.map_frames import map_score_table
+from utils.partition_index import PartitionIndex
+from utils.profile import update_profile
+from utils.rollups import ROLLUP_SQL, compute_rollup
+from utils.schema import COORDINATES_PATH, SOURCE_COLUMNS, build_region_dimension, score_table, to_canonical
+from utils.snapshot import load_snapshot_meta, snapshot_version, sync_snapshot
+
+TABLES = {"strict": True, "score": False}
+
+
+
+def build_bundle(strict=True, force_refresh=False):
+    """번들 하나를 만들어 공개하고 경로 반환 (실패하면 임시 디렉터리 삭제 후 예외 전달)"""
+    table_name = score_table(strict)
+    manifest = load_manifest(table_name)
+    if manifest is not None:
+        # 월 적재 저장소가 있으면 저장소가 원천 (utils.ingest)
+        raw = read_partitions(table_name, columns=SOURCE_COLUMNS, manifest=manifest)
+        version = store_version(manifest)
+    else:
+        raw = sync_snapshot(table_name, get_backend(), force=force_refresh, columns=SOURCE_COLUMNS)
+        meta = load_snapshot_meta(table_name) or {}
+        version = snapshot_version(table_name, meta)
+
+    writer = BundleWriter(table_name, version)
+    try:
+        regions = build_region_dimension(raw["REGION_NAME"], load_coordinates(COORDINATES_PATH))
+        scores = to_canonical(raw, regions)
+        writer.add_table("regions", regions)
+        writer.add_table("scores", scores)
+
+        rollups = {name: compute_rollup(name, strict) for name in ROLLUP_SQL}
+        for name, df in rollups.items():
+            writer.add_table(f"rollup_{name}", df)
+        writer.add_table("profile", update_profile(table_name, raw))
+
+        writer.add_table("map_scores", map_score_table(PartitionIndex(scores)))
+        writer.add_chart("score_trend", score_trend_chart(rollups["month"]).to_dict())
+        writer.add_chart("danger_distribution", danger_distribution_chart(rollups["month_danger"]).to_dict())
+    except Exception:
+        writer.abort()
+        raise
+    return writer.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 사전 계산 번들 생성")
+    parser.add_argument("--tables", default="strict", help="쉼표로 구분한 대상 (strict, score)")
+    parser.add_argument("--force-refresh", action="store_true", help="스냅샷을 무시하고 전체 다시 조회")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for key in args.tables.split(","):
+        started = time.perf_counter()
+        try:
+            path = build_bundle(TABLES[key.strip()], force_refresh=args.force_refresh)
+        except Exception as e:
+            failed += 1
+            print(f"실패: {key} - {e}")
+            continue
+        print(f"{key}: {path} ({time.perf_counter() - started:.1f}s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
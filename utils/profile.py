@@ -0,0 +1,225 @@
+import json
+import os
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import active_bundle, dataset_version, load_raw_data
+from utils.schema import COLUMN_LABELS, KEY_COLUMNS, SCORE_COLUMNS, score_table
+from utils.tracing import span
+
+# 월별 부분 통계 저장 위치 - 새 월만 추가로 계산
+PROFILE_DIR = Path(os.environ.get("GENTRI_PROFILE_DIR", ".cache/profiles"))
+# 분위수 스케치: [0, 1] 구간 고정 폭 히스토그램 (지표는 모두 0~1 정규화 값, 범위 밖은 양 끝 구간)
+SKETCH_BINS = 32
+# 드리프트 판정: 2표본 KS 검정 유의수준, 그리고 표본이 커도 무시할 최소 KS 거리
+DRIFT_ALPHA = float(os.environ.get("GENTRI_DRIFT_ALPHA", 0.001))
+DRIFT_MIN_KS = 0.1
+# 드리프트 비교 기준: 직전 몇 개월을 합친 분포
+DRIFT_WINDOW = 12
+
+PARTIAL_COLUMNS = ["COLUMN", "MONTH", "COUNT", "NULLS", "SUM", "SUMSQ", "MIN", "MAX", "SKETCH"]
+
+
+# ---------------------- 부분 통계 ----------------------
+def _month_key(raw):
+    return pd.to_datetime(raw["MONTH"], errors="coerce").dt.to_period("M").dt.to_timestamp()
+
+
+def profile_partials(raw):
+    """
+    컬럼 × 월 부분 통계 - 행 수, 결측 수, 합/제곱합, 최솟값/최댓값, 히스토그램 스케치
+    모두 더하기(또는 min/max)로 합칠 수 있어 월 단위로 따로 계산해도 결과가 같음
+    """
+    month = _month_key(raw)
+    months, codes = np.unique(month.to_numpy(), return_inverse=True)
+    codes = codes.ravel()
+    frames = []
+    for column in raw.columns:
+        values = raw[column]
+        isnull = values.isna().to_numpy()
+        part = pd.DataFrame({
+            "COLUMN": column,
+            "MONTH": months,
+            "COUNT": np.bincount(codes, minlength=len(months)),
+            "NULLS": np.bincount(codes, weights=isnull, minlength=len(months)).astype(np.int64),
+        })
+        sketch = np.zeros((len(months), SKETCH_BINS))
+        if column in SCORE_COLUMNS:
+            v = values.to_numpy(dtype=float)
+            ok = ~np.isnan(v)
+            part["SUM"] = np.bincount(codes[ok], weights=v[ok], minlength=len(months))
+            part["SUMSQ"] = np.bincount(codes[ok], weights=v[ok] ** 2, minlength=len(months))
+            grouped = pd.Series(v[ok]).groupby(codes[ok])
+            part["MIN"] = grouped.min().reindex(range(len(months))).to_numpy()
+            part["MAX"] = grouped.max().reindex(range(len(months))).to_numpy()
+            bins = np.clip((v[ok] * SKETCH_BINS).astype(int), 0, SKETCH_BINS - 1)
+            np.add.at(sketch, (codes[ok], bins), 1)
+        else:
+            part["SUM"] = part["SUMSQ"] = part["MIN"] = part["MAX"] = np.nan
+        part["SKETCH"] = list(sketch)
+        frames.append(part)
+    return pd.concat(frames, ignore_index=True)[PARTIAL_COLUMNS]
+
+
+def merge_partials(partials, by=("COLUMN",)):
+    """부분 통계를 by 기준으로 합치기 (예: 전체 기간 컬럼 통계, 연도별 통계)"""
+    grouped = partials.groupby(list(by), sort=False, dropna=False)
+    merged = grouped.agg(
+        COUNT=("COUNT", "sum"), NULLS=("NULLS", "sum"), SUM=("SUM", "sum"),
+        SUMSQ=("SUMSQ", "sum"), MIN=("MIN", "min"), MAX=("MAX", "max"),
+    ).reset_index()
+    sketch = np.zeros((len(merged), SKETCH_BINS))
+    np.add.at(sketch, grouped.ngroup().to_numpy(), np.vstack(partials["SKETCH"].to_numpy()))
+    merged["SKETCH"] = list(sketch)
+    return merged
+
+
+def sketch_quantile(sketch, q):
+    """히스토그램 스케치에서 분위수 근사 (구간 안은 균등 분포로 보간, 오차 <= 1/SKETCH_BINS)"""
+    total = sketch.sum()
+    if total == 0:
+        return np.nan
+    cum = np.cumsum(sketch)
+    i = int(np.searchsorted(cum, q * total))
+    before = cum[i - 1] if i > 0 else 0
+    within = (q * total - before) / sketch[i] if sketch[i] else 0
+    return (i + within) / SKETCH_BINS
+
+
+# ---------------------- 증분 갱신 ----------------------
+def _paths(table_name):
+    return PROFILE_DIR / f"{table_name}.parquet", PROFILE_DIR / f"{table_name}.meta.json"
+
+
+def _month_labels(month):
+    return month.dt.strftime("%Y-%m").fillna("NULL")
+
+
+def month_digests(raw, month=None):
+    """
+    월별 내용 해시 {YYYY-MM: 해시} - 행 해시의 합이라 행 순서와 무관
+    행 수가 같아도 값이 하나라도 바뀌면 그 월의 해시가 달라짐
+    """
+    month = _month_key(raw) if month is None else month
+    hashes = pd.Series(pd.util.hash_pandas_object(raw, index=False).to_numpy(), index=raw.index)
+    sums = hashes.groupby(_month_labels(month).to_numpy()).sum()
+    counts = hashes.groupby(_month_labels(month).to_numpy()).size()
+    return {key: f"{counts[key]}:{int(sums[key])}" for key in sums.index}
+
+
+def update_profile(table_name, raw):
+    """
+    저장된 부분 통계에 새 월과 내용이 바뀐 월(월별 내용 해시 비교)만 다시 계산해 합치고 저장
+    컬럼 구성이 바뀌면 전체 재계산
+    """
+    data_path, meta_path = _paths(table_name)
+    stored = None
+    known = {}
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("columns") == list(raw.columns) and meta.get("months") is not None:
+            stored = pd.read_parquet(data_path)
+            known = meta["months"]
+    except Exception:
+        pass
+
+    month = _month_key(raw)
+    digests = month_digests(raw, month)
+    unchanged = [key for key, digest in digests.items() if known.get(key) == digest]
+    stale = ~_month_labels(month).isin(unchanged)
+    keep = None if stored is None else stored[_month_labels(pd.to_datetime(stored["MONTH"])).isin(unchanged)]
+
+    with span("profile.update", months=int(month[stale].nunique(dropna=False))):
+        fresh = profile_partials(raw[stale.to_numpy()]) if stale.any() else None
+    parts = [p for p in (keep, fresh) if p is not None and not p.empty]
+    profile = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=PARTIAL_COLUMNS)
+    profile = profile.sort_values(["COLUMN", "MONTH"], ignore_index=True)
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = data_path.with_suffix(".tmp")
+    profile.to_parquet(tmp_path)
+    os.replace(tmp_path, data_path)
+    meta = {"columns": list(raw.columns), "months": digests}
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    return profile
+
+
+@st.cache_data(show_spinner="데이터 품질 프로파일 계산 중...", max_entries=4)
+def _cached_profile(strict, version):
+    bundle = active_bundle(strict)
+    if bundle is not None and bundle.has("profile"):
+        return bundle.table("profile")
+    return update_profile(score_table(strict), load_raw_data(strict))
+
+def load_profile(strict: bool = True):
+    """데이터 버전당 한 번만 계산되는 컬럼 × 월 부분 통계 (번들 우선)"""
+    return _cached_profile(strict, dataset_version(strict))
+
+
+# ---------------------- 요약 / 드리프트 ----------------------
+def column_summary(profile):
+    """
+    전체 기간 통계 (summary, nulls)
+    - summary: 주요 지표의 평균/최솟값/최댓값/중앙값(스케치 근사)
+    - nulls: 컬럼별 결측치 수와 비율
+    """
+    merged = merge_partials(profile).set_index("COLUMN")
+    key = merged.loc[[c for c in KEY_COLUMNS if c in merged.index]]
+    summary = pd.DataFrame({
+        "평균": key["SUM"] / (key["COUNT"] - key["NULLS"]).clip(lower=1),
+        "최솟값": key["MIN"],
+        "최댓값": key["MAX"],
+        "중앙값": [sketch_quantile(s, 0.5) for s in key["SKETCH"]],
+    }).astype(float).round(3)
+    summary.index = [COLUMN_LABELS[c] for c in key.index]
+
+    nulls = pd.DataFrame({
+        "결측치 수": merged["NULLS"].astype(int),
+        "결측치 비율(%)": (merged["NULLS"] / merged["COUNT"].clip(lower=1) * 100).round(1)
+    }).sort_values("결측치 비율(%)", ascending=False)
+    nulls.index.name = None
+    return summary, nulls
+
+
+def drift_table(profile, columns=None, window=DRIFT_WINDOW, alpha=DRIFT_ALPHA):
+    """
+    지표별로 각 월의 분포를 직전 window개월 합산 분포와 비교한 KS 거리 (스케치 누적분포의 최대 차이)
+    급변: KS가 유의수준 alpha의 임계값(표본 수에 따라 달라짐)과 DRIFT_MIN_KS를 모두 넘는 월
+    반환: COLUMN, MONTH, KS, 임계값, 평균, 평균 변화, 급변
+    """
+    columns = columns or [c for c in SCORE_COLUMNS if c in set(profile["COLUMN"])]
+    c_alpha = np.sqrt(-0.5 * np.log(alpha / 2))
+    frames = []
+    for column in columns:
+        part = profile[(profile["COLUMN"] == column) & profile["MONTH"].notna()].sort_values("MONTH")
+        if len(part) < 2:
+            continue
+        hist = np.vstack(part["SKETCH"].to_numpy())
+        cum = np.vstack([np.zeros(SKETCH_BINS), np.cumsum(hist, axis=0)])
+        idx = np.arange(len(part))
+        baseline = cum[idx] - cum[np.maximum(idx - window, 0)]
+
+        n, m = hist.sum(axis=1), baseline.sum(axis=1)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            current_cdf = np.cumsum(hist, axis=1) / n[:, None]
+            baseline_cdf = np.cumsum(baseline, axis=1) / m[:, None]
+            ks = np.abs(current_cdf - baseline_cdf).max(axis=1)
+            critical = c_alpha * np.sqrt((n + m) / (n * m))
+            mean = (part["SUM"] / (part["COUNT"] - part["NULLS"])).to_numpy()
+        ks[(n == 0) | (m == 0)] = np.nan
+
+        frames.append(pd.DataFrame({
+            "COLUMN": column,
+            "MONTH": part["MONTH"].to_numpy(),
+            "KS": ks.round(4),
+            "임계값": critical.round(4),
+            "평균": mean.round(4),
+            "평균 변화": np.diff(mean, prepend=np.nan).round(4),
+        }))
+    drift = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["COLUMN", "MONTH", "KS", "임계값", "평균", "평균 변화"])
+    drift["급변"] = (drift["KS"] > drift["임계값"]) & (drift["KS"] >= DRIFT_MIN_KS)
+    return drift
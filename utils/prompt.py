@@ -0,0 +1,180 @@
+import os
+
+import numpy as np
+import pandas as pd
+from utils.schema import INDICATORS
+
+# Cortex COMPLETE에 사용하는 모델과 프롬프트 템플릿
+# 템플릿이나 특징 요약 방식을 바꾸면 PROMPT_VERSION을 올려야 기존 캐시된 리포트가 재사용되지 않음
+REPORT_MODEL = "claude-3-5-sonnet"
+PROMPT_VERSION = "3"
+# 프롬프트 입력 토큰 상한 (추정치 기준) - 선택 항목은 넘지 않는 범위에서만 넣음
+# 필수 항목(연간 위험도, 지시에서 언급하는 지표, 작성 지시)은 예산보다 먼저 자리를 잡으므로 그것만으로 넘칠 수 있는 느슨한 상한
+PROMPT_TOKEN_BUDGET = int(os.environ.get("GENTRI_PROMPT_TOKENS", 650))
+
+INSTRUCTIONS = """
+위 요약의 수치만 근거로 정책 분석 보고서를 작성해주세요 (16~18줄, 도시 정책 보고서 문체):
+1. 연중 평균·최고 위험도와 해당 월
+2. 점수 상승/하락 시기와 같은 시기에 크게 움직인 지표로 본 원인
+3. 유동인구·매출·폐업률 등 상권 지표와의 관련성
+4. 자영업자·저소득층에 미치는 사회적 영향
+5. 정책 개입·모니터링 방향 제언
+"""
+# 작성 지시 3번에서 언급하는 지표 - 지시와 데이터가 어긋나지 않도록 예산과 관계없이 항상 포함
+INSTRUCTION_INDICATORS = ["NORM_MOBILITY", "NORM_SALES", "NORM_FOOD", "NORM_CLOSE"]
+
+
+def estimate_tokens(text):
+    """
+    입력 토큰 수 근사 (토크나이저 없이) - 한글 등 비ASCII 문자는 1자당 1토큰, ASCII는 4자당 1토큰
+    실제보다 약간 크게 잡히는 보수적 추정
+    """
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+# ---------------------- 특징 요약 ----------------------
+def _month(value):
+    return f"{pd.Timestamp(value).month}월"
+
+
+def _score_section(rows):
+    scores = rows["FINAL_SCORE"].to_numpy(dtype=float)
+    months = rows["MONTH"].to_numpy()
+    if np.isnan(scores).all():
+        # 점수가 전부 비어 있으면 섹션 생략
+        return "[연간 위험도]", []
+    peak, trough = int(np.nanargmax(scores)), int(np.nanargmin(scores))
+    levels = rows["DANGER_LEVEL"].astype(str).value_counts()
+    deltas = np.diff(scores)
+    lines = [
+        f"- 위험 점수: 평균 {np.nanmean(scores):.2f}, 최고 {scores[peak]:.2f}({_month(months[peak])}), "
+        f"최저 {scores[trough]:.2f}({_month(months[trough])}), 연초 대비 연말 {scores[-1] - scores[0]:+.2f}",
+        "- 위험 등급 분포: " + ", ".join(f"{level} {count}개월" for level, count in levels.items()),
+    ]
+    if len(deltas) and not np.isnan(deltas).all():
+        up, down = int(np.nanargmax(deltas)), int(np.nanargmin(deltas))
+        lines.append(
+            f"- 최대 상승 {_month(months[up + 1])}({deltas[up]:+.2f}), 최대 하락 {_month(months[down + 1])}({deltas[down]:+.2f})"
+        )
+    return "[연간 위험도]", lines
+
+
+def _rank_section(region, year, ranking):
+    if ranking is None:
+        return None, []
+    months = ranking["MONTH"]
+    current = ranking[(ranking["REGION_NAME"] == region) & (months.dt.year == year)]
+    if current.empty:
+        return None, []
+    n_regions = ranking.loc[months.dt.year == year].groupby("MONTH", observed=True).size().max()
+    first, last = current.iloc[0], current.iloc[-1]
+    return f"[지역 간 순위] 전체 {n_regions}개 지역 중 (1위 = 가장 위험)", [
+        f"- 평균 {current['RANK'].mean():.0f}위 (상위 {100 - current['PERCENTILE'].mean():.0f}%), "
+        f"{_month(first['MONTH'])} {int(first['RANK'])}위 → {_month(last['MONTH'])} {int(last['RANK'])}위, "
+        f"최고 {int(current['RANK'].min())}위"
+    ]
+
+
+def _indicator_section(rows):
+    """
+    지표별 한 줄 → (제목, 필수 줄, 선택 줄)
+    필수 = INSTRUCTION_INDICATORS, 선택 = 나머지 - 각각 월별 변화가 점수 변화와 함께 움직인 정도(상관계수)가 큰 순서
+    """
+    scores = np.diff(rows["FINAL_SCORE"].to_numpy(dtype=float))
+    months = rows["MONTH"].to_numpy()
+    lines = []
+    for column, label, weight in INDICATORS:
+        if column not in rows.columns or rows[column].isna().all():
+            continue
+        values = rows[column].to_numpy(dtype=float)
+        deltas = np.diff(values)
+        line = f"- {label}({weight}%) 평균 {np.nanmean(values):.2f}, 연간 {values[-1] - values[0]:+.2f}"
+        relevance = 0.0
+        if len(deltas) > 1 and not np.isnan(deltas).all():
+            up, down = int(np.nanargmax(deltas)), int(np.nanargmin(deltas))
+            line += f", ↑{_month(months[up + 1])} {deltas[up]:+.2f}, ↓{_month(months[down + 1])} {deltas[down]:+.2f}"
+            ok = ~(np.isnan(deltas) | np.isnan(scores))
+            if ok.sum() > 2 and deltas[ok].std() > 0 and scores[ok].std() > 0:
+                relevance = abs(np.corrcoef(deltas[ok], scores[ok])[0, 1])
+        lines.append((column in INSTRUCTION_INDICATORS, relevance, line))
+    lines.sort(key=lambda item: -item[1])
+    return (
+        "[지표별 변화] (0~1 정규화, 괄호=점수 가중치, ↑↓=전월 대비 최대 변화)",
+        [line for required, _, line in lines if required],
+        [line for required, _, line in lines if not required],
+    )
+
+
+def _monthly_section(rows):
+    return "[월별 점수]", [
+        " | ".join(f"{_month(row.MONTH)} {row.FINAL_SCORE:.2f}({row.DANGER_LEVEL})" for row in rows.itertuples())
+    ]
+
+
+def _monthly_indicator_section(rows):
+    columns = [(c, label) for c, label, _ in INDICATORS if c in rows.columns]
+    deltas = rows[[c for c, _ in columns]].diff().iloc[1:]
+    lines = [
+        f"{_month(month)}: " + ", ".join(f"{label} {value:+.2f}" for (_, label), value in zip(columns, row) if abs(value) >= 0.1)
+        for month, row in zip(rows["MONTH"].iloc[1:], deltas.to_numpy())
+    ]
+    return "[전월 대비 큰 지표 변화 (±0.1 이상)]", [line for line in lines if not line.endswith(": ")]
+
+
+def _monthly_rows(rows):
+    """월당 한 행으로 정리 (같은 월에 여러 행이 있으면 지표는 평균, 등급은 최빈값)"""
+    rows = rows.sort_values("MONTH")
+    if rows["MONTH"].is_unique:
+        return rows
+    numeric = [c for c in rows.columns if c.startswith("NORM_") or c == "FINAL_SCORE"]
+    grouped = rows.groupby("MONTH", observed=True)
+    monthly = grouped[numeric].mean()
+    monthly["DANGER_LEVEL"] = rows.groupby(["MONTH", "DANGER_LEVEL"], observed=True).size().unstack().idxmax(axis=1)
+    return monthly.reset_index()
+
+
+def build_report_prompt(region, year, rows, ranking=None, budget=PROMPT_TOKEN_BUDGET):
+    """
+    지역/연도의 월별 행(정규화 프레임 슬라이스)을 미리 계산한 특징 요약으로 바꿔 정책 리포트 프롬프트 생성
+    - 필수: 연간 위험도 요약, 작성 지시에서 언급하는 지표(INSTRUCTION_INDICATORS), 작성 지시
+    - 선택 (우선순위 순): 지역 간 순위(ranking: utils.ranking 순위표) → 월별 점수 → 나머지 지표 → 월별 큰 지표 변화
+    선택 줄은 추정 토큰이 budget을 넘지 않는 범위에서 줄 단위로 포함 (제목은 첫 줄이 들어갈 때만)
+    budget은 필수 항목을 뺀 나머지에 대한 상한 - 필수 항목만으로 budget을 넘으면 선택 항목 없이 그대로 반환
+    """
+    rows = _monthly_rows(rows)
+    header = f"다음은 {year}년 {region}의 젠트리피케이션 위험도 데이터를 요약한 것입니다."
+    score_title, score_lines = _score_section(rows)
+    rank_title, rank_lines = _rank_section(region, year, ranking)
+    monthly_title, monthly_lines = _monthly_section(rows)
+    changes_title, changes_lines = _monthly_indicator_section(rows)
+    # 표시 순서대로 (제목, 필수 줄, 선택 줄)
+    blocks = [
+        (None, [header], []),
+        (score_title, score_lines, []),
+        (rank_title, [], rank_lines),
+        _indicator_section(rows),
+        (monthly_title, [], monthly_lines),
+        (changes_title, [], changes_lines),
+    ]
+    priority = [2, 4, 3, 5]
+
+    def title_cost(title):
+        return estimate_tokens(title) + 2 if title else 0
+
+    kept = [list(required) for _, required, _ in blocks]
+    used = estimate_tokens(INSTRUCTIONS) + sum(
+        title_cost(title) + sum(estimate_tokens(line) + 1 for line in lines)
+        for (title, _, _), lines in zip(blocks, kept) if lines
+    )
+    for i in priority:
+        title, _, optional = blocks[i]
+        for line in optional:
+            cost = estimate_tokens(line) + 1 + (0 if kept[i] else title_cost(title))
+            if used + cost > budget:
+                break
+            kept[i].append(line)
+            used += cost
+
+    sections = ["\n".join(([title] if title else []) + lines) for (title, _, _), lines in zip(blocks, kept) if lines]
+    return "\n\n".join(sections) + "\n" + INSTRUCTIONS
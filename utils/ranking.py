@@ -0,0 +1,121 @@
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import dataset_version
+from utils.partition_index import get_partition_index
+from utils.schema import DANGER_LEVELS, SCORE_COLUMNS
+
+DELTA_LAGS = {"MOM": 1, "YOY": 12}
+
+
+def _region_month_means(index, columns):
+    """(지역, 월) 그룹 평균 행렬 {컬럼: (지역 × 월)} - bincount 한 번씩, 그룹별 파이썬 호출 없음"""
+    frame = index.frame
+    n_regions, n_months = len(index.regions), len(index.months)
+    group = frame["REGION_NAME"].cat.codes.to_numpy().astype(np.int64) * n_months + np.searchsorted(index.months.values, frame["MONTH"].to_numpy())
+    size = n_regions * n_months
+
+    means = {}
+    for column in columns:
+        values = frame[column].to_numpy(dtype=np.float64)
+        ok = ~np.isnan(values)
+        total = np.bincount(group[ok], weights=values[ok], minlength=size)
+        count = np.bincount(group[ok], minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[column] = (total / count).reshape(n_regions, n_months)
+    return means, group
+
+
+def _modal_level(index, group):
+    """(지역 × 월) 최빈 DANGER_LEVEL 코드 (-1: 없음, 동률이면 낮은 등급)"""
+    n_regions, n_months = len(index.regions), len(index.months)
+    levels = index.frame["DANGER_LEVEL"].cat.codes.to_numpy()
+    ok = levels >= 0
+    counts = np.zeros((n_regions * n_months, len(DANGER_LEVELS)), dtype=np.int32)
+    np.add.at(counts, (group[ok], levels[ok]), 1)
+    modal = np.where(counts.any(axis=1), counts.argmax(axis=1), -1)
+    return modal.reshape(n_regions, n_months)
+
+
+def _lag_positions(months, lag):
+    """각 월의 lag개월 전 월 위치 (데이터에 없으면 -1) - 월이 비어 있어도 정확히 lag개월 전과 비교"""
+    target = (months - pd.DateOffset(months=lag)).values
+    pos = np.searchsorted(months.values, target)
+    found = (pos < len(months)) & (months.values[np.minimum(pos, len(months) - 1)] == target)
+    return np.where(found, pos, -1)
+
+
+def _shifted(matrix, pos):
+    """(지역 × 월) 행렬을 pos 위치의 월 값으로 바꾼 행렬 (pos = -1이면 NaN)"""
+    return np.where(pos >= 0, matrix[:, np.maximum(pos, 0)], np.nan)
+
+
+def compute_ranking(index):
+    """
+    전체 지역 × 월 순위표 (한 번의 벡터 연산)
+    - RANK: 월별 FINAL_SCORE 내림차순 순위 (1 = 가장 위험), PERCENTILE: 월 내 백분위 (100 = 가장 위험)
+    - <컬럼>_MOM / <컬럼>_YOY: FINAL_SCORE와 NORM_* 의 전월/전년 동월 대비 변화
+    - RANK_MOM / RANK_YOY: 순위 변화 (양수 = 순위 상승, 즉 더 위험해짐)
+    - DANGER_LEVEL: (지역, 월) 그룹의 최빈 위험 등급
+    """
+    columns = [c for c in SCORE_COLUMNS if c in index.frame.columns]
+    means, group = _region_month_means(index, columns)
+    modal = _modal_level(index, group)
+
+    score = pd.DataFrame(means["FINAL_SCORE"])
+    rank = score.rank(axis=0, ascending=False, method="min").to_numpy()
+    percentile = (score.rank(axis=0, pct=True) * 100).to_numpy()
+
+    n_regions, n_months = score.shape
+    has_data = ~np.isnan(means["FINAL_SCORE"]).ravel()
+    table = pd.DataFrame({
+        "REGION_NAME": np.repeat(index.regions, n_months),
+        "MONTH": np.tile(index.months.values, n_regions),
+        "RANK": rank.ravel(),
+        "PERCENTILE": percentile.ravel().round(1),
+        "DANGER_LEVEL": pd.Categorical.from_codes(modal.ravel(), categories=DANGER_LEVELS, ordered=True),
+    })
+
+    lags = {basis: _lag_positions(index.months, lag) for basis, lag in DELTA_LAGS.items()}
+    for basis, pos in lags.items():
+        table[f"RANK_{basis}"] = (_shifted(rank, pos) - rank).ravel()
+    for column in columns:
+        table[column] = means[column].ravel().astype(np.float32)
+        for basis, pos in lags.items():
+            table[f"{column}_{basis}"] = (means[column] - _shifted(means[column], pos)).ravel().astype(np.float32)
+
+    table = table[has_data].reset_index(drop=True)
+    table["RANK"] = table["RANK"].astype(np.int32)
+    table["REGION_NAME"] = pd.Categorical(table["REGION_NAME"], categories=index.regions)
+    return table
+
+
+def rank_movers(ranking, month, basis="MOM", column="FINAL_SCORE", n=10):
+    """해당 월에 column이 가장 많이 오른 / 내린 지역 TOP N (risers, fallers)"""
+    current = ranking[ranking["MONTH"] == pd.Timestamp(month)].dropna(subset=[f"{column}_{basis}"])
+    view = current[["REGION_NAME", "RANK", f"RANK_{basis}", "DANGER_LEVEL", column, f"{column}_{basis}"]]
+    risers = view.nlargest(n, f"{column}_{basis}").reset_index(drop=True)
+    fallers = view.nsmallest(n, f"{column}_{basis}").reset_index(drop=True)
+    return risers, fallers
+
+
+@st.cache_data(show_spinner="순위 계산 중...", max_entries=4)
+def _cached_ranking(strict, version):
+    return compute_ranking(get_partition_index(strict))
+
+def load_ranking(strict: bool = True):
+    """데이터 버전별로 한 번만 계산하는 전체 순위표"""
+    return _cached_ranking(strict, dataset_version(strict))
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _ranking_parquet(strict, version):
+    buffer = io.BytesIO()
+    _cached_ranking(strict, version).to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+def ranking_parquet(strict: bool = True):
+    """전체 순위표 다운로드용 Parquet 바이트 (버전별 캐시)"""
+    return _ranking_parquet(strict, dataset_version(strict))
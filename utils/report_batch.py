@@ -0,0 +1,116 @@
+"""
+전체 지역×연도 리포트 일괄 생성
+
+    python -m utils.report_batch --workers 4 --rate 60
+    GENTRI_BACKEND=local GENTRI_LLM=stub python -m utils.report_batch
+
+생성된 리포트는 리포트 캐시(utils.report_cache)의 고정 저장소에 저장되며 (TTL/LRU로 삭제되지 않음),
+리포트 페이지는 같은 키로 캐시를 먼저 조회하므로 즉시 표시됨
+전체 생성 시 현재 데이터/프롬프트 버전에 해당하지 않는 고정 리포트는 정리함
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.llm import RateLimiter, complete_with_retry, get_llm
+from utils.prompt import PROMPT_TOKEN_BUDGET, PROMPT_VERSION, REPORT_MODEL, build_report_prompt
+from utils.ranking import compute_ranking
+from utils.report_cache import get_report_cache, report_key
+
+
+def iter_report_jobs(index):
+    """데이터가 있는 모든 (지역, 연도, 행) 조합"""
+    for region in index.regions_with_data():
+        for year in index.years:
+            rows = index.region_year(region, year)
+            if not rows.empty:
+                yield region, int(year), rows
+
+
+def generate_all_reports(index, llm, cache, version, model=REPORT_MODEL, workers=4,
+                         rate_per_minute=60, attempts=3, force=False, progress=None, targets=None):
+    """
+    캐시에 없는 지역×연도 리포트를 제한된 수의 워커로 병렬 생성
+    version: index의 데이터 버전 (utils.data_loader.dataset_version - 캐시 키에 포함)
+    targets: (지역, 연도, 행) 목록 - 없으면 데이터가 있는 전체 조합
+    전체 일괄 생성만 결과를 고정 저장소에 두고 이전 버전 고정 항목을 정리 (targets를 주면 일반 LRU 항목)
+    반환값: {"total", "cached", "generated", "failed", "pruned"} 건수와 실패 목록
+    """
+    jobs = []
+    keys = []
+    ranking = None
+    result = {"total": 0, "cached": 0, "generated": 0, "failed": [], "pruned": 0}
+    pin = targets is None
+    for region, year, rows in iter_report_jobs(index) if targets is None else targets:
+        result["total"] += 1
+        key = report_key(model, PROMPT_VERSION, rows, version, PROMPT_TOKEN_BUDGET)
+        keys.append(key)
+        # 페이지에서 만든 캐시 항목도 고정 저장소로 옮겨 일괄 결과가 LRU로 밀려나지 않게 함
+        if not force and (cache.pin(key) if pin else cache.has(key)):
+            result["cached"] += 1
+            continue
+        if ranking is None:
+            # 프롬프트의 지역 간 순위 요약용 - 생성할 리포트가 있을 때만 한 번 계산
+            ranking = compute_ranking(index)
+        jobs.append((region, year, key, build_report_prompt(region, year, rows, ranking)))
+
+    limiter = RateLimiter(rate_per_minute)
+
+    def run(job):
+        region, year, key, prompt = job
+        summary = complete_with_retry(llm, model, prompt, attempts=attempts, limiter=limiter)
+        cache.put(key, summary, pinned=pin, region=region, year=year, model=model)
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(run, job): job for job in jobs}
+        for future in as_completed(futures):
+            region, year = futures[future][:2]
+            try:
+                future.result()
+                result["generated"] += 1
+            except Exception as e:
+                result["failed"].append((region, year, str(e)))
+            done += 1
+            if progress is not None:
+                progress(done, len(jobs))
+    if pin:
+        result["pruned"] = cache.retain_pinned(keys)
+    return result
+
+
+def main(argv=None):
+    from utils.data_loader import dataset_version
+    from utils.partition_index import get_partition_index
+
+    parser = argparse.ArgumentParser(description="지역×연도 정책 리포트 일괄 생성")
+    parser.add_argument("--workers", type=int, default=4, help="동시 LLM 호출 수")
+    parser.add_argument("--rate", type=int, default=60, help="분당 최대 호출 수 (0: 제한 없음)")
+    parser.add_argument("--attempts", type=int, default=3, help="호출당 최대 시도 횟수")
+    parser.add_argument("--llm", default=None, help="backend | stub (기본값: GENTRI_LLM 환경변수)")
+    parser.add_argument("--force", action="store_true", help="캐시된 리포트도 다시 생성")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    result = generate_all_reports(
+        get_partition_index(strict=True),
+        get_llm(args.llm),
+        get_report_cache(),
+        dataset_version(strict=True),
+        workers=args.workers,
+        rate_per_minute=args.rate,
+        attempts=args.attempts,
+        force=args.force,
+        progress=lambda done, total: print(f"\r{done}/{total}", end="", flush=True),
+    )
+    print(
+        f"\n전체 {result['total']}건 · 캐시 {result['cached']}건 · 생성 {result['generated']}건 · "
+        f"실패 {len(result['failed'])}건 · 이전 버전 정리 {result['pruned']}건 ({time.perf_counter() - started:.1f}s)"
+    )
+    for region, year, error in result["failed"]:
+        print(f"  실패: {region} {year} - {error}")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+REPORT_CACHE_DIR = Path(os.environ.get("GENTRI_REPORT_CACHE_DIR", ".cache/reports"))
+REPORT_CACHE_MAX_ENTRIES = int(os.environ.get("GENTRI_REPORT_CACHE_MAX_ENTRIES", 500))
+REPORT_CACHE_TTL = int(os.environ.get("GENTRI_REPORT_CACHE_TTL", 30 * 24 * 60 * 60))
+
+
+def report_key(model, prompt_version, rows, version, budget):
+    """
+    (모델, 프롬프트 버전, 프롬프트 토큰 예산, 데이터 버전, 리포트에 들어가는 행 내용)의 해시
+    - 해당 지역/연도의 월별 데이터가 바뀌면 키가 달라지므로 자동으로 무효화됨
+    - 프롬프트의 지역 간 순위는 다른 지역 데이터로 계산하므로 데이터 버전(동기화/적재)이 바뀌어도 무효화
+    - 토큰 예산에 따라 프롬프트에 들어가는 줄이 달라지므로 예산도 포함
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{model}\n{prompt_version}\n{budget}\n{version}\n{list(rows.columns)}\n".encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """
+    로컬 디스크 기반 LLM 리포트 캐시
+    - 항목당 JSON 파일 1개, 파일 mtime을 마지막 사용 시각으로 사용 (LRU)
+    - TTL이 지난 항목은 조회 시 삭제, max_entries를 넘으면 오래 안 쓴 항목부터 삭제
+    - 일괄 생성(utils.report_batch) 결과는 pinned/ 하위 디렉터리에 따로 보관 - TTL/LRU 삭제 대상 아님
+    """
+
+    def __init__(self, directory=REPORT_CACHE_DIR, max_entries=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pinned_directory(self):
+        return self.directory / "pinned"
+
+    def _path(self, key):
+        pinned = self.pinned_directory / f"{key}.json"
+        return pinned if pinned.exists() else self.directory / f"{key}.json"
+
+    def _load(self, key):
+        """유효한 항목 읽기 - TTL이 지난 항목은 삭제 후 None (고정 항목은 만료 없음)"""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if path.parent == self.directory and time.time() - entry["created_at"] > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def get(self, key):
+        entry = self._load(key)
+        path = self._path(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        os.utime(path)
+        return entry["summary"]
+
+    def has(self, key):
+        """히트/미스 카운터에 반영하지 않고 유효한 항목이 있는지 확인"""
+        return self._load(key) is not None
+
+    def put(self, key, summary, pinned=False, **meta):
+        """pinned=True면 일괄 생성용 고정 저장소에 저장 (만료/삭제되지 않음)"""
+        directory = self.pinned_directory if pinned else self.directory
+        directory.mkdir(parents=True, exist_ok=True)
+        entry = {"summary": summary, "created_at": time.time(), **meta}
+        path = directory / f"{key}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False, default=str), encoding="utf-8")
+        os.replace(tmp_path, path)
+        if not pinned:
+            self._evict()
+
+    def pin(self, key):
+        """이미 있는 항목을 고정 저장소로 옮김 (없거나 만료됐으면 False)"""
+        if self._load(key) is None:
+            return False
+        path = self._path(key)
+        if path.parent != self.pinned_directory:
+            self.pinned_directory.mkdir(parents=True, exist_ok=True)
+            os.replace(path, self.pinned_directory / path.name)
+        return True
+
+    def retain_pinned(self, keys):
+        """고정 항목 중 keys에 없는 것(이전 데이터/프롬프트 버전의 리포트) 삭제, 삭제 건수 반환"""
+        keys = set(keys)
+        removed = 0
+        for path in self.pinned_directory.glob("*.json"):
+            if path.stem not in keys:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def _evict(self):
+        entries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in entries[:max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(list(self.directory.glob("*.json"))) if self.directory.exists() else 0,
+                "pinned": len(list(self.pinned_directory.glob("*.json"))) if self.pinned_directory.exists() else 0,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_report_cache():
+    """프로세스 전체에서 공유하는 리포트 캐시 (히트/미스 카운터 포함)"""
+    return ReportCache()
@@ -0,0 +1,97 @@
+import logging
+import os
+
+import pandas as pd
+import streamlit as st
+from utils.backend import get_backend
+from utils.data_loader import active_bundle, dataset_version
+from utils.ingest import has_store
+from utils.schema import score_table
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 집계 결과 캐시 유지 시간(초)
+ROLLUP_TTL = int(os.environ.get("GENTRI_ROLLUP_TTL", 60 * 60))
+
+REGION_COLUMNS = [
+    "NORM_PRICE", "NORM_MOBILITY", "NORM_ASSETS",
+    "NORM_FOOD", "NORM_CLOSE", "FINAL_SCORE"
+]
+
+# ---------------------- 집계 정의 ----------------------
+# Snowflake와 DuckDB 양쪽에서 그대로 실행되는 SQL만 사용
+# 컬럼별 통계(건수/결측/평균/표준편차/최소/최대/분위수)는 여기 두지 않고 utils.profile이 담당:
+# 월 × 컬럼 부분 통계를 저장해 두고 바뀐 월만 다시 계산하는 집계 테이블이라, 분위수 스케치와 월별 드리프트까지 같은 결과에서 나옴
+MONTH_KEY = "DATE_TRUNC('MONTH', MONTH)"
+
+ROLLUP_SQL = {
+    "month": f"""
+        SELECT {MONTH_KEY} AS MONTH, AVG(FINAL_SCORE) AS FINAL_SCORE
+        FROM {{table}}
+        GROUP BY 1
+        ORDER BY 1
+    """,
+    "month_danger": f"""
+        SELECT {MONTH_KEY} AS MONTH, DANGER_LEVEL, COUNT(*) AS CNT
+        FROM {{table}}
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+    """,
+    "region_month": f"""
+        SELECT REGION_NAME, {MONTH_KEY} AS MONTH,
+               {", ".join(f"AVG({c}) AS {c}" for c in REGION_COLUMNS)},
+               MODE(DANGER_LEVEL) AS DANGER_LEVEL
+        FROM {{table}}
+        WHERE REGION_NAME IS NOT NULL
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+    """,
+}
+
+
+
+def _run(sql, table_name):
+    """
+    백엔드에 집계 질의 - 실패하면 로컬 스냅샷(DuckDB)에서 같은 SQL 실행
+    월 적재 저장소(utils.ingest)가 있으면 웨어하우스 대신 저장소 파티션을 DuckDB로 집계
+    """
+    if has_store(table_name):
+        local = get_backend("local")
+        local.refresh()
+        return local.query(sql)
+    backend = get_backend()
+    try:
+        return backend.query(sql)
+    except Exception as e:
+        if backend.name == "local":
+            raise
+        logger.warning("%s 집계를 %s 백엔드에서 실행하지 못해 로컬 스냅샷으로 대체합니다: %s", table_name, backend.name, e)
+        with span("rollup.fallback", table=table_name, error=type(e).__name__):
+            return get_backend("local").query(sql)
+
+
+def _parse_month(df):
+    df["MONTH"] = pd.to_datetime(df["MONTH"], errors="coerce")
+    return df
+
+
+def compute_rollup(name, strict=True):
+    """month / month_danger / region_month 집계를 서버에서 계산해 작은 결과만 반환"""
+    with span(f"rollup.{name}"):
+        table_name = score_table(strict)
+        return _parse_month(_run(ROLLUP_SQL[name].format(table=table_name), table_name))
+
+
+@st.cache_data(ttl=ROLLUP_TTL, show_spinner="집계 데이터를 불러오는 중입니다...", max_entries=12)
+def _cached_rollup(name, strict, version):
+    return compute_rollup(name, strict)
+
+
+def load_rollup(name: str, strict: bool = True):
+    """사전 계산 번들이 있으면 번들에서, 없으면 서버 집계 (데이터 버전별 캐시 - 동기화/적재 후 바로 갱신)"""
+    bundle = active_bundle(strict)
+    if bundle is not None and bundle.has(f"rollup_{name}"):
+        return bundle.table(f"rollup_{name}")
+    return _cached_rollup(name, strict, dataset_version(strict))
+
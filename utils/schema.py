@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# ---------------------- 컬럼 정의 ----------------------
+# (컬럼명, 지표명, 가중치 %) - 3번 페이지 "위험 점수 산정 기준"과 동일
+INDICATORS = [
+    ("NORM_PRICE", "아파트 시세", 20),
+    ("NORM_MOBILITY", "유동인구", 12),
+    ("NORM_ASSETS", "자산 수준", 10),
+    ("NORM_SALES", "전체 매출", 10),
+    ("NORM_CLOSE", "폐업률", 8),
+    ("NORM_FRANCHISE", "프랜차이즈 비중", 10),
+    ("NORM_FOOD", "음식 매출", 10),
+    ("NORM_SPECIAL", "전문업종 비중", 5),
+    ("NORM_DIVERSITY", "업종 다양성", 5),
+    ("NORM_DOMINANT", "브랜드 지배율", 10),
+]
+NORM_COLUMNS = [col for col, _, _ in INDICATORS]
+SCORE_COLUMNS = NORM_COLUMNS + ["FINAL_SCORE"]
+
+DANGER_LEVELS = ["낮음", "보통", "높음"]
+DANGER_THRESHOLDS = (0.33, 0.66)
+
+# 정규화 전 원천 지표 (NORM 컬럼, 원천 컬럼, 로그 스케일 여부) - utils.ingest 월 단위 적재에서 사용
+# 금액·인원처럼 한쪽으로 긴 꼬리가 있는 지표는 log1p 후 MinMax, 비율 지표는 그대로 MinMax
+RAW_INDICATORS = [
+    ("NORM_PRICE", "RAW_PRICE", True),
+    ("NORM_MOBILITY", "RAW_MOBILITY", True),
+    ("NORM_ASSETS", "RAW_ASSETS", True),
+    ("NORM_SALES", "RAW_SALES", True),
+    ("NORM_CLOSE", "RAW_CLOSE", False),
+    ("NORM_FRANCHISE", "RAW_FRANCHISE", False),
+    ("NORM_FOOD", "RAW_FOOD", True),
+    ("NORM_SPECIAL", "RAW_SPECIAL", False),
+    ("NORM_DIVERSITY", "RAW_DIVERSITY", False),
+    ("NORM_DOMINANT", "RAW_DOMINANT", False),
+]
+RAW_COLUMNS = [raw for _, raw, _ in RAW_INDICATORS]
+
+# 원천 테이블에서 가져오는 컬럼 (SELECT * 대신 사용)
+SOURCE_COLUMNS = ["REGION_NAME", "MONTH", "DANGER_LEVEL"] + SCORE_COLUMNS
+
+# 화면/리포트에 표시하는 컬럼 이름
+COLUMN_LABELS = {
+    "FINAL_SCORE": "최종 점수",
+    "NORM_CLOSE": "폐업률 지수",
+    "NORM_PRICE": "가격 지수",
+    "NORM_MOBILITY": "유동인구 지수",
+    "NORM_ASSETS": "자산 지수",
+    "NORM_FOOD": "음식 매출 지수",
+    "NORM_DOMINANT": "지배 브랜드 비율 지수",
+}
+# 데이터 개요/프로파일 요약에 보여 줄 주요 지표 (표시 순서)
+KEY_COLUMNS = list(COLUMN_LABELS)
+
+COORDINATES_PATH = "data/seoul_gu_coordinates.csv"
+
+
+def score_table(strict=True):
+    """결과 테이블 이름 (strict: 엄격 기준 GENTRIFICATION_STRICT)"""
+    return "GENTRIFICATION_STRICT" if strict else "GENTRIFICATION_SCORE"
+
+
+# ---------------------- 정규화 프레임 ----------------------
+def build_region_dimension(names, coord_df):
+    """지역 차원 테이블 - REGION_ID(정수)는 정규화 프레임의 REGION_NAME 카테고리 코드와 동일"""
+    names = sorted(set(pd.Series(names).dropna().astype(str)))
+    dim = pd.DataFrame({"REGION_ID": np.arange(len(names), dtype=np.int16), "REGION_NAME": names})
+    dim = dim.merge(coord_df[["REGION_NAME", "LAT", "LON"]], on="REGION_NAME", how="left")
+    dim[["LAT", "LON"]] = dim[["LAT", "LON"]].astype(np.float32)
+    return dim
+
+
+def to_canonical(raw, regions):
+    """
+    원천 DataFrame을 앱 전체가 공유하는 단일 스키마로 변환 (로딩 시 1회)
+    - MONTH: datetime64 (월 초일), YEAR: int16
+    - REGION_NAME: regions 순서의 카테고리 (codes == REGION_ID), LAT/LON 미리 결합
+    - DANGER_LEVEL: 낮음 < 보통 < 높음 순서형 카테고리
+    - NORM_*, FINAL_SCORE: float32
+    """
+    month = pd.to_datetime(raw["MONTH"], errors="coerce").dt.to_period("M").dt.to_timestamp()
+    region = pd.Categorical(raw["REGION_NAME"], categories=regions["REGION_NAME"])
+    codes = region.codes
+    levels = DANGER_LEVELS + sorted(set(raw["DANGER_LEVEL"].dropna()) - set(DANGER_LEVELS))
+
+    df = pd.DataFrame({
+        "REGION_NAME": region,
+        "MONTH": month,
+        "YEAR": month.dt.year.astype("Int16"),
+        "DANGER_LEVEL": pd.Categorical(raw["DANGER_LEVEL"], categories=levels, ordered=True),
+    })
+    for col in SCORE_COLUMNS:
+        if col in raw.columns:
+            df[col] = pd.to_numeric(raw[col], errors="coerce").astype(np.float32)
+
+    lat = regions["LAT"].to_numpy()
+    lon = regions["LON"].to_numpy()
+    valid = codes >= 0
+    df["LAT"] = np.where(valid, lat[np.where(valid, codes, 0)], np.nan).astype(np.float32)
+    df["LON"] = np.where(valid, lon[np.where(valid, codes, 0)], np.nan).astype(np.float32)
+    return df
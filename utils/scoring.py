@@ -0,0 +1,124 @@
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import dataset_version, get_session_overlay
+from utils.partition_index import get_partition_index
+from utils.schema import DANGER_LEVELS, DANGER_THRESHOLDS, INDICATORS, NORM_COLUMNS
+
+DEFAULT_WEIGHTS = {col: weight for col, _, weight in INDICATORS}
+
+
+class ScoringEngine:
+    """
+    NORM_* 행렬로 FINAL_SCORE / DANGER_LEVEL을 로컬에서 다시 계산
+    - FINAL_SCORE = NORM 행렬 @ 가중치 벡터 (가중치는 합이 1이 되도록 정규화)
+    - DANGER_LEVEL = 임계값 (낮음 ≤ t1 < 보통 ≤ t2 < 높음)
+    데이터에 없는 지표는 제외하고, 결측값은 0으로 계산
+    """
+
+    def __init__(self, index):
+        frame = index.frame
+        self.columns = [c for c in NORM_COLUMNS if c in frame.columns]
+        self.matrix = np.ascontiguousarray(np.nan_to_num(frame[self.columns].to_numpy(np.float32)))
+        self.regions = index.regions
+        self.months = index.months
+        self.region_codes = frame["REGION_NAME"].cat.codes.to_numpy()
+        self.month_pos = np.searchsorted(index.months.values, frame["MONTH"].to_numpy())
+
+    def weight_vector(self, weights):
+        w = np.array([weights.get(c, 0.0) for c in self.columns], dtype=np.float32)
+        total = w.sum()
+        return w / total if total > 0 else w
+
+    def score(self, weights, thresholds=DANGER_THRESHOLDS):
+        """전체 지역-월에 대해 (점수, 등급 코드) 반환 - 등급 코드는 DANGER_LEVELS 인덱스"""
+        scores = self.matrix @ self.weight_vector(weights)
+        levels = np.digitize(scores, thresholds, right=True).astype(np.int8)
+        return scores, levels
+
+    def rollups(self, scores, levels):
+        """utils.rollups의 month / month_danger / region_month와 같은 형태의 집계"""
+        n_months = len(self.months)
+        counts = np.bincount(self.month_pos, minlength=n_months)
+        month = pd.DataFrame({
+            "MONTH": self.months,
+            "FINAL_SCORE": np.bincount(self.month_pos, weights=scores, minlength=n_months) / np.maximum(counts, 1),
+        })[counts > 0].reset_index(drop=True)
+
+        level_counts = np.bincount(self.month_pos * 3 + levels, minlength=n_months * 3).reshape(n_months, 3)
+        month_idx, level_idx = np.nonzero(level_counts)
+        month_danger = pd.DataFrame({
+            "MONTH": self.months[month_idx],
+            "DANGER_LEVEL": np.array(DANGER_LEVELS)[level_idx],
+            "CNT": level_counts[month_idx, level_idx],
+        })
+
+        group_keys, group = np.unique(self.region_codes.astype(np.int64) * n_months + self.month_pos, return_inverse=True)
+        sizes = np.bincount(group)
+        modes = np.bincount(group * 3 + levels, minlength=len(group_keys) * 3).reshape(-1, 3).argmax(axis=1)
+        region_month = pd.DataFrame({
+            "REGION_NAME": np.array(self.regions, dtype=object)[group_keys // n_months],
+            "MONTH": self.months[group_keys % n_months],
+            "FINAL_SCORE": np.bincount(group, weights=scores) / sizes,
+            "DANGER_LEVEL": np.array(DANGER_LEVELS)[modes],
+        })
+        return {"month": month, "month_danger": month_danger, "region_month": region_month}
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _build_engine(strict, version):
+    return ScoringEngine(get_partition_index(strict))
+
+
+def get_scoring_engine(strict: bool = True):
+    return _build_engine(strict, dataset_version(strict))
+
+
+# ---------------------- 가중치 조정 UI ----------------------
+def render_weight_controls():
+    """
+    사이드바 가중치/임계값 슬라이더 - 세션 내 모든 페이지에서 공유
+    기본값과 다르면 (가중치 dict, 임계값 tuple), 같으면 None 반환
+    """
+    state = st.session_state.setdefault("score_weights", {"weights": dict(DEFAULT_WEIGHTS), "thresholds": DANGER_THRESHOLDS})
+
+    with st.sidebar.expander("⚖️ 가중치 시뮬레이션", expanded=False):
+        st.caption("지표별 가중치와 등급 기준을 바꾸면 점수와 위험 등급을 즉시 다시 계산합니다.")
+        if st.button("기본값으로 되돌리기", key="score_weights_reset"):
+            state["weights"] = dict(DEFAULT_WEIGHTS)
+            state["thresholds"] = DANGER_THRESHOLDS
+            for col in DEFAULT_WEIGHTS:
+                st.session_state.pop(f"score_weight_{col}", None)
+            st.session_state.pop("score_thresholds", None)
+
+        for col, label, _ in INDICATORS:
+            state["weights"][col] = st.slider(
+                f"{label} (%)", 0, 50, int(state["weights"][col]), key=f"score_weight_{col}"
+            )
+        state["thresholds"] = st.slider(
+            "등급 기준 (낮음 | 보통 | 높음)", 0.0, 1.0, tuple(state["thresholds"]), 0.01, key="score_thresholds"
+        )
+
+    if state["weights"] == DEFAULT_WEIGHTS and tuple(state["thresholds"]) == tuple(DANGER_THRESHOLDS):
+        return None
+    return dict(state["weights"]), tuple(state["thresholds"])
+
+
+def rescore(strict, weights, thresholds):
+    """
+    사용자 가중치로 전체 재계산 - (점수, 등급 코드, 집계, 소요 ms)
+    점수/등급은 세션 오버레이(SIM_SCORE, SIM_LEVEL, PartitionIndex 행 순서)에 두고 같은 가중치면 재사용
+    """
+    engine = get_scoring_engine(strict)
+    overlay = get_session_overlay(strict)
+    tag = (tuple(sorted(weights.items())), tuple(thresholds))
+    started = time.perf_counter()
+    scores, levels = overlay.get("SIM_SCORE", tag), overlay.get("SIM_LEVEL", tag)
+    if scores is None or levels is None:
+        scores, levels = engine.score(weights, thresholds)
+        overlay.set("SIM_SCORE", scores, tag)
+        overlay.set("SIM_LEVEL", levels, tag)
+    rollups = engine.rollups(scores, levels)
+    return scores, levels, rollups, (time.perf_counter() - started) * 1000
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import dataset_version
+from utils.schema import DANGER_THRESHOLDS
+from utils.scoring import DEFAULT_WEIGHTS, get_scoring_engine
+
+# 한 번에 계산하는 (행 × 샘플) 점수 행렬의 최대 크기 (바이트)
+CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def sample_weights(base, n_samples, concentration, rng):
+    """
+    공표 가중치를 중심으로 한 디리클레 분포 샘플 (n_samples × 지표 수)
+    concentration이 클수록 공표 가중치 근처에 몰림
+    """
+    alpha = np.maximum(base * concentration, 1e-3)
+    return rng.dirichlet(alpha, size=n_samples).astype(np.float32)
+
+
+def run_sensitivity(engine, n_samples=2000, concentration=200.0, seed=0, month=None,
+                    thresholds=DANGER_THRESHOLDS, top_n=5):
+    """
+    가중치 샘플마다 전체 지역-월 점수를 계산해 순위 안정성과 '높음' 확률 산출
+
+    - 전체 지역-월: (행 × 지표) @ (지표 × 샘플)을 메모리 한도 내 청크로 나눠 '높음' 횟수 누적
+    - 기준 월(기본값: 최신 월): 샘플별 지역 순위 분포 → 5/50/95% 구간, Top-N 확률
+
+    반환값: (기준 월 지역별 요약 DataFrame, 지역-월별 '높음' 확률 DataFrame, 기준 월)
+    """
+    rng = np.random.default_rng(seed)
+    base = engine.weight_vector(DEFAULT_WEIGHTS)
+    weights = sample_weights(base, n_samples, concentration, rng)
+
+    matrix = engine.matrix
+    high_counts = np.zeros(len(matrix), dtype=np.int32)
+    chunk = max(1, CHUNK_BYTES // max(1, matrix.shape[0] * 4))
+    for start in range(0, n_samples, chunk):
+        scores = matrix @ weights[start:start + chunk].T
+        high_counts += (scores > thresholds[1]).sum(axis=1, dtype=np.int32)
+
+    prob_high = pd.DataFrame({
+        "REGION_NAME": np.array(engine.regions, dtype=object)[engine.region_codes],
+        "MONTH": engine.months[engine.month_pos],
+        "P_HIGH": high_counts / n_samples,
+    })
+
+    month_pos = len(engine.months) - 1 if month is None else engine.months.get_loc(pd.Timestamp(month))
+    rows = np.flatnonzero(engine.month_pos == month_pos)
+    regions = np.array(engine.regions, dtype=object)[engine.region_codes[rows]]
+    scores = matrix[rows] @ weights.T
+    ranks = (-scores).argsort(axis=0).argsort(axis=0) + 1
+    base_scores = matrix[rows] @ base
+    base_ranks = (-base_scores).argsort().argsort() + 1
+
+    summary = pd.DataFrame({
+        "지역": regions,
+        "기준 점수": base_scores.round(3),
+        "기준 순위": base_ranks,
+        "순위 중앙값": np.median(ranks, axis=1),
+        "순위 5%": np.percentile(ranks, 5, axis=1),
+        "순위 95%": np.percentile(ranks, 95, axis=1),
+        f"Top{top_n} 확률": (ranks <= top_n).mean(axis=1).round(3),
+        "높음 확률": (scores > thresholds[1]).mean(axis=1).round(3),
+    }).sort_values("기준 순위").reset_index(drop=True)
+    return summary, prob_high, engine.months[month_pos]
+
+
+@st.cache_data(show_spinner="가중치 민감도 분석 중...", max_entries=8)
+def _cached_sensitivity(strict, version, n_samples, concentration, seed, month):
+    return run_sensitivity(get_scoring_engine(strict), n_samples, concentration, seed, month)
+
+
+def load_sensitivity(strict: bool = True, n_samples=2000, concentration=200.0, seed=0, month=None):
+    """데이터 버전과 파라미터별로 캐시된 민감도 분석 결과"""
+    return _cached_sensitivity(strict, dataset_version(strict), n_samples, concentration, seed, month)
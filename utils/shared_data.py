@@ -0,0 +1,161 @@
+import hashlib
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import streamlit as st
+
+# 공유 Arrow 파일 위치 - 데이터 버전별 파일 하나, 모든 세션/페이지(와 같은 서버의 다른 프로세스)가 같은 파일을 매핑
+ARROW_DIR = Path(os.environ.get("GENTRI_ARROW_DIR", ".cache/arrow"))
+# 0이면 파일 없이 프로세스 메모리에만 보관
+ARROW_MMAP = os.environ.get("GENTRI_ARROW_MMAP", "1") not in ("", "0")
+# 데이터 버전이 바뀌어도 남겨 둘 이전 파일 수
+ARROW_KEEP = 2
+
+# 정수 컬럼은 결측이 있어도 float로 바뀌지 않도록 pandas nullable 정수로 (YEAR 등)
+_INT_TYPES = {pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype(), pa.int32(): pd.Int32Dtype(), pa.int64(): pd.Int64Dtype()}
+
+
+# ---------------------- 변환 ----------------------
+def to_arrow(df):
+    """
+    정규화 프레임 → Arrow 테이블 (to_pandas 시 숫자 컬럼이 복사 없이 보이도록)
+    - 실수 컬럼은 NaN을 null로 바꾸지 않음 (null 비트맵이 있으면 pandas 변환 시 복사됨)
+    - 카테고리 컬럼은 사전(dictionary) 배열로 저장
+    """
+    columns = {}
+    for name in df.columns:
+        values = df[name]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            dictionary = pa.array(values.cat.categories.astype(str))
+            codes = pa.array(values.cat.codes.to_numpy(), mask=values.cat.codes.to_numpy() < 0)
+            columns[name] = pa.DictionaryArray.from_arrays(codes, dictionary, ordered=values.cat.ordered)
+        elif values.dtype.kind == "f":
+            columns[name] = pa.array(values.to_numpy(), from_pandas=False)
+        else:
+            columns[name] = pa.Array.from_pandas(values)
+    return pa.table(columns)
+
+
+def _arrow_path(version):
+    return ARROW_DIR / f"{hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]}.arrow"
+
+
+def _write(table, path):
+    """압축 없는 Arrow IPC 파일로 저장 (압축하면 매핑해도 읽을 때 풀어야 해서 복사가 생김) - 임시 파일 후 교체"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def _prune(keep):
+    files = sorted(ARROW_DIR.glob("*.arrow"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in files[keep:]:
+        path.unlink(missing_ok=True)
+
+
+# ---------------------- 공유 데이터셋 ----------------------
+class SharedDataset:
+    """
+    프로세스 전체가 공유하는 읽기 전용 Arrow 테이블 (데이터 버전당 하나)
+    - 디스크 파일을 메모리 매핑하면 데이터가 OS 페이지 캐시에만 있어 같은 서버의 여러 프로세스도 함께 사용
+    - frame(): 매 호출마다 새 pandas 래퍼를 만들되 숫자/날짜 컬럼은 Arrow 버퍼를 그대로 가리킴 (쓰기 불가)
+      → 세션이 컬럼을 추가해도 다른 세션에 영향 없음, 값 수정은 오류
+    """
+
+    def __init__(self, table, version, mapped=False):
+        self.table = table
+        self.version = version
+        self.mapped = mapped
+
+    @classmethod
+    def build(cls, df, version, mmap=ARROW_MMAP):
+        """정규화 프레임으로 생성 - mmap이면 버전별 Arrow 파일을 (없을 때만) 쓰고 매핑"""
+        if not mmap:
+            return cls(to_arrow(df), version)
+        path = _arrow_path(version)
+        if not path.exists():
+            _write(to_arrow(df), path)
+            _prune(ARROW_KEEP)
+        return cls.open(path, version)
+
+    @classmethod
+    def open(cls, path, version):
+        source = pa.memory_map(str(path), "r")
+        return cls(ipc.open_file(source).read_all(), version, mapped=True)
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def frame(self, columns=None):
+        """읽기 전용 pandas 뷰 (columns: 필요한 컬럼만)"""
+        table = self.table.select(columns) if columns else self.table
+        return table.to_pandas(split_blocks=True, self_destruct=False, types_mapper=_INT_TYPES.get)
+
+
+def prepare_shared(df):
+    """
+    공유 데이터셋에 넣기 전에 (REGION_NAME 코드, MONTH) 순으로 정렬
+    PartitionIndex가 같은 순서를 쓰므로 인덱스가 공유 프레임을 복사 없이 그대로 사용
+    """
+    codes = df["REGION_NAME"].cat.codes.to_numpy()
+    order = np.lexsort((df["MONTH"].to_numpy(), np.where(codes < 0, np.iinfo(np.int32).max, codes)))
+    return df.iloc[order].reset_index(drop=True)
+
+
+# ---------------------- 세션별 오버레이 ----------------------
+class Overlay:
+    """
+    세션 전용 파생 컬럼 - 공유 프레임과 같은 행 순서의 배열만 보관하고 원본은 건드리지 않음
+    tag로 계산 조건(예: 가중치)을 함께 기록해 같은 조건이면 다시 계산하지 않음
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.columns = {}
+        self.tags = {}
+        self.updated_at = time.time()
+
+    def set(self, name, values, tag=None):
+        self.columns[name] = values
+        self.tags[name] = tag
+        self.updated_at = time.time()
+
+    def get(self, name, tag=None):
+        """저장된 컬럼 (tag가 다르면 None)"""
+        if name in self.columns and self.tags.get(name) == tag:
+            return self.columns[name]
+        return None
+
+    def drop(self, name):
+        self.columns.pop(name, None)
+        self.tags.pop(name, None)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(values, "nbytes", 0) for values in self.columns.values())
+
+    def apply(self, frame):
+        """공유 프레임 뷰 + 오버레이 컬럼 (같은 이름이면 오버레이 우선, 공유 컬럼은 복사하지 않음)"""
+        if not self.columns:
+            return frame
+        overlay = {name: pd.Series(values, index=frame.index, copy=False) for name, values in self.columns.items()}
+        data = {name: overlay.pop(name, frame[name]) for name in frame.columns}
+        data.update(overlay)
+        return pd.DataFrame(data, index=frame.index, copy=False)
+
+
+def session_overlay(key, version):
+    """현재 세션의 오버레이 - 데이터 버전이 바뀌면 새로 만듦 (행 순서가 달라지므로)"""
+    overlays = st.session_state.setdefault("data_overlays", {})
+    overlay = overlays.get(key)
+    if overlay is None or overlay.version != version:
+        overlay = overlays[key] = Overlay(version)
+    return overlay
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+from utils.tracing import span
+
+# 스냅샷 저장 위치 (환경변수로 변경 가능)
+SNAPSHOT_DIR = Path(os.environ.get("GENTRI_SNAPSHOT_DIR", ".cache/snapshots"))
+# 이 시간(초) 안에 갱신된 스냅샷은 워터마크 확인 없이 바로 사용
+SNAPSHOT_MAX_AGE = int(os.environ.get("GENTRI_SNAPSHOT_MAX_AGE", 6 * 60 * 60))
+
+WATERMARK_COLUMN = "MONTH"
+
+
+def _paths(table_name):
+    return SNAPSHOT_DIR / f"{table_name}.parquet", SNAPSHOT_DIR / f"{table_name}.meta.json"
+
+
+def load_snapshot_meta(table_name):
+    """스냅샷 메타데이터만 읽기 (없으면 None)"""
+    meta_path = _paths(table_name)[1]
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def load_snapshot(table_name):
+    """로컬 Parquet 스냅샷과 메타데이터(워터마크, 행 수, 저장 시각) 불러오기"""
+    data_path, meta_path = _paths(table_name)
+    if not data_path.exists() or not meta_path.exists():
+        return None, None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        df = pd.read_parquet(data_path)
+    except Exception:
+        return None, None
+    return df, meta
+
+
+def _month_keys(values):
+    """월 컬럼 → 'YYYY-MM-DD' 문자열 (월이 비어 있는 행은 'NULL')"""
+    return pd.to_datetime(pd.Series(values), errors="coerce").dt.strftime("%Y-%m-%d").fillna("NULL").to_numpy()
+
+
+def _digest(months):
+    return hashlib.sha1(json.dumps(months, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def snapshot_version(table_name, meta):
+    """스냅샷 메타데이터 → 데이터 버전 문자열 (월별 내용 해시가 바뀌면 행 수가 같아도 바뀜)"""
+    return f"{table_name}:{meta.get('watermark')}:{meta.get('row_count')}:{meta.get('digest')}"
+
+
+def save_snapshot(table_name, df, columns=None, months=None):
+    """
+    스냅샷 저장 - 쓰기 도중 중단되어도 기존 파일이 깨지지 않도록 임시 파일 후 교체
+    months: 원천 테이블의 월별 [행 수, 내용 해시] (다음 동기화 때 바뀐 월을 찾는 기준)
+    """
+    data_path, meta_path = _paths(table_name)
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+
+    watermark = None
+    if WATERMARK_COLUMN in df.columns and not df.empty:
+        watermark = str(pd.to_datetime(df[WATERMARK_COLUMN]).max().date())
+    meta = {
+        "table": table_name,
+        "watermark": watermark,
+        "row_count": int(len(df)),
+        "columns": columns,
+        "months": months,
+        "digest": _digest(months) if months is not None else None,
+        "saved_at": time.time(),
+    }
+
+    tmp_path = data_path.with_suffix(".parquet.tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, data_path)
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    return meta
+
+
+def _projection(backend, table_name, columns):
+    """SELECT 목록 - 요청한 컬럼 중 실제 테이블에 존재하는 컬럼 (columns가 없으면 테이블 전체 컬럼)"""
+    available = list(backend.query(f"SELECT * FROM {table_name} LIMIT 0").columns)
+    return ", ".join(c for c in (columns or available) if c in available)
+
+
+def _month_stats(backend, table_name, projection):
+    """원천 테이블의 월별 {월: [행 수, 내용 해시]} - 조회하는 컬럼의 값이 하나라도 바뀌면 그 월의 해시가 바뀜"""
+    stats = backend.query(
+        f"SELECT {WATERMARK_COLUMN} AS MONTH_KEY, COUNT(*) AS ROW_COUNT, {backend.hash_agg(projection)} AS CONTENT_HASH "
+        f"FROM {table_name} GROUP BY {WATERMARK_COLUMN}"
+    )
+    keys = _month_keys(stats["MONTH_KEY"])
+    return {key: [int(count), str(digest)] for key, count, digest in zip(keys, stats["ROW_COUNT"], stats["CONTENT_HASH"])}
+
+
+def _fetch_months(backend, table_name, projection, keys):
+    """지정한 월의 행만 조회"""
+    dates = [key for key in keys if key != "NULL"]
+    conditions = [f"{WATERMARK_COLUMN} IN ({', '.join(['%s'] * len(dates))})"] if dates else []
+    if "NULL" in keys:
+        conditions.append(f"{WATERMARK_COLUMN} IS NULL")
+    return backend.query(f"SELECT {projection} FROM {table_name} WHERE {' OR '.join(conditions)}", tuple(dates))
+
+
+def _sync(table_name, backend, force, columns):
+    """(DataFrame, 동기화 방식) 반환"""
+    cached, meta = load_snapshot(table_name)
+    if cached is not None and meta.get("columns") != columns:
+        # 프로젝션이 바뀐 스냅샷은 재사용하지 않음 (오프라인일 때만 예외)
+        force = True
+    if cached is not None and not force and time.time() - meta["saved_at"] < SNAPSHOT_MAX_AGE:
+        return cached, "fresh"
+
+    try:
+        projection = _projection(backend, table_name, columns)
+        remote = _month_stats(backend, table_name, projection)
+    except Exception:
+        if cached is not None:
+            return cached, "offline"
+        raise
+
+    known = None if cached is None or meta.get("columns") != columns else meta.get("months")
+    if known is None:
+        df = backend.query(f"SELECT {projection} FROM {table_name}")
+        save_snapshot(table_name, df, columns, remote)
+        return df, "full"
+
+    if remote == known:
+        # 변경 없음 - 저장 시각만 갱신
+        meta["saved_at"] = time.time()
+        _paths(table_name)[1].write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        return cached, "unchanged"
+
+    changed = [key for key, stats in remote.items() if known.get(key) != stats]
+    stale = [key for key in known if remote.get(key) != known[key]]
+    if len(stale) * 2 >= len(known):
+        # NORM_*/FINAL_SCORE는 전체 행 기준 MinMax라 정규화 범위가 움직이면 과거 월이 한꺼번에 바뀜 → 전체 재적재
+        df, mode = backend.query(f"SELECT {projection} FROM {table_name}"), "full"
+    else:
+        # 새 월 + 내용이 바뀐 과거 월만 다시 가져와 교체 (원천에서 사라진 월은 삭제)
+        keep = cached[~pd.Series(_month_keys(cached[WATERMARK_COLUMN])).isin(set(changed) | set(stale)).to_numpy()]
+        delta = _fetch_months(backend, table_name, projection, changed) if changed else keep.iloc[:0]
+        df, mode = pd.concat([keep, delta], ignore_index=True), "delta"
+    save_snapshot(table_name, df, columns, remote)
+    return df, mode
+
+
+def sync_snapshot(table_name, backend, force=False, columns=None):
+    """
+    스냅샷을 원천 테이블과 동기화한 뒤 전체 DataFrame 반환
+
+    - 최근에 갱신된 스냅샷이면 백엔드에 질의하지 않고 그대로 사용
+    - 월별 행 수 + 내용 해시를 비교해 새 월과 값이 바뀐 월만 다시 가져와 교체
+    - 과거 월 대부분이 바뀐 경우(정규화 범위 이동)에는 전체 재적재
+    - 백엔드 접속에 실패하면 마지막 스냅샷으로 오프라인 동작
+    - columns를 지정하면 해당 컬럼만 조회 (SELECT * 대신)
+    """
+    with span("data.sync_snapshot", table=table_name) as s:
+        df, mode = _sync(table_name, backend, force, columns)
+        s.set(mode=mode, cache_hit=mode in ("fresh", "unchanged", "offline"))
+        s.set_frame(df)
+    return df
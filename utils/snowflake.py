@@ -1,38 +1,49 @@
 import streamlit as st
-from snowflake.snowpark import Session
-import snowflake.connector
+from utils.tracing import span
+
+# snowflake.connector / snowflake.snowpark는 무거워서 실제로 로그인할 때만 import
 
 def get_snowflake_connection():
     """
     Snowflake connector.connect() 방식 - cursor 또는 SQL 직접 실행에 사용
+    매 호출마다 새로 로그인하므로 앱에서는 utils.backend.get_backend()의 풀을 통해 사용
     """
+    import snowflake.connector
+
     config = st.secrets["snowflake"]
 
-    conn = snowflake.connector.connect(
-        user=config["user"],
-        password=config["password"],
-        account=config["account"],
-        warehouse=config["warehouse"],
-        database=config["database"],
-        schema=config["schema"],
-        role=config["role"]
-    )
+    with span("snowflake.login"):
+        conn = snowflake.connector.connect(
+            user=config["user"],
+            password=config["password"],
+            account=config["account"],
+            warehouse=config["warehouse"],
+            database=config["database"],
+            schema=config["schema"],
+            role=config["role"],
+            client_session_keep_alive=True
+        )
     return conn
 
 def get_snowpark_session():
     """
     Snowpark Session 객체 생성 - DataFrame API, .sql() 등 사용 시 필요
+    매 호출마다 새로 로그인하므로 앱에서는 get_backend().session()을 통해 사용
     """
+    from snowflake.snowpark import Session
+
     config = st.secrets["snowflake"]
 
-    session = Session.builder.configs({
-        "account": config["account"],
-        "user": config["user"],
-        "password": config["password"],
-        "role": config["role"],
-        "warehouse": config["warehouse"],
-        "database": config["database"],
-        "schema": config["schema"]
-    }).create()
+    with span("snowpark.login"):
+        session = Session.builder.configs({
+            "account": config["account"],
+            "user": config["user"],
+            "password": config["password"],
+            "role": config["role"],
+            "warehouse": config["warehouse"],
+            "database": config["database"],
+            "schema": config["schema"],
+            "client_session_keep_alive": True
+        }).create()
 
     return session
@@ -0,0 +1,196 @@
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# GENTRI_TRACE=1 이면 프로세스 전체(백그라운드 작업 포함)를 처음부터 기록
+# 아니면 사이드바 패널에서 켠 세션의 스크립트 실행만 기록 (설정은 세션별 - 다른 사용자에게 영향 없음)
+_enabled = os.environ.get("GENTRI_TRACE", "") not in ("", "0")
+_spans = collections.deque(maxlen=int(os.environ.get("GENTRI_TRACE_BUFFER", 5000)))
+SESSION_KEY = "trace_enabled"
+
+
+def enable(flag=True):
+    """프로세스 전체 기록 켜기/끄기 (CLI·벤치마크용 - 앱에서는 세션별 토글 사용)"""
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled():
+    """프로세스 전체 기록이 켜져 있거나, 현재 스크립트를 실행 중인 세션이 기록을 켠 경우"""
+    if _enabled:
+        return True
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return False
+    return bool(st.session_state.get(SESSION_KEY, False))
+
+
+class _NoopSpan:
+    """기록이 꺼져 있을 때 쓰는 빈 span - 시간 측정/할당 없음"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    def set_frame(self, df):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """단계 하나의 소요 시간과 속성(rows, bytes, cache_hit 등)"""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record = {
+            "name": self.name,
+            "ts": round(self.started_at, 6),
+            "ms": round((time.perf_counter() - self._t0) * 1000, 3),
+            "thread": threading.current_thread().name,
+            **self.attrs,
+        }
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        _spans.append(record)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def set_frame(self, df):
+        """DataFrame 행 수/메모리 크기 기록 (기록이 켜져 있을 때만 계산)"""
+        self.attrs.update(frame_stats(df))
+
+
+def span(name, **attrs):
+    """with span("snowflake.execute", rows=...) as s: ... - 기록이 꺼져 있으면 no-op"""
+    if not is_enabled():
+        return _NOOP
+    return Span(name, attrs)
+
+
+def traced(name=None):
+    """함수 전체를 span으로 감싸는 데코레이터"""
+    def decorator(fn):
+        label = name or f"{fn.__module__}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return fn(*args, **kwargs)
+            with Span(label, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def frame_stats(df):
+    """DataFrame 행 수/메모리 크기 - span 속성용"""
+    return {"rows": int(len(df)), "bytes": int(df.memory_usage(index=False).sum())}
+
+
+# ---------------------- 내보내기 ----------------------
+def recent_spans():
+    return list(_spans)
+
+
+def clear():
+    _spans.clear()
+
+
+def to_jsonl(spans=None):
+    return "\n".join(json.dumps(s, ensure_ascii=False) for s in (recent_spans() if spans is None else spans)) + "\n"
+
+
+def summarize(spans=None):
+    """단계별 호출 수, 합계/평균/최대 ms, rows/bytes 합계, 캐시 히트 수"""
+    stats = {}
+    for s in recent_spans() if spans is None else spans:
+        entry = stats.setdefault(s["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "bytes": 0, "cache_hits": 0})
+        entry["count"] += 1
+        entry["total_ms"] += s["ms"]
+        entry["max_ms"] = max(entry["max_ms"], s["ms"])
+        entry["rows"] += s.get("rows", 0)
+        entry["bytes"] += s.get("bytes", 0)
+        entry["cache_hits"] += bool(s.get("cache_hit"))
+    for entry in stats.values():
+        entry["avg_ms"] = entry["total_ms"] / entry["count"]
+    return stats
+
+
+def to_prometheus(spans=None):
+    """Prometheus text exposition 형식 (node_exporter textfile collector 등에서 사용)"""
+    stats = summarize(spans)
+    lines = []
+    metrics = [
+        ("gentri_stage_seconds_total", "counter", "단계별 누적 소요 시간(초)", lambda e: e["total_ms"] / 1000),
+        ("gentri_stage_calls_total", "counter", "단계별 호출 수", lambda e: e["count"]),
+        ("gentri_stage_rows_total", "counter", "단계별 누적 행 수", lambda e: e["rows"]),
+        ("gentri_stage_bytes_total", "counter", "단계별 누적 바이트", lambda e: e["bytes"]),
+        ("gentri_stage_cache_hits_total", "counter", "단계별 캐시 히트 수", lambda e: e["cache_hits"]),
+    ]
+    for metric, kind, help_text, value in metrics:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, entry in sorted(stats.items()):
+            lines.append(f'{metric}{{stage="{name}"}} {value(entry)}')
+    return "\n".join(lines) + "\n"
+
+
+def write_exports(directory):
+    """JSONL과 Prometheus 텍스트 파일로 저장 (오프라인 분석용)"""
+    os.makedirs(directory, exist_ok=True)
+    spans = recent_spans()
+    with open(os.path.join(directory, "spans.jsonl"), "a", encoding="utf-8") as f:
+        f.write(to_jsonl(spans))
+    with open(os.path.join(directory, "gentri.prom"), "w", encoding="utf-8") as f:
+        f.write(to_prometheus(spans))
+
+
+# ---------------------- 사이드바 패널 ----------------------
+def render_trace_panel():
+    """사이드바의 성능 추적 패널 - 켜면 이 세션의 모든 단계 소요 시간을 기록"""
+    with st.sidebar.expander("🛠 성능 추적", expanded=False):
+        if _enabled:
+            st.toggle("단계별 시간 기록", value=True, disabled=True, help="GENTRI_TRACE=1로 서버 전체 기록 중")
+        else:
+            st.toggle("단계별 시간 기록", key=SESSION_KEY)
+        if not is_enabled():
+            st.caption("켜면 Snowflake 로그인/쿼리/전송, 데이터 변환, 렌더링, LLM 호출 시간을 기록합니다.")
+            return
+
+        stats = summarize()
+        if not stats:
+            st.caption("아직 기록된 단계가 없습니다.")
+            return
+        st.dataframe(
+            [{"단계": name, "호출": e["count"], "평균 ms": round(e["avg_ms"], 1), "최대 ms": round(e["max_ms"], 1),
+              "행": e["rows"], "바이트": e["bytes"], "캐시 히트": e["cache_hits"]}
+             for name, e in sorted(stats.items(), key=lambda item: -item[1]["total_ms"])],
+            use_container_width=True, hide_index=True
+        )
+        col1, col2 = st.columns(2)
+        col1.download_button("JSONL", to_jsonl(), "spans.jsonl", "application/jsonl")
+        col2.download_button("Prometheus", to_prometheus(), "gentri.prom", "text/plain")
+        if st.button("기록 초기화", key="trace_clear"):
+            clear()
@@ -0,0 +1,175 @@
+"""
+서버 시작 직후 캐시 예열 + 시작 시간 보고
+
+    python -m utils.warmup              # 배포 직후 디스크 캐시(스냅샷, 공유 Arrow 파일, 프로파일) 채우기 + 단계별 시간
+    python -m utils.warmup --imports    # 무거운 모듈별 import 시간 (모듈마다 새 프로세스에서 측정)
+    python -m utils.warmup --serve [-- 스트림릿 옵션]   # streamlit run app.py + 서버 시작과 동시에 예열
+
+--serve로 띄우면 서버가 요청을 받기 전에 같은 프로세스에서 예열 스레드가 시작되어 첫 방문자도 예열된 캐시를 씀
+streamlit run으로 띄우면 스크립트가 처음 실행될 때(첫 세션)에야 시작되므로 첫 방문자의 화면과 예열이 겹침
+앱과 각 페이지는 실행되자마자 start_warmer()를 호출하므로 어느 쪽이든 프로세스당 한 번만 실행됨
+(같은 캐시 키를 동시에 요청하면 Streamlit 캐시가 한 번만 계산하므로 페이지와 겹쳐도 중복 작업 없음)
+"""
+import argparse
+import importlib
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import streamlit as st
+from utils.tracing import span
+
+WARMUP = os.environ.get("GENTRI_WARMUP", "1") not in ("", "0")
+WARMER_THREAD = "gentri-cache-warmer"
+# 화면에서 처음 쓰일 때 기다리지 않도록 예열 스레드가 미리 import하는 모듈
+HEAVY_MODULES = ["altair", "pydeck", "duckdb"]
+
+# 이 모듈이 처음 import된 시각 ≈ 서버 시작(--serve) 또는 첫 스크립트 실행 시각
+_started = time.perf_counter()
+_report = []
+_lock = threading.Lock()
+
+
+class _WarmerLogFilter(logging.Filter):
+    """예열 스레드에는 ScriptRunContext가 없어 캐시 호출마다 경고가 찍히므로 그 스레드의 경고만 숨김"""
+
+    def filter(self, record):
+        return record.threadName != WARMER_THREAD
+
+
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(_WarmerLogFilter())
+
+
+def _steps(strict):
+    """(단계 이름, 함수) - 첫 화면에 필요한 것부터"""
+    from utils.data_loader import load_region_dimension
+    from utils.forecast import get_forecast_model
+    from utils.map_frames import get_map_frames
+    from utils.mapping_utils import load_coordinates
+    from utils.partition_index import get_partition_index
+    from utils.profile import load_profile
+    from utils.ranking import load_ranking
+    from utils.rollups import ROLLUP_SQL, load_rollup
+    from utils.schema import COORDINATES_PATH
+
+    return [
+        ("data.score_frame", lambda: get_partition_index(strict)),
+        ("data.coordinates", lambda: load_coordinates(COORDINATES_PATH)),
+        ("data.regions", lambda: load_region_dimension(strict)),
+        *[(f"rollup.{name}", lambda name=name: load_rollup(name, strict)) for name in ROLLUP_SQL],
+        ("profile", lambda: load_profile(strict)),
+        *[(f"import.{module}", lambda module=module: importlib.import_module(module)) for module in HEAVY_MODULES],
+        ("map_frames", lambda: get_map_frames(strict)),
+        ("ranking", lambda: load_ranking(strict)),
+        ("forecast", lambda: get_forecast_model(strict)),
+    ]
+
+
+def run_warmup(strict=True):
+    """예열 단계를 순서대로 실행 - 실패한 단계는 기록만 하고 다음 단계 진행, 기록 목록 반환"""
+    records = []
+    for name, fn in _steps(strict):
+        started = time.perf_counter()
+        error = None
+        try:
+            with span(f"warmup.{name}"):
+                fn()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finished = time.perf_counter()
+        record = {
+            "단계": name,
+            "ms": round((finished - started) * 1000, 1),
+            "시작 후 ms": round((finished - _started) * 1000, 1),
+            "오류": error,
+        }
+        records.append(record)
+        with _lock:
+            _report.append(record)
+    return records
+
+
+@st.cache_resource(show_spinner=False)
+def _warmer():
+    thread = threading.Thread(target=run_warmup, name=WARMER_THREAD, daemon=True)
+    thread.start()
+    return thread
+
+
+def start_warmer():
+    """프로세스당 한 번 캐시 예열 스레드 시작 (GENTRI_WARMUP=0이면 끔) - 각 페이지 main() 첫 줄에서 호출"""
+    if WARMUP:
+        _warmer()
+
+
+def startup_report():
+    """지금까지 끝난 예열 단계 기록"""
+    with _lock:
+        return list(_report)
+
+
+def render_startup_panel():
+    """사이드바의 서버 시작/예열 시간 패널"""
+    with st.sidebar.expander("🚀 시작·예열 시간", expanded=False):
+        if not WARMUP:
+            st.caption("캐시 예열이 꺼져 있습니다 (GENTRI_WARMUP=0).")
+            return
+        report = startup_report()
+        thread = _warmer()
+        st.caption("예열 중..." if thread.is_alive() else f"예열 완료 · {len(report)}단계")
+        if report:
+            st.dataframe(report, use_container_width=True, hide_index=True)
+
+
+# ---------------------- CLI ----------------------
+def import_times(modules):
+    """모듈별 import 시간(ms) - 이미 로드된 모듈의 영향을 받지 않도록 모듈마다 새 인터프리터에서 측정"""
+    code = "import importlib, sys, time; t = time.perf_counter(); importlib.import_module(sys.argv[1]); print((time.perf_counter() - t) * 1000)"
+    timings = {}
+    for module in modules:
+        result = subprocess.run([sys.executable, "-c", code, module], capture_output=True, text=True)
+        timings[module] = float(result.stdout.strip()) if result.returncode == 0 else None
+    return timings
+
+
+def serve(script="app.py", streamlit_args=()):
+    """예열 스레드를 먼저 띄운 뒤 같은 프로세스에서 streamlit run 실행 (캐시가 프로세스 단위라 서버와 공유됨)"""
+    from streamlit.web import cli
+
+    start_warmer()
+    sys.argv = ["streamlit", "run", script, *streamlit_args]
+    return cli.main()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="캐시 예열 및 시작 시간 보고")
+    parser.add_argument("--imports", action="store_true", help="무거운 모듈별 import 시간만 측정")
+    parser.add_argument("--table", default="strict", choices=["strict", "score"], help="예열할 테이블")
+    parser.add_argument("--serve", action="store_true", help="서버 시작과 동시에 예열 (나머지 인자는 streamlit run에 전달)")
+    parser.add_argument("--script", default="app.py", help="--serve로 실행할 앱 스크립트")
+    args, streamlit_args = parser.parse_known_args(argv)
+
+    if args.serve:
+        return serve(args.script, [arg for arg in streamlit_args if arg != "--"])
+    if streamlit_args:
+        parser.error(f"알 수 없는 인자: {' '.join(streamlit_args)}")
+
+    if args.imports:
+        modules = ["streamlit", "pandas", "pyarrow", *HEAVY_MODULES, "snowflake.connector", "snowflake.snowpark"]
+        for module, ms in import_times(modules).items():
+            print(f"{module:<24} {'설치 안 됨' if ms is None else f'{ms:8.1f} ms'}")
+        return 0
+
+    records = run_warmup(strict=args.table == "strict")
+    for record in records:
+        status = f"실패 - {record['오류']}" if record["오류"] else ""
+        print(f"{record['단계']:<24} {record['ms']:9.1f} ms {status}")
+    print(f"합계 {(time.perf_counter() - _started) * 1000:.0f} ms")
+    return 1 if any(record["오류"] for record in records) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())